@@ -0,0 +1,199 @@
+# GhettoGames
+# atlas: Packs many small sprite images into a few large texture atlas pages
+#
+# Every sprite owning its own tiny Surface means every blit comes from a different source.
+# An atlas packs a directory of Bitmappy sprites onto a few big pages, and keeps an index
+# of name -> (page, rect), so sprites can reference a region of a page instead.
+#
+# An atlas is saved as a CFG index (named like sprites.atlas.cfg) next to one PNG per page:
+#
+# [atlas]
+# pages = 1
+#
+# [sprite:sword]
+# page = 0
+# x = 0
+# y = 0
+# width = 32
+# height = 32
+import configparser
+import glob
+import logging
+import os.path
+
+import pygame
+
+from ghettogames.engine import BitmappySprite
+
+log = logging.getLogger('game.atlas')
+log.addHandler(logging.NullHandler())
+
+# Sprite sections are prefixed, so no sprite name can clash with the [atlas] section.
+SPRITE_SECTION = 'sprite:'
+
+# Atlas indexes are CFG files too, so directories of sprites skip files ending in this.
+ATLAS_SUFFIX = '.atlas.cfg'
+
+
+def pack_shelves(sizes, max_width, max_height, padding=1):
+    # Packs (width, height) sizes onto pages using first fit decreasing height shelves,
+    # and returns a list of (page, x, y) placements in the same order as sizes.
+    placements = [None] * len(sizes)
+
+    # Each page is a list of shelves, where each shelf is [y, height, next free x].
+    pages = []
+
+    # Tallest first keeps the wasted space at the top of each shelf down.
+    order = sorted(range(len(sizes)), key=lambda index: (-sizes[index][1], -sizes[index][0]))
+
+    for index in order:
+        (width, height) = sizes[index]
+
+        if width + padding > max_width or height + padding > max_height:
+            raise ValueError(f'{width}x{height} does not fit on a '
+                             f'{max_width}x{max_height} atlas page.')
+
+        for (page, shelves) in enumerate(pages):
+            shelf = next((shelf for shelf in shelves
+                          if shelf[1] >= height and shelf[2] + width + padding <= max_width),
+                         None)
+
+            if shelf is None:
+                # Open a new shelf on this page if there's room.
+                top = shelves[-1][0] + shelves[-1][1] + padding if shelves else 0
+
+                if top + height + padding > max_height:
+                    continue
+
+                shelf = [top, height, 0]
+                shelves.append(shelf)
+
+            break
+        else:
+            page = len(pages)
+            shelf = [0, height, 0]
+            pages.append([shelf])
+
+        placements[index] = (page, shelf[2], shelf[0])
+        shelf[2] += width + padding
+
+    return placements
+
+
+class TextureAtlas:
+    def __init__(self, pages, regions):
+        super().__init__()
+        # pages is a list of Surfaces, and regions maps names to (page, Rect).
+        self.pages = pages
+        self.regions = regions
+
+    def __contains__(self, name):
+        return name in self.regions
+
+    def __iter__(self):
+        return iter(self.regions)
+
+    def __len__(self):
+        return len(self.regions)
+
+    def region(self, name):
+        # Returns (page surface, rect) so callers can blit straight from the page.
+        (page, rect) = self.regions[name]
+
+        return (self.pages[page], rect)
+
+    def image(self, name):
+        # A subsurface shares pixels with the page, so this doesn't copy anything.
+        (page, rect) = self.region(name)
+
+        return page.subsurface(rect)
+
+    @classmethod
+    def from_images(cls, images, max_size=(1024, 1024), padding=1):  # noqa: R0914
+        # images maps names to Surfaces.
+        names = list(images)
+        sizes = [images[name].get_size() for name in names]
+        (max_width, max_height) = max_size
+
+        placements = pack_shelves(sizes=sizes,
+                                  max_width=max_width,
+                                  max_height=max_height,
+                                  padding=padding)
+
+        # Trim each page down to what's actually used.
+        page_sizes = {}
+        for ((width, height), (page, x, y)) in zip(sizes, placements):
+            (page_width, page_height) = page_sizes.get(page, (0, 0))
+            page_sizes[page] = (max(page_width, x + width), max(page_height, y + height))
+
+        pages = [pygame.Surface(page_sizes[page]) for page in sorted(page_sizes)]
+        regions = {}
+
+        for (name, (width, height), (page, x, y)) in zip(names, sizes, placements):
+            pages[page].blit(images[name], (x, y))
+            regions[name] = (page, pygame.Rect(x, y, width, height))
+
+        log.info(f'Packed {len(regions)} images onto {len(pages)} atlas pages.')
+
+        return cls(pages=pages, regions=regions)
+
+    @classmethod
+    def from_directory(cls, path, pattern='*.cfg', max_size=(1024, 1024), padding=1):
+        # Sprites are named after their file, minus the extension.  Atlas indexes
+        # (which might have been built into the same directory) aren't sprites.
+        images = {}
+
+        for filename in sorted(glob.glob(os.path.join(path, pattern))):
+            if filename.endswith(ATLAS_SUFFIX):
+                continue
+
+            name = os.path.basename(filename).split('.')[0]
+            images[name] = BitmappySprite(filename=filename).image
+
+        return cls.from_images(images=images, max_size=max_size, padding=padding)
+
+    @staticmethod
+    def page_path(path, page):
+        return f'{os.path.splitext(path)[0]}.{page}.png'
+
+    def save(self, path):
+        config = configparser.ConfigParser()
+        config['atlas'] = {'pages': str(len(self.pages))}
+
+        for (page, image) in enumerate(self.pages):
+            pygame.image.save(image, TextureAtlas.page_path(path, page))
+
+        for (name, (page, rect)) in self.regions.items():
+            config[f'{SPRITE_SECTION}{name}'] = {
+                'page': page,
+                'x': rect.x,
+                'y': rect.y,
+                'width': rect.width,
+                'height': rect.height,
+            }
+
+        with open(path, 'w', encoding='utf-8') as fh:
+            config.write(fh)
+
+    @classmethod
+    def load(cls, path):
+        config = configparser.ConfigParser()
+        config.read(path, encoding='utf-8')
+
+        pages = [pygame.image.load(TextureAtlas.page_path(path, page))
+                 for page in range(config.getint('atlas', 'pages'))]
+
+        regions = {}
+        for section_name in config.sections():
+            if not section_name.startswith(SPRITE_SECTION):
+                continue
+
+            section = config[section_name]
+            name = section_name[len(SPRITE_SECTION):]
+            regions[name] = (section.getint('page'),
+                             pygame.Rect(section.getint('x'),
+                                         section.getint('y'),
+                                         section.getint('width'),
+                                         section.getint('height')))
+
+        return cls(pages=pages, regions=regions)
@@ -1,17 +1,64 @@
-from .palette import Custom, VGA, System
+import threading
 
-# Load Common Palettes
-VGA = VGA()
-SYSTEM = System()
+import pygame
+
+from . import palette
+from .palette import ColorPalette, Custom, System
+
+# Common palettes are loaded the first time they're used, rather than on import,
+# so importing the engine doesn't mean reading every palette file.
+PALETTES = {
+    'VGA': palette.VGA,
+    'SYSTEM': System,
+    '__custom_palette__': Custom,
+}
 
 # TODO: Refactor code to use CUSTOM.<COLOR> instead. kept for backwards compatibility
-__custom_palette__ = Custom()
-YELLOW = __custom_palette__.YELLOW
-PURPLE = __custom_palette__.PURPLE
-BLUE = __custom_palette__.BLUE
-GREEN = __custom_palette__.GREEN
-WHITE = __custom_palette__.WHITE
-BLACK = __custom_palette__.BLACK
-BLACKLUCENT = __custom_palette__.BLACKLUCENT
-BLUELUCENT = __custom_palette__.BLUELUCENT
-RED = __custom_palette__.RED
+CUSTOM_COLORS = (
+    'YELLOW',
+    'PURPLE',
+    'BLUE',
+    'GREEN',
+    'WHITE',
+    'BLACK',
+    'BLACKLUCENT',
+    'BLUELUCENT',
+    'RED',
+)
+
+# Declared, but not bound, so linters and readers know these names exist, while
+# lookups still reach __getattr__() below until each one is first loaded.
+VGA: ColorPalette
+SYSTEM: ColorPalette
+YELLOW: pygame.Color
+PURPLE: pygame.Color
+BLUE: pygame.Color
+GREEN: pygame.Color
+WHITE: pygame.Color
+BLACK: pygame.Color
+BLACKLUCENT: pygame.Color
+BLUELUCENT: pygame.Color
+RED: pygame.Color
+
+__all__ = ['PALETTES', 'CUSTOM_COLORS', 'VGA', 'SYSTEM', *CUSTOM_COLORS]
+
+_palette_lock = threading.RLock()
+
+
+def __getattr__(name):
+    # Only called for names we haven't loaded yet; after that, they're plain globals.
+    if name not in PALETTES and name not in CUSTOM_COLORS:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    with _palette_lock:
+        if name not in globals():
+            if name in PALETTES:
+                globals()[name] = PALETTES[name]()
+            else:
+                globals()[name] = getattr(__getattr__('__custom_palette__'), name)
+
+    return globals()[name]
+
+
+def __dir__():
+    return sorted({*globals(), *PALETTES, *CUSTOM_COLORS})
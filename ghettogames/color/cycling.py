@@ -0,0 +1,126 @@
+# GhettoGames
+# cycling: Hardware style palette cycling for 8-bit surfaces
+#
+# Old hardware animated water, fire and waterfalls by rotating a run of palette entries
+# every so often, leaving the pixels alone.  An 8-bit pygame Surface can do the same:
+# every registered surface has its palette rotated and written back with set_palette(),
+# which is a 256 entry write no matter how many pixels use those colors.
+#
+#   cycler = PaletteCycler()
+#   cycler.add_cycle(start=16, stop=24, interval=100)
+#   cycler.register(water_sprite)
+#
+#   # and then once per frame:
+#   cycler.update()
+import logging
+
+import pygame
+
+from ghettogames.color.palette import ColorPalette
+
+log = logging.getLogger('game.color.cycling')
+log.addHandler(logging.NullHandler())
+
+
+class PaletteCycle:
+    # Rotates palette[start:stop] one slot every interval milliseconds.
+    # Negative steps cycle the other way.
+    def __init__(self, start, stop, interval=100, step=1):
+        super().__init__()
+
+        if stop - start < 2:
+            raise ValueError(f'A palette cycle needs at least 2 colors, not [{start}:{stop}].')
+
+        if interval <= 0:
+            raise ValueError(f'Palette cycle intervals must be positive, not {interval}.')
+
+        self.start = start
+        self.stop = stop
+        self.interval = interval
+        self.step = step
+        self.last_update = None
+
+    def slots(self, ticks):
+        # Returns how many slots to rotate by since the last update.
+        if self.last_update is None:
+            self.last_update = ticks
+            return 0
+
+        steps = (ticks - self.last_update) // self.interval
+        self.last_update += steps * self.interval
+
+        return steps * self.step
+
+
+class PaletteCycler:
+    def __init__(self):
+        super().__init__()
+        self.cycles = []
+
+        # Surface -> its working palette, and the sprites registered with it.
+        self.palettes = {}
+        self.sprites = {}
+
+    def add_cycle(self, start, stop, interval=100, step=1):
+        cycle = PaletteCycle(start=start, stop=stop, interval=interval, step=step)
+        self.cycles.append(cycle)
+
+        return cycle
+
+    def register(self, target, palette=None):
+        # target is an 8-bit Surface, or a sprite with one as its image.  palette
+        # replaces the surface's own palette, if given.
+        #
+        # Sprites loaded from the same file can share an image (see ImageCache), and
+        # cycling it would cycle all of them, so sprites get an image of their own.
+        if hasattr(target, 'detach_image'):
+            target.detach_image()
+
+        surface = getattr(target, 'image', target)
+
+        if surface.get_bitsize() != 8:
+            raise ValueError(f'Palette cycling needs an 8-bit surface, not {surface}.')
+
+        if surface not in self.palettes:
+            self.palettes[surface] = ColorPalette(palette or surface.get_palette())
+
+            if palette is not None:
+                surface.set_palette(self.palettes[surface].surface_palette)
+
+        if surface is not target:
+            self.sprites.setdefault(surface, []).append(target)
+
+    def unregister(self, target):
+        surface = getattr(target, 'image', target)
+        sprites = self.sprites.get(surface, [])
+
+        if target in sprites:
+            sprites.remove(target)
+
+        # The surface stays registered while any of its sprites are.
+        if surface is target or not sprites:
+            self.palettes.pop(surface, None)
+            self.sprites.pop(surface, None)
+
+    def update(self, ticks=None):
+        # Returns True if any palette changed.
+        if ticks is None:
+            ticks = pygame.time.get_ticks()
+
+        rotations = [(cycle, cycle.slots(ticks)) for cycle in self.cycles]
+        rotations = [(cycle, slots) for (cycle, slots) in rotations if slots]
+
+        if not rotations:
+            return False
+
+        for (surface, palette) in self.palettes.items():
+            for (cycle, slots) in rotations:
+                palette.rotate(slots, start=cycle.start, stop=cycle.stop)
+
+            surface.set_palette(palette.surface_palette)
+
+            # Dirty sprites get redrawn with their new colors.
+            for sprite in self.sprites.get(surface, ()):
+                sprite.dirty = sprite.dirty or 1
+
+        return True
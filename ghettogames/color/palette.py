@@ -4,37 +4,156 @@
 # A color palette is contained in a CFG file with each color having a section with the
 # R,G,B,A values.  This is designed for learning purposes.  Palette files are stored in
 # the resources folder.
-from collections import deque
+import array
 import configparser
+import itertools
 import os.path
+import sys
+
+import pygame
 from pygame import Color
 
+from ghettogames.color.palette_cache import load_compiled_palette, save_compiled_palette
+from ghettogames.color.quantize import QuantizationIndex
+
 
 class ColorPalette:
+    # Colors are kept as RGBA bytes in one contiguous buffer, so indexing is O(1),
+    # and whole palettes can be handed to pygame (or NumPy) without a Color per entry.
+
+    # rgba_data is packed RGBA bytes, which skips making a Color for every entry.
+    def __init__(self, colors=(), rgba_data=None):
+        if rgba_data is not None:
+            self._rgba = bytearray(rgba_data)
+        else:
+            self._rgba = bytearray(itertools.chain.from_iterable(Color(color) for color in colors))
+        self._quantization_index = None
 
-    def __init__(self, colors):
-        self._colors = deque(colors)
-        self._size = len(colors)
+    # Shift colors in palette (or in palette[start:stop]) by number of slots
+    def rotate(self, slots=1, start=0, stop=None):
+        (start, stop, _) = slice(start, stop).indices(len(self))
+        if stop <= start:
+            return
 
-    # Shift colors in palette by number of slots
-    def rotate(self, slots=1):
-        self._colors.rotate(slots)
+        # Like deque.rotate(), positive slots move colors towards the end.
+        offset = slots % (stop - start) * 4
+        if offset:
+            (start, stop) = (start * 4, stop * 4)
+            colors = self._rgba[start:stop]
+            self._rgba[start:stop] = colors[-offset:] + colors[:-offset]
 
     # Return PyGame Color object at palette index
     def get_color(self, palette_index):
-        if palette_index < self._size:
-            return self._colors[palette_index]
+        if palette_index < len(self):
+            return self[palette_index]
         return None
 
-    # Replace color at palette index with a new PyGame color object
+    # Replace color at palette index with a new PyGame color object, or add one at the end
+    # if palette index is len(palette)
     def set_color(self, palette_index, new_color):
-        if palette_index < self._size:
-            self._colors[palette_index] = new_color
-        else:
-            self._colors.append(new_color)
+        if palette_index == len(self):
+            self._rgba.extend(tuple(Color(new_color)))
+            return
+
+        if not -len(self) <= palette_index < len(self):
+            raise IndexError('palette index out of range')
+
+        offset = palette_index % len(self) * 4
+        self._rgba[offset:offset + 4] = tuple(Color(new_color))
+
+    def __getitem__(self, palette_index):
+        if not -len(self) <= palette_index < len(self):
+            raise IndexError('palette index out of range')
+
+        offset = palette_index % len(self) * 4
+
+        return Color(*self._rgba[offset:offset + 4])
+
+    def __iter__(self):
+        return map(Color, *(self._rgba[channel::4] for channel in range(4)))
+
+    def __len__(self):
+        return len(self._rgba) // 4
+
+    # A (colors, 4) view of the palette's RGBA bytes, which NumPy can wrap without a copy:
+    #   numpy.asarray(palette.rgba)
+    # The palette can't grow while a view is alive.
+    @property
+    def rgba(self):
+        return memoryview(self._rgba).cast('B', (len(self), 4))
+
+    # The palette as packed RGB bytes.
+    @property
+    def rgb(self):
+        rgb_data = bytearray(len(self) * 3)
+
+        for channel in range(3):
+            rgb_data[channel::3] = self._rgba[channel::4]
+
+        return bytes(rgb_data)
+
+    def copy(self):
+        palette = ColorPalette(())
+        palette._rgba[:] = self._rgba
+
+        return palette
+
+    # The palette as a list of (r, g, b) tuples, ready for Surface.set_palette()
+    @property
+    def surface_palette(self):
+        return list(zip(*(self._rgba[channel::4] for channel in range(3))))
+
+    # Map a buffer of palette indexes to packed RGB (or RGBA) bytes.
+    def map_indices(self, indices, pixel_format='RGB'):
+        channels = len(pixel_format)
+        indices = memoryview(indices)
+
+        if indices.itemsize == 1:
+            index_data = indices.tobytes()
+
+            if index_data and max(index_data) >= len(self):
+                raise IndexError('palette index out of range')
+
+            # Each channel of the whole buffer is one bytes.translate() call.
+            pixel_data = bytearray(len(index_data) * channels)
+
+            # A byte can't index past 255, however big the palette is.
+            for channel in range(channels):
+                channel_table = bytes(self._rgba[channel:256 * 4:4]).ljust(256, b'\0')
+                pixel_data[channel::channels] = index_data.translate(channel_table)
+
+            return bytes(pixel_data)
+
+        # Wider indexes (more than 256 colors) are looked up a pixel at a time.
+        indices = indices.cast('B').cast(indices.format)
+
+        if indices.nbytes and max(indices) >= len(self):
+            raise IndexError('palette index out of range')
+
+        colors = [bytes(self._rgba[offset:offset + channels])
+                  for offset in range(0, len(self._rgba), 4)]
+
+        return b''.join(map(colors.__getitem__, indices))
+
+    # The nearest color lookup for this palette.  It's built on first use, and rebuilt
+    # if the palette has changed since (a rotate() or set_color(), say).
+    @property
+    def quantization_index(self):
+        rgb_data = self.rgb
+
+        if self._quantization_index is None or self._quantization_index.palette != rgb_data:
+            self._quantization_index = QuantizationIndex(rgb_data)
+
+        return self._quantization_index
+
+    # Map a buffer of packed RGB (or RGBA) pixels to the nearest palette indexes.
+    def quantize(self, pixel_data, pixel_format='RGB'):
+        return self.quantization_index.quantize(pixel_data, pixel_format=pixel_format)
 
 
 class PaletteUtility:
+    # Keep a compiled copy of each palette file next to it.
+    USE_CACHE = True
 
     # Load a palette from a ConfigParser object. Returns a list of PyGame Color objects
     @staticmethod
@@ -51,11 +170,31 @@ class PaletteUtility:
     # Load a palette from a GhettoGames CFG file. Returns a list of PyGame Color objects
     @staticmethod
     def load_palette_from_file(config_file_path):
+        rgba_data = PaletteUtility.load_rgba_from_file(config_file_path)
+        return [Color(*rgba_data[offset:offset + 4]) for offset in range(0, len(rgba_data), 4)]
+
+    # Load a palette from a GhettoGames CFG file. Returns packed RGBA bytes
+    @staticmethod
+    def load_rgba_from_file(config_file_path):
+        if PaletteUtility.USE_CACHE:
+            rgba_data = load_compiled_palette(config_file_path)
+
+            if rgba_data is not None:
+                return rgba_data
+
         config = configparser.ConfigParser()
         # Read contents of file and close after
         with open(config_file_path) as file_obj:
             config.read_file(file_obj)
-        return PaletteUtility.load_palette_from_config(config)
+
+        rgba_data = bytes(itertools.chain.from_iterable(
+            PaletteUtility.load_palette_from_config(config)
+        ))
+
+        if PaletteUtility.USE_CACHE:
+            save_compiled_palette(config_file_path, rgba_data)
+
+        return rgba_data
 
     # Write a GhettoGames palette to a file.  output_file extension should be .cfg
     @staticmethod
@@ -63,19 +202,67 @@ class PaletteUtility:
         with open(output_file, mode) as file_obj:
             config_data.write(file_obj)
 
-    # Read RGB data from a file, 1 per line. No blank lines. Use RGBA to specify transparency.
+    # Read RGB data from a file, 1 per line. Use RGBA to specify transparency.
     # Returns a list of PyGame Colors
     @staticmethod
     def parse_rgb_data_in_file(rgb_data_file):
         # Read input RGBA Values from file.  No duplicates
-        colors = []
+        colors = dict.fromkeys(PaletteUtility.iter_rgb_data_in_file(rgb_data_file))
+        return [Color(*color) for color in colors]
+
+    # Yield RGBA tuples from a file of RGB data, a line at a time, so files of any size work.
+    @staticmethod
+    def iter_rgb_data_in_file(rgb_data_file):
         with open(rgb_data_file) as file_obj:
-            for line in file_obj.readlines():
-                tmp = [int(x) for x in line.strip().split(',')]
-                color = Color(*tmp)
-                if color not in colors:
-                    colors.append(color)
-        return colors
+            for line in file_obj:
+                if line.strip():
+                    yield tuple(Color(*(int(x) for x in line.split(','))))
+
+    # Extract the unique colors, in the order they first appear, from any mix of RGB data
+    # files (.txt), image files, Surfaces, and sprites.  Returns packed RGBA bytes
+    @staticmethod
+    def extract_rgba(sources):
+        # Every color is packed into an int, so one dict.fromkeys() call over all the
+        # pixels of all the images does the deduplication.
+        def packed_colors(source):
+            if isinstance(source, (str, os.PathLike)) and \
+                    os.path.splitext(source)[1].lower() == '.txt':
+                return (int.from_bytes(bytes(color), sys.byteorder)
+                        for color in PaletteUtility.iter_rgb_data_in_file(source))
+
+            if isinstance(source, (str, os.PathLike)):
+                source = pygame.image.load(source)
+
+            surface = getattr(source, 'image', source)
+
+            if surface.get_flags() & pygame.SRCALPHA:
+                rgba_data = pygame.image.tostring(surface, 'RGBA')
+            else:
+                # Surfaces without per pixel alpha are opaque, whatever their 4th byte says.
+                rgb_data = pygame.image.tostring(surface, 'RGB')
+                rgba_data = bytearray(b'\xff') * (len(rgb_data) // 3 * 4)
+
+                for channel in range(3):
+                    rgba_data[channel::4] = rgb_data[channel::3]
+
+            packed_data = array.array('I')
+            packed_data.frombytes(rgba_data)
+
+            return packed_data
+
+        colors = dict.fromkeys(itertools.chain.from_iterable(map(packed_colors, sources)))
+
+        return array.array('I', colors).tobytes()
+
+    # Write packed RGBA bytes out as a GhettoGames CFG file, along with its compiled copy
+    @staticmethod
+    def save_rgba_to_file(rgba_data, output_file):
+        colors = [Color(*rgba_data[offset:offset + 4]) for offset in range(0, len(rgba_data), 4)]
+        palette_data = PaletteUtility.create_palette_data(colors)
+        PaletteUtility.write_palette_to_file(palette_data, output_file)
+
+        if PaletteUtility.USE_CACHE:
+            save_compiled_palette(output_file, rgba_data)
 
     # Create a ConfigParser object containing palette data.  Returns a ConfigParser
     @staticmethod
@@ -96,14 +283,18 @@ class PaletteUtility:
 class NES(ColorPalette):
 
     def __init__(self):
-        super().__init__(PaletteUtility.load_palette_from_file(os.path.join(os.path.dirname(__file__), 'resources/NES.cfg')))
+        super().__init__(rgba_data=PaletteUtility.load_rgba_from_file(
+            os.path.join(os.path.dirname(__file__), 'resources/NES.cfg')
+        ))
 
 
 # A Custom Color palette with named colors
 class Custom(ColorPalette):
 
     def __init__(self):
-        super().__init__(PaletteUtility.load_palette_from_file(os.path.join(os.path.dirname(__file__), 'resources/custom.cfg')))
+        super().__init__(rgba_data=PaletteUtility.load_rgba_from_file(
+            os.path.join(os.path.dirname(__file__), 'resources/custom.cfg')
+        ))
         self.YELLOW = self.get_color(0)
         self.PURPLE = self.get_color(1)
         self.BLUE = self.get_color(2)
@@ -118,7 +309,9 @@ class Custom(ColorPalette):
 # A palette representing the 16 default system colors
 class System(ColorPalette):
     def __init__(self):
-        super().__init__(PaletteUtility.load_palette_from_file(os.path.join(os.path.dirname(__file__), 'resources/system.cfg')))
+        super().__init__(rgba_data=PaletteUtility.load_rgba_from_file(
+            os.path.join(os.path.dirname(__file__), 'resources/system.cfg')
+        ))
         self.BLACK = self.get_color(0)
         self.MAROON = self.get_color(1)
         self.GREEN = self.get_color(2)
@@ -140,4 +333,6 @@ class System(ColorPalette):
 # The 256 VGA color palette
 class VGA(ColorPalette):
     def __init__(self):
-        super().__init__(PaletteUtility.load_palette_from_file(os.path.join(os.path.dirname(__file__), 'resources/vga.cfg')))
+        super().__init__(rgba_data=PaletteUtility.load_rgba_from_file(
+            os.path.join(os.path.dirname(__file__), 'resources/vga.cfg')
+        ))
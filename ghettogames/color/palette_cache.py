@@ -0,0 +1,97 @@
+# GhettoGames
+# palette_cache: Compiled binary sidecars for palette files
+#
+# The VGA palette is over 1500 lines of CFG, and ConfigParser takes a while to get
+# through it, so like sprites, each palette file gets a compiled copy written next to
+# it the first time it's loaded: just its RGBA bytes, and the source file's mtime and
+# size so that we know when it's out of date.
+import contextlib
+import logging
+import os
+import struct
+import tempfile
+
+log = logging.getLogger('game.color.palette_cache')
+log.addHandler(logging.NullHandler())
+
+CACHE_SUFFIX = '.cache'
+MAGIC = b'GGPC'
+VERSION = 1
+
+# magic, version, source mtime (ns), source size, color count
+HEADER = struct.Struct('<4sHqqI')
+
+
+def cache_path(path):
+    return f'{path}{CACHE_SUFFIX}'
+
+
+def load_compiled_palette(path):
+    # Returns the palette's RGBA bytes, or None if there's no compiled copy of path
+    # or it's out of date.
+    try:
+        source = os.stat(path)
+
+        with open(cache_path(path), 'rb') as fh:
+            compiled_data = fh.read()
+    except OSError:
+        return None
+
+    try:
+        (magic, version, mtime, size, color_count) = HEADER.unpack_from(compiled_data)
+    except struct.error:
+        log.debug(f'Truncated palette cache: {cache_path(path)}')
+        return None
+
+    if (magic, version) != (MAGIC, VERSION):
+        log.debug(f'Unrecognized palette cache: {cache_path(path)}')
+        return None
+
+    if (mtime, size) != (source.st_mtime_ns, source.st_size):
+        log.debug(f'Stale palette cache: {cache_path(path)}')
+        return None
+
+    rgba_data = compiled_data[HEADER.size:HEADER.size + color_count * 4]
+
+    if len(rgba_data) != color_count * 4:
+        log.debug(f'Truncated palette cache: {cache_path(path)}')
+        return None
+
+    return rgba_data
+
+
+def save_compiled_palette(path, rgba_data):
+    # The cache is an optimization, so failing to write it (say, because the
+    # palette lives somewhere read-only) isn't an error.
+    try:
+        source = os.stat(path)
+
+        header = HEADER.pack(MAGIC,
+                             VERSION,
+                             source.st_mtime_ns,
+                             source.st_size,
+                             len(rgba_data) // 4)
+
+        # Write to a temporary file first so a reader never sees half a cache.  Palettes
+        # can load on several threads at once (see AssetManager), so each write gets a
+        # file of its own.
+        (fd, temporary_path) = tempfile.mkstemp(dir=os.path.dirname(path) or os.curdir,
+                                                prefix=f'{os.path.basename(cache_path(path))}.',
+                                                suffix='.tmp')
+
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                fh.write(header)
+                fh.write(rgba_data)
+
+            os.replace(temporary_path, cache_path(path))
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(temporary_path)
+
+            raise
+    except (OSError, struct.error) as e:
+        log.debug(f'Not caching {path}: {e}')
+        return False
+
+    return True
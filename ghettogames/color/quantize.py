@@ -0,0 +1,156 @@
+# GhettoGames
+# quantize: Maps arbitrary RGB colors to the nearest color in a palette
+#
+# Searching a 256 color palette for every pixel of an imported image is far too slow,
+# so a QuantizationIndex answers from a 32x32x32 table instead, built once per palette.
+# Each cell holds the palette color nearest to the middle of the cell.
+#
+# The table is built a column of blue cells at a time: with red and green fixed, each
+# palette color's distance is a parabola in blue, and the lowest of a set of parabolas
+# can be found in one sweep, so building it doesn't need a palette scan per cell.
+import array
+import logging
+import sys
+
+log = logging.getLogger('game.color.quantize')
+log.addHandler(logging.NullHandler())
+
+# Bits per channel kept in the table, so 5 makes a 32x32x32 table.
+BITS = 5
+SHIFT = 8 - BITS
+CELLS = 1 << BITS
+
+# The middle of each cell, in 0-255 channel values.
+CELL_CENTERS = [(cell << SHIFT) + ((1 << SHIFT) - 1) / 2 for cell in range(CELLS)]
+
+# Table keys are 15 bits (rrrrrgggggbbbbb), and we build them a byte at a time,
+# each byte out of two channels, so each channel gets translated into its share
+# of the high and low bytes.
+KEY_TABLES = {
+    'red_high': bytes((value >> SHIFT) << 2 for value in range(256)),
+    'green_high': bytes(value >> (SHIFT + 3) for value in range(256)),
+    'green_low': bytes(((value >> SHIFT) & 7) << 5 for value in range(256)),
+    'blue_low': bytes(value >> SHIFT for value in range(256)),
+}
+
+
+def lower_envelope(positions, heights, samples):
+    # For parabolas (x - position) ** 2 + height, with positions sorted, returns the
+    # index of the lowest parabola at each of the sorted samples.
+    parabolas = []
+    boundaries = []
+
+    for (index, (position, height)) in enumerate(zip(positions, heights)):
+        if parabolas and positions[parabolas[-1]] == position:
+            if height >= heights[parabolas[-1]]:
+                continue
+
+            parabolas.pop()
+            boundaries.pop()
+
+        # Drop any parabolas this one is lower than, from where they start being lowest.
+        boundary = float('-inf')
+        while parabolas:
+            last = parabolas[-1]
+            boundary = ((height + position * position) -
+                        (heights[last] + positions[last] * positions[last])) / \
+                (2 * (position - positions[last]))
+
+            if boundary > boundaries[-1]:
+                break
+
+            parabolas.pop()
+            boundaries.pop()
+            boundary = float('-inf')
+
+        parabolas.append(index)
+        boundaries.append(boundary)
+
+    nearest = []
+    parabola = 0
+    for sample in samples:
+        while parabola + 1 < len(parabolas) and boundaries[parabola + 1] < sample:
+            parabola += 1
+
+        nearest.append(parabolas[parabola])
+
+    return nearest
+
+
+def nearest_color_table(palette):
+    # Returns an array with the index of the nearest palette color for every cell,
+    # where palette is packed RGB bytes.
+    color_count = len(palette) // 3
+
+    if not color_count:
+        raise ValueError("Can't quantize to an empty palette.")
+
+    # Sort by blue once, so every column's parabolas come in order.
+    order = sorted(range(color_count), key=lambda index: (palette[index * 3 + 2], index))
+    reds = [palette[index * 3] for index in order]
+    greens = [palette[index * 3 + 1] for index in order]
+    blues = [palette[index * 3 + 2] for index in order]
+
+    table = array.array('B' if color_count <= 256 else 'H')
+
+    for red in CELL_CENTERS:
+        red_distances = [(red - color_red) ** 2 for color_red in reds]
+
+        for green in CELL_CENTERS:
+            heights = [red_distance + (green - color_green) ** 2
+                       for (red_distance, color_green) in zip(red_distances, greens)]
+
+            table.extend(order[nearest]
+                         for nearest in lower_envelope(blues, heights, CELL_CENTERS))
+
+    return table
+
+
+class QuantizationIndex:
+    def __init__(self, palette):
+        super().__init__()
+        # palette is packed RGB bytes.
+        self.palette = bytes(palette)
+        self.table = nearest_color_table(self.palette)
+
+    def nearest(self, color):
+        # Returns the palette index nearest to an (r, g, b) color.
+        (red, green, blue) = tuple(color)[:3]
+
+        return self.table[((red >> SHIFT) << (BITS * 2)) | ((green >> SHIFT) << BITS) |
+                          (blue >> SHIFT)]
+
+    def keys(self, pixel_data, pixel_format='RGB'):
+        # Returns an array of table keys, one per pixel.
+        pixel_data = memoryview(pixel_data).cast('B')
+        channels = len(pixel_format)
+        pixel_count = len(pixel_data) // channels
+        pixel_data = pixel_data[:pixel_count * channels]
+
+        (red, green, blue) = (pixel_data[channel::channels].tobytes() for channel in range(3))
+
+        # Each key byte is two channels' shares OR'ed together, which big ints
+        # do for the whole image at once.
+        def combine(high_share, low_share):
+            return (int.from_bytes(high_share, 'big') |
+                    int.from_bytes(low_share, 'big')).to_bytes(pixel_count, 'big')
+
+        key_data = bytearray(pixel_count * 2)
+        key_data[1::2] = combine(red.translate(KEY_TABLES['red_high']),
+                                 green.translate(KEY_TABLES['green_high']))
+        key_data[0::2] = combine(green.translate(KEY_TABLES['green_low']),
+                                 blue.translate(KEY_TABLES['blue_low']))
+
+        keys = array.array('H')
+        keys.frombytes(key_data)
+
+        if sys.byteorder != 'little':
+            keys.byteswap()
+
+        return keys
+
+    def quantize(self, pixel_data, pixel_format='RGB'):
+        # Returns an array of palette indexes, one per pixel of pixel_data,
+        # which is packed RGB (or RGBA) pixels in any buffer.
+        return array.array(self.table.typecode,
+                           map(self.table.__getitem__, self.keys(pixel_data, pixel_format)))
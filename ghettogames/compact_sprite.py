@@ -0,0 +1,104 @@
+# GhettoGames
+# compact_sprite: A compact binary format for Bitmappy sprites
+#
+# The .cfg format spends a character (or more) on every pixel, and a whole section on
+# every color, which adds up quickly for big tile sheets.  A compact sprite stores the
+# same thing as a packed RGB palette followed by zlib compressed palette indexes.  Rows
+# of the same color compress down to almost nothing, and loading is a single inflate.
+#
+# magic, version, width, height, name length, color count, compressed index length
+# name (utf-8)
+# palette (3 bytes per color)
+# zlib compressed palette indexes (1 byte each, or 2 little endian bytes past 256 colors)
+import array
+import logging
+import struct
+import sys
+import zlib
+
+from ghettogames.sprite_cache import index_type
+from ghettogames.sprite_parser import SpriteParseError
+
+log = logging.getLogger('game.compact_sprite')
+log.addHandler(logging.NullHandler())
+
+COMPACT_SUFFIX = '.bmpy'
+MAGIC = b'GGSP'
+VERSION = 1
+
+HEADER = struct.Struct('<4sHHHHII')
+
+
+def is_compact_sprite(path):
+    return str(path).lower().endswith(COMPACT_SUFFIX)
+
+
+def load_compact_sprite(path):
+    # Returns (name, width, height, palette, index_data), like parse_sprite_file().
+    with open(path, 'rb') as fh:
+        sprite_data = fh.read()
+
+    try:
+        (magic, version, width, height, name_length, color_count, compressed_length) = \
+            HEADER.unpack_from(sprite_data)
+    except struct.error as e:
+        raise SpriteParseError(f'{path}: Truncated compact sprite') from e
+
+    if magic != MAGIC:
+        raise SpriteParseError(f'{path}: Not a compact sprite')
+
+    if version != VERSION:
+        raise SpriteParseError(f'{path}: Unsupported compact sprite version {version}')
+
+    offset = HEADER.size
+    name = sprite_data[offset:offset + name_length].decode('utf-8')
+
+    offset += name_length
+    palette = sprite_data[offset:offset + color_count * 3]
+
+    offset += color_count * 3
+    try:
+        index_bytes = zlib.decompress(sprite_data[offset:offset + compressed_length])
+    except zlib.error as e:
+        raise SpriteParseError(f'{path}: Corrupt compact sprite: {e}') from e
+
+    index_data = array.array(index_type(color_count))
+
+    if len(palette) != color_count * 3 or \
+            len(index_bytes) != width * height * index_data.itemsize:
+        raise SpriteParseError(f'{path}: Truncated compact sprite')
+
+    index_data.frombytes(index_bytes)
+
+    if sys.byteorder != 'little':
+        index_data.byteswap()
+
+    if max(index_data, default=0) >= color_count:
+        raise SpriteParseError(f'{path}: Pixels with no color')
+
+    return (name, width, height, palette, index_data)
+
+
+def save_compact_sprite(path, name, width, height, palette, index_data, level=9):
+    color_count = len(palette) // 3
+    index_data = array.array(index_type(color_count), index_data)
+
+    if sys.byteorder != 'little':
+        index_data.byteswap()
+
+    encoded_name = name.encode('utf-8')
+    compressed_data = zlib.compress(index_data.tobytes(), level)
+
+    with open(path, 'wb') as fh:
+        fh.write(HEADER.pack(MAGIC,
+                             VERSION,
+                             width,
+                             height,
+                             len(encoded_name),
+                             color_count,
+                             len(compressed_data)))
+        fh.write(encoded_name)
+        fh.write(palette)
+        fh.write(compressed_data)
+
+    log.debug(f'Saved {width}x{height} compact sprite with {color_count} colors: {path}')
@@ -1,24 +1,48 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import array
+import bisect
 import collections
+import collections.abc
+import concurrent.futures
 import configparser
-import inspect
+import contextlib
+import functools
+import itertools
 import logging
+import mmap
 import multiprocessing
+import operator
+import os
 import platform
 import re
+import sys
+import threading
+import types
+import weakref
 
 import pygame
 import pygame.freetype
 import pygame.gfxdraw
 import pygame.locals
 
-from ghettogames.color import PURPLE, BLACK, VGA
+import ghettogames.color
+from ghettogames.color.palette import ColorPalette, PaletteUtility
+from ghettogames.compact_sprite import is_compact_sprite
+from ghettogames.compact_sprite import load_compact_sprite, save_compact_sprite
+from ghettogames.sprite_cache import load_compiled_sprite, save_compiled_sprite
+from ghettogames.sprite_parser import SpriteParseError, parse_sprite_file
 
 log = logging.getLogger('game.engine')
 log.addHandler(logging.NullHandler())
 
-vga_palette = VGA
+
+def __getattr__(name):
+    # The VGA palette is loaded on first use, so this is too.
+    if name == 'vga_palette':
+        return ghettogames.color.VGA
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 def indexed_rgb_triplet_generator(pixel_data):
@@ -29,98 +53,164 @@ def indexed_rgb_triplet_generator(pixel_data):
         pass
 
 
-def rgb_555_triplet_generator(pixel_data):
-    try:
-        # Construct RGB triplets.
-        for packed_rgb_triplet in pixel_data:
-            # struct unpacks as a 1 element tuple.
-            rgb_data = bin(packed_rgb_triplet[0])
+# Packed 16-bit pixel layouts, keyed by format name, as (shift, bits)
+# for each of the red, green, and blue channels.
+#
+# 555 is RRRRRGGGGGBBBBBx, where the last bit is ignored or used for alpha.
+# 565 is RRRRRGGGGGGBBBBB.
+PACKED_RGB_FORMATS = {
+    '555': ((11, 5), (6, 5), (1, 5)),
+    '565': ((11, 5), (5, 6), (0, 5)),
+}
 
-            # binary conversions start with 0b, so chop that off.
-            rgb_data = rgb_data[2:]
 
-            # Pad the data out.
-            pad_bits = 16 - len(rgb_data)
-            pad_data = '0' * pad_bits
+def expand_channel(value, bits):
+    # Scale a channel up to 8 bits.  Non-zero values have their
+    # low bits filled in, so full intensity maps to 255.
+    if not value:
+        return 0
 
-            rgb_data = pad_data + rgb_data
+    return ((value + 1) << (8 - bits)) - 1
 
-            log.info(f'Padded {pad_bits} bits (now {rgb_data})')
 
-            # red is 5 bits
-            red = int(rgb_data[0:5] + '000', 2)
+@functools.lru_cache(maxsize=None)
+def packed_rgb_tables(pixel_format='565'):
+    # Rather than doing bit twiddling per pixel, we split the packed data
+    # into planes of high and low bytes, and use bytes.translate() to pull
+    # each channel's bits out of those planes.
+    #
+    # For each channel, this returns translation tables for the high byte and
+    # low byte (None if the byte doesn't hold any of the channel's bits), and
+    # a table to scale the combined bits up to 8 bits.
+    try:
+        layout = PACKED_RGB_FORMATS[pixel_format]
+    except KeyError as e:
+        raise ValueError(f'Unsupported packed pixel format: {pixel_format} '
+                         f'(expected one of {list(PACKED_RGB_FORMATS)})') from e
+
+    tables = []
+    for (shift, bits) in layout:
+        mask = (1 << bits) - 1
+        high = bytes(((byte << 8) >> shift) & mask for byte in range(256))
+        low = bytes((byte >> shift) & mask for byte in range(256))
+        expand = bytes(expand_channel(byte & mask, bits) for byte in range(256))
+
+        tables.append((high if any(high) else None,
+                       low if any(low) else None,
+                       expand))
+
+    return tuple(tables)
+
+
+def rgb_from_packed_data(pixel_data, pixel_format='565', byteorder='little'):
+    # pixel_data can be anything that supports the buffer protocol
+    # (bytes, bytearray, memoryview, array, mmap, etc.), and is
+    # returned as packed RGB bytes suitable for pygame.image.fromstring().
+    pixel_data = bytes(memoryview(pixel_data).cast('B'))
+
+    if len(pixel_data) % 2:
+        raise ValueError(f'Packed pixel data must be 16-bit aligned '
+                         f'(got {len(pixel_data)} bytes)')
+
+    pixel_count = len(pixel_data) // 2
+
+    if byteorder == 'little':
+        (low_bytes, high_bytes) = (pixel_data[0::2], pixel_data[1::2])
+    else:
+        (high_bytes, low_bytes) = (pixel_data[0::2], pixel_data[1::2])
+
+    rgb_data = bytearray(pixel_count * 3)
+
+    for (offset, (high, low, expand)) in enumerate(packed_rgb_tables(pixel_format)):
+        if high and low:
+            # The channel straddles both bytes.  The bits don't overlap, so
+            # we can OR the planes together as big integers in one shot.
+            channel = (
+                int.from_bytes(high_bytes.translate(high), 'little') |
+                int.from_bytes(low_bytes.translate(low), 'little')
+            ).to_bytes(pixel_count, 'little')
+        elif high:
+            channel = high_bytes.translate(high)
+        else:
+            channel = low_bytes.translate(low)
 
-            if red:
-                red += 7
+        rgb_data[offset::3] = channel.translate(expand)
 
-            # green is 6 bits
-            green = int(rgb_data[5:10] + '000', 2)
+    return bytes(rgb_data)
 
-            if green:
-                green += 7
 
-            # blue is 5 bits
-            blue = int(rgb_data[10:15] + '000', 2)
+def image_from_packed_data(pixel_data, width, height, pixel_format='565', byteorder='little'):
+    rgb_data = rgb_from_packed_data(pixel_data=pixel_data,
+                                    pixel_format=pixel_format,
+                                    byteorder=byteorder)
 
-            # last bit is ignored or used for alpha.
+    return pygame.image.fromstring(rgb_data, (width, height), 'RGB')
 
-            if blue:
-                blue += 7
 
-            log.info(f'Packed RGB: {rgb_data}')
-            log.info(f'Red: {red}')
-            log.info(f'Green: {green}')
-            log.info(f'Blue: {blue}')
+def packed_rgb_triplet_generator(pixel_data, pixel_format):
+    # struct.iter_unpack() gives us 1 element tuples, so
+    # gather them back up into a native array for the bulk decoder.
+    packed_pixels = array.array('H', (packed_rgb_triplet[0]
+                                      for packed_rgb_triplet in pixel_data))
 
-            yield tuple([red, green, blue])
-    except StopIteration:
-        pass
+    yield from rgb_triplet_generator(
+        pixel_data=rgb_from_packed_data(pixel_data=packed_pixels,
+                                        pixel_format=pixel_format,
+                                        byteorder=sys.byteorder)
+    )
+
+
+def rgb_555_triplet_generator(pixel_data):
+    yield from packed_rgb_triplet_generator(pixel_data=pixel_data, pixel_format='555')
 
 
 def rgb_565_triplet_generator(pixel_data):
-    try:
-        # Construct RGB triplets.
-        for packed_rgb_triplet in pixel_data:
-            # struct unpacks as a 1 element tuple.
-            rgb_data = bin(packed_rgb_triplet[0])
+    yield from packed_rgb_triplet_generator(pixel_data=pixel_data, pixel_format='565')
 
-            # binary conversions start with 0b, so chop that off.
-            rgb_data = rgb_data[2:]
 
-            # Pad the data out.
-            pad_bits = 16 - len(rgb_data)
-            pad_data = '0' * pad_bits
+def color_key_generator(start=chr(48)):
+    # Color keys are single characters that get written out as config section
+    # names and rows of pixels, so skip anything that configparser would
+    # treat as a comment or strip off as whitespace.
+    for codepoint in itertools.count(ord(start)):
+        color_key = chr(codepoint)
 
-            rgb_data = pad_data + rgb_data
+        if color_key.isprintable() and not color_key.isspace() and color_key not in '#;':
+            yield color_key
 
-            log.info(f'Padded {pad_bits} bits (now {rgb_data})')
 
-            # red is 5 bits
-            red = int(rgb_data[0:5] + '000', 2)
+def sprite_config(name, width, height, palette, index_data):
+    # Returns a ConfigParser holding a sprite in the .cfg format, where palette
+    # is packed RGB bytes and index_data is a palette index per pixel.
+    config = configparser.ConfigParser(dict_type=collections.OrderedDict,
+                                       empty_lines_in_values=True,
+                                       strict=True)
 
-            if red:
-                red += 7
+    config.add_section('sprite')
+    config.set('sprite', 'name', name)
 
-            # green is 6 bits
-            green = int(rgb_data[5:11] + '00', 2)
+    # Generate the color key
+    color_keys = []
+    for (offset, color_key) in zip(range(0, len(palette), 3), color_key_generator()):
+        config.add_section(color_key)
+        color_keys.append(color_key)
 
-            if green:
-                green += 3
+        (red, green, blue) = palette[offset:offset + 3]
 
-            # blue is 5 bits
-            blue = int(rgb_data[11:] + '000', 2)
+        log.debug(f'Key: {(red, green, blue)} -> {color_key}')
 
-            if blue:
-                blue += 7
+        config.set(color_key, 'red', str(red))
+        config.set(color_key, 'green', str(green))
+        config.set(color_key, 'blue', str(blue))
 
-            log.info(f'Packed RGB: {rgb_data}')
-            log.info(f'Red: {red}')
-            log.info(f'Green: {green}')
-            log.info(f'Blue: {blue}')
+    pixels = ''.join(map(color_keys.__getitem__, index_data))
+    pixels = [pixels[y * width:(y + 1) * width] for y in range(height)]
 
-            yield tuple([red, green, blue])
-    except StopIteration:
-        pass
+    log.debug(pixels)
+
+    config.set('sprite', 'pixels', '\n'.join(pixels))
+
+    return config
 
 
 def rgb_triplet_generator(pixel_data):
@@ -134,20 +224,42 @@ def rgb_triplet_generator(pixel_data):
         pass
 
 
-def image_from_pixels(pixels, width, height):
-    image = pygame.Surface((width, height))
-    y = 0
-    x = 0
-    for pixel in pixels:
-        image.fill(pixel, ((x, y), (1, 1)))
+# Surface pixel formats keyed by bytes per pixel, for buffers
+# where the caller doesn't tell us what they're handing us.
+PIXEL_FORMATS = {
+    3: 'RGB',
+    4: 'RGBA',
+}
 
-        if (x + 1) % width == 0:
-            x = 0
-            y += 1
-        else:
-            x += 1
 
-    return image
+def image_from_pixels(pixels, width, height, pixel_format=None, copy=True):
+    # pixels can be any contiguous buffer of packed RGB or RGBA data in row order
+    # (bytes, bytearray, memoryview, array, mmap, a (height, width, channels) uint8
+    # NumPy array, etc.), or an iterable of RGB/RGBA triplets.
+    #
+    # Buffers are handed to pygame as-is, so there's no intermediate list of tuples,
+    # and if copy is False, the image shares the caller's buffer instead of copying it.
+    try:
+        pixel_data = memoryview(pixels)
+    except TypeError:
+        pixel_data = memoryview(bytes(itertools.chain.from_iterable(pixels)))
+
+    if not pixel_data.c_contiguous:
+        pixel_data = memoryview(pixel_data.tobytes())
+
+    pixel_data = pixel_data.cast('B')
+
+    if not pixel_format:
+        try:
+            pixel_format = PIXEL_FORMATS[len(pixel_data) // (width * height)]
+        except (KeyError, ZeroDivisionError) as e:
+            raise ValueError(f"Can't infer the pixel format of {len(pixel_data)} bytes "
+                             f'for a {width}x{height} image.') from e
+
+    if copy:
+        return pygame.image.fromstring(pixel_data.tobytes(), (width, height), pixel_format)
+
+    return pygame.image.frombuffer(pixel_data, (width, height), pixel_format)
 
 
 def pixels_from_data(pixel_data):
@@ -171,11 +283,270 @@ def pixels_from_path(path):
     return pixels
 
 
+# Bytes per pixel for the raw formats we can stream from disk.
+BYTES_PER_PIXEL = {
+    'RGB': 3,
+    'RGBA': 4,
+    '555': 2,
+    '565': 2,
+}
+
+
+@contextlib.contextmanager
+def mapped_pixel_data(path):
+    # Memory map the file rather than reading it, so the OS only
+    # pages in the parts of a big sheet that we actually touch.
+    with open(path, 'rb') as fh:
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def pixel_rows_from_path(path, width, rows=1, pixel_format='RGB', offset=0):
+    # Yields memoryviews of up to `rows` rows of raw pixel data at a time, starting
+    # at `offset` bytes into the file.  Any trailing partial row is ignored.
+    #
+    # The chunks are views into the mapped file, not copies, so they're only valid
+    # until the next chunk is requested.  Copy them if you need to keep them around.
+    row_size = width * BYTES_PER_PIXEL[pixel_format]
+    chunk_size = row_size * rows
+
+    with mapped_pixel_data(path) as mapped, memoryview(mapped) as pixel_data:
+        end = offset + (len(pixel_data) - offset) // row_size * row_size
+
+        for start in range(offset, end, chunk_size):
+            with pixel_data[start:min(start + chunk_size, end)] as chunk:
+                yield chunk
+
+
+def pixel_tiles_from_path(path, width, tile_width, tile_height, pixel_format='RGB', offset=0):
+    # Yields ((x, y), tile_data) for each complete tile in a sheet, left to right and
+    # top to bottom.  A tile's rows aren't contiguous in the sheet, so each tile is
+    # copied out, but only one band of tiles is mapped in at a time.
+    bytes_per_pixel = BYTES_PER_PIXEL[pixel_format]
+    row_size = width * bytes_per_pixel
+    tile_row_size = tile_width * bytes_per_pixel
+
+    band = pixel_rows_from_path(path=path,
+                                width=width,
+                                rows=tile_height,
+                                pixel_format=pixel_format,
+                                offset=offset)
+
+    for (tile_y, chunk) in enumerate(band):
+        if len(chunk) < row_size * tile_height:
+            break
+
+        for tile_x in range(0, width - tile_width + 1, tile_width):
+            start = tile_x * bytes_per_pixel
+
+            yield ((tile_x, tile_y * tile_height),
+                   b''.join(chunk[row + start:row + start + tile_row_size]
+                            for row in range(0, len(chunk), row_size)))
+
+
+def image_from_indexed_data(pixel_data, width, height, palette, copy=True):
+    # Build an 8-bit palettized Surface straight from 1 byte per pixel palette
+    # indexes.  The palette (a ColorPalette, or any sequence of colors) is attached
+    # to the image rather than expanded per pixel, so each pixel stays 1 byte.
+    pixel_data = memoryview(pixel_data).cast('B')[:width * height]
+
+    if copy:
+        image = pygame.image.fromstring(pixel_data.tobytes(), (width, height), 'P')
+    else:
+        image = pygame.image.frombuffer(pixel_data, (width, height), 'P')
+
+    if isinstance(palette, ColorPalette):
+        image.set_palette(palette.surface_palette)
+    else:
+        image.set_palette(list(palette))
+
+    return image
+
+
+def image_from_indexed_path(path, width, height, palette, offset=0):
+    # Only the bytes for this image are copied out of the mapped file,
+    # so this works for pulling single frames out of big dumps, too.
+    with mapped_pixel_data(path) as mapped:
+        pixel_data = mapped[offset:offset + width * height]
+
+    return image_from_indexed_data(pixel_data=pixel_data,
+                                   width=width,
+                                   height=height,
+                                   palette=palette)
+
+
+def image_from_palette_indexes(index_data, width, height, palette):
+    # Like image_from_indexed_data(), but palette is packed RGB bytes and index_data
+    # is an array of palette indexes, which may be wider than a byte.
+    colors = [palette[offset:offset + 3] for offset in range(0, len(palette), 3)]
+
+    if index_data.itemsize == 1:
+        return image_from_indexed_data(pixel_data=index_data,
+                                       width=width,
+                                       height=height,
+                                       palette=[tuple(color) for color in colors])
+
+    return image_from_pixels(pixels=b''.join(map(colors.__getitem__, index_data)),
+                             width=width,
+                             height=height,
+                             pixel_format='RGB')
+
+
+def packed_pixels_from_image(image):
+    rgb_data = pygame.image.tostring(image, 'RGB')
+
+    # Pad each pixel out to 4 bytes so that we can treat the image as
+    # an array of ints, which lets dict and map do the heavy lifting.
+    packed_data = bytearray(len(rgb_data) // 3 * 4)
+
+    for channel in range(3):
+        packed_data[channel::4] = rgb_data[channel::3]
+
+    return array.array('I', packed_data)
+
+
+def rgb_from_packed_pixel(packed_pixel):
+    return tuple(packed_pixel.to_bytes(4, sys.byteorder)[:3])
+
+
+def indexed_pixels_from_image(image):
+    # Returns (palette, index_data), where palette is the image's unique colors as packed
+    # RGB bytes, in the order they first appear, and index_data is an array of indexes
+    # into it, one per pixel.
+    raw_pixels = packed_pixels_from_image(image)
+
+    color_indexes = dict.fromkeys(raw_pixels)
+
+    for (index, color) in enumerate(color_indexes):
+        color_indexes[color] = index
+
+    palette = b''.join(bytes(rgb_from_packed_pixel(color)) for color in color_indexes)
+
+    index_data = array.array('B' if len(color_indexes) <= 256 else 'H',
+                             map(color_indexes.__getitem__, raw_pixels))
+
+    return (palette, index_data)
+
+
+def recolor_image(image, mapping):
+    # Returns a copy of image with each color in mapping ((r, g, b) -> (r, g, b))
+    # replaced, without touching a pixel at a time.
+    if image.get_bitsize() == 8:
+        # Palettized images just get a new palette.
+        variant = image.copy()
+        variant.set_palette([mapping.get(color, color)
+                             for color in (tuple(color)[:3] for color in image.get_palette())])
+
+        return variant
+
+    # Anything else is indexed once, so that it's the (much shorter) palette that gets
+    # recolored, then drawn back into a Surface like the original.
+    (palette, index_data) = indexed_pixels_from_image(image)
+
+    recolored_palette = b''.join(
+        bytes(mapping.get(tuple(palette[offset:offset + 3]), palette[offset:offset + 3]))
+        for offset in range(0, len(palette), 3)
+    )
+
+    recolored_image = image_from_palette_indexes(index_data=index_data,
+                                                 width=image.get_width(),
+                                                 height=image.get_height(),
+                                                 palette=recolored_palette)
+
+    variant = pygame.Surface(image.get_size(), image.get_flags(), image)
+
+    if image.get_flags() & pygame.SRCALPHA:
+        # The palette is only RGB, so put the original's alpha back, a channel at a time.
+        rgba_data = bytearray(pygame.image.tostring(image, 'RGBA'))
+        rgb_data = pygame.image.tostring(recolored_image, 'RGB')
+
+        for channel in range(3):
+            rgba_data[channel::4] = rgb_data[channel::3]
+
+        # variant starts out all zeros, so taking the max of each channel copies
+        # rgba_data in as is, instead of blending it.
+        variant.blit(pygame.image.frombuffer(rgba_data, image.get_size(), 'RGBA'), (0, 0),
+                     special_flags=pygame.BLEND_RGBA_MAX)
+    else:
+        variant.blit(recolored_image, (0, 0))
+
+    colorkey = image.get_colorkey()
+    if colorkey is not None:
+        variant.set_colorkey(mapping.get(tuple(colorkey)[:3], colorkey))
+
+    return variant
+
+
+def image_from_path(path, width, height, pixel_format='RGB', image=None, rows=16, offset=0):
+    # Decode raw pixel data straight into a Surface, `rows` rows at a time.
+    #
+    # If image is given, it's decoded into in place, which makes it possible to walk
+    # through a multi-frame dump (by bumping offset) without allocating per frame.
+    if image is None:
+        flags = pygame.SRCALPHA if pixel_format == 'RGBA' else 0
+        image = pygame.Surface((width, height), flags)
+
+    row_size = width * BYTES_PER_PIXEL[pixel_format]
+    y = 0
+
+    chunks = pixel_rows_from_path(path=path,
+                                  width=width,
+                                  rows=rows,
+                                  pixel_format=pixel_format,
+                                  offset=offset)
+
+    for chunk in chunks:
+        chunk_rows = min(len(chunk) // row_size, height - y)
+
+        if pixel_format in PACKED_RGB_FORMATS:
+            chunk_data = rgb_from_packed_data(pixel_data=chunk[:chunk_rows * row_size],
+                                              pixel_format=pixel_format)
+            chunk_format = 'RGB'
+        else:
+            chunk_data = chunk[:chunk_rows * row_size]
+            chunk_format = pixel_format
+
+        rows_image = pygame.image.frombuffer(chunk_data, (width, chunk_rows), chunk_format)
+
+        # Copy alpha as-is rather than blending it.
+        rows_image.set_alpha(None)
+        image.blit(rows_image, (0, y))
+
+        # The row image borrows the mapped file, so let go
+        # of it before the next chunk is mapped in.
+        del rows_image
+        del chunk_data
+
+        y += chunk_rows
+
+        if y >= height:
+            chunks.close()
+            break
+
+    return image
+
+
 # Interiting from object is default in Python 3.
 # Linters complain if you do it.
 class ResourceManager:
     __instances__ = {}
 
+    # Attributes resolved through proxies are cached per manager, until anything's
+    # proxies are reassigned (which includes changing the active scene).  Only functions
+    # and methods are cached, since anything else might change under us.
+    #
+    # The defaults below are here so that __getattr__ can't recurse looking for
+    # them before __init__ has run.
+    CACHEABLE_ATTRIBUTES = (types.FunctionType, types.MethodType,
+                            types.BuiltinFunctionType, types.BuiltinMethodType)
+    proxy_generation = 0
+
+    _proxies = ()
+    _proxy_cache = None
+    _proxy_cache_generation = None
+    proxy_hits = 0
+    proxy_misses = 0
+
     def __new__(cls, *args, **kwargs):
         if cls not in cls.__instances__:
             cls.__instances__[cls] = object.__new__(cls)
@@ -189,6 +560,54 @@ class ResourceManager:
         super().__init__()
         self.proxies = []
 
+    @property
+    def proxies(self):
+        return self._proxies
+
+    @proxies.setter
+    def proxies(self, proxies):
+        # A tuple, so that the only way to change our proxies is to assign them,
+        # which lets the proxy caches know.
+        self._proxies = tuple(proxies)
+        ResourceManager.invalidate_proxy_caches()
+
+    @staticmethod
+    def invalidate_proxy_caches():
+        # Managers proxy through each other, so one change can affect any of them.
+        ResourceManager.proxy_generation += 1
+
+    def proxy_cache(self):
+        if self._proxy_cache_generation != ResourceManager.proxy_generation:
+            self._proxy_cache = {}
+            self._proxy_cache_generation = ResourceManager.proxy_generation
+
+        return self._proxy_cache
+
+    def cache_proxy_attribute(self, attr, value):
+        self.proxy_misses += 1
+
+        if isinstance(value, ResourceManager.CACHEABLE_ATTRIBUTES):
+            self.proxy_cache()[attr] = value
+
+        return value
+
+    @property
+    def proxy_stats(self):
+        lookups = self.proxy_hits + self.proxy_misses
+
+        return {
+            'hits': self.proxy_hits,
+            'misses': self.proxy_misses,
+            'hit_rate': self.proxy_hits / lookups if lookups else 0.0,
+            'entries': len(self.proxy_cache()),
+        }
+
+    @classmethod
+    def all_proxy_stats(cls):
+        # Manager class name -> its proxy_stats.
+        return {manager_class.__qualname__: manager.proxy_stats
+                for (manager_class, manager) in cls.__instances__.items()}
+
     # A resource manager will generally pass all requests through
     # to its proxy object, however, for certain types of resources
     # such as joysticks, the subclass will manage things itself.
@@ -197,10 +616,14 @@ class ResourceManager:
     # maximum flexibility when needed at the expense of a bit
     # of over abstracting.
     def __getattr__(self, attr):
+        if attr in self.proxy_cache():
+            self.proxy_hits += 1
+            return self._proxy_cache[attr]
+
         # Try each proxy in turn
         for proxy in self.proxies:
             try:
-                return getattr(proxy, attr)
+                return self.cache_proxy_attribute(attr, getattr(proxy, attr))
             except AttributeError:
                 log.error(f'No proxies for {type(self)}.{attr}')
 
@@ -212,6 +635,11 @@ class EventManager(ResourceManager):
     # This isn't a ResourceManager like other proxies, because
     # it's the fallthrough event object, so we don't have a proxy.
     class EventProxy:
+        # Every SAMPLE_EVERY'th unhandled event of each type is logged and kept in
+        # unhandled_samples, for diagnostics.  0 turns sampling off.
+        SAMPLE_EVERY = 0
+        SAMPLES = 100
+
         def __init__(self, *args, **kwargs):  # noqa: W0613
             super().__init__()
             # No proxies for the root class.
@@ -224,80 +652,88 @@ class EventManager(ResourceManager):
             # will not have this.
             self.event_source = kwargs.get('event_source', None)
 
-        def unhandled_event(self, *args, **kwargs):  # noqa: W0613
-            # inspect.stack()[1] is the call frame above us, so this should be reasonable.
-            event_handler = inspect.stack()[1].function
+            # Event type -> how many went unhandled.
+            self.unhandled_counts = collections.Counter()
+            self.unhandled_samples = collections.deque(maxlen=EventManager.EventProxy.SAMPLES)
+
+        def unhandled_event(self, event_handler, event, trigger=None):
+            # Unhandled events are common (mouse motion, say), so this just counts them
+            # unless we're sampling.  Handlers pass their own names in.
+            count = self.unhandled_counts[event.type] + 1
+            self.unhandled_counts[event.type] = count
 
-            event = kwargs.get('event')
+            if self.SAMPLE_EVERY and not count % self.SAMPLE_EVERY:
+                self.sample_unhandled_event(event_handler, event, trigger)
 
-            event_trigger = kwargs.get('trigger', None)
+        def sample_unhandled_event(self, event_handler, event, trigger):
+            self.unhandled_samples.append((event_handler, event, trigger))
 
             log.debug(f'Unhandled Event {event_handler}: '
-                      f'{self.event_source}->{event} Event Trigger: {event_trigger}')
+                      f'{self.event_source}->{event} Event Trigger: {trigger}')
 
         def on_active_event(self, event):
             # ACTIVEEVENT      gain, state
-            self.unhandled_event(event=event)
+            self.unhandled_event('on_active_event', event)
 
         def on_mouse_motion_event(self, event):
             # MOUSEMOTION      pos, rel, buttons
-            self.unhandled_event(event=event)
+            self.unhandled_event('on_mouse_motion_event', event)
 
         def on_mouse_button_up_event(self, event):
             # MOUSEBUTTONUP    pos, button
-            self.unhandled_event(event=event)
+            self.unhandled_event('on_mouse_button_up_event', event)
 
         def on_left_mouse_button_up_event(self, event):
             # Left Mouse Button Up pos, button
-            self.unhandled_event(event=event)
+            self.unhandled_event('on_left_mouse_button_up_event', event)
 
         def on_middle_mouse_button_up_event(self, event):
             # Middle Mouse Button Up pos, button
-            self.unhandled_event(event=event)
+            self.unhandled_event('on_middle_mouse_button_up_event', event)
 
         def on_right_mouse_button_up_event(self, event):
             # Right Mouse Button Up pos, button
-            self.unhandled_event(event=event)
+            self.unhandled_event('on_right_mouse_button_up_event', event)
 
         def on_mouse_button_down_event(self, event):
             # MOUSEBUTTONDOWN  pos, button
-            self.unhandled_event(event=event)
+            self.unhandled_event('on_mouse_button_down_event', event)
 
         def on_left_mouse_button_down_event(self, event):
             # Left Mouse Button Down pos, button
-            self.unhandled_event(event=event)
+            self.unhandled_event('on_left_mouse_button_down_event', event)
 
         def on_middle_mouse_button_down_event(self, event):
             # Middle Mouse Button Down pos, button
-            self.unhandled_event(event=event)
+            self.unhandled_event('on_middle_mouse_button_down_event', event)
 
         def on_right_mouse_button_down_event(self, event):
             # Right Mouse Button Down pos, button
-            self.unhandled_event(event=event)
+            self.unhandled_event('on_right_mouse_button_down_event', event)
 
         def on_mouse_scroll_down_event(self, event):
             # This is a synthesized event.
-            self.unhandled_event(event=event)
+            self.unhandled_event('on_mouse_scroll_down_event', event)
 
         def on_mouse_scroll_up_event(self, event):
             # This is a synthesized event.
-            self.unhandled_event(event=event)
+            self.unhandled_event('on_mouse_scroll_up_event', event)
 
         def on_key_up_event(self, event):
             # KEYUP            key, mod
-            self.unhandled_event(event=event)
+            self.unhandled_event('on_key_up_event', event)
 
         def on_key_down_event(self, event):
             # KEYDOWN            key, mod
-            self.unhandled_event(event=event)
+            self.unhandled_event('on_key_down_event', event)
 
         def on_key_chord_down_event(self, event, trigger):
             # This is a synthesized event.
-            self.unhandled_event(event=event, trigger=trigger)
+            self.unhandled_event('on_key_chord_down_event', event, trigger=trigger)
 
         def on_key_chord_up_event(self, event, trigger):
             # This is a synthesized event.
-            self.unhandled_event(event=event, trigger=trigger)
+            self.unhandled_event('on_key_chord_up_event', event, trigger=trigger)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -401,66 +837,256 @@ class SoundManager(ResourceManager):
         return parser
 
 
+def load_sprite_asset(path):
+    # Loading the sprite leaves its image in the shared image cache, so scenes
+    # can make as many sprites from the same file as they like for free.
+    return BitmappySprite(filename=path)
+
+
+def load_palette_asset(path):
+    return ColorPalette(PaletteUtility.load_palette_from_file(path))
+
+
+class AssetManager(ResourceManager):
+    # Scenes list what they need in a manifest, like:
+    #
+    # ASSETS = {
+    #     'sprites': ['resources/sprites/sword.cfg'],
+    #     'sounds': ['resources/snd/slap8.wav'],
+    #     'palettes': ['resources/vga.cfg'],
+    # }
+    #
+    # and the assets are loaded on a pool of worker threads while the current
+    # scene keeps running.  Assets are keyed by their absolute path.
+    LOADERS = {
+        'sprites': load_sprite_asset,
+        'sounds': pygame.mixer.Sound,
+        'palettes': load_palette_asset,
+    }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.asset_workers = kwargs.get('asset_workers') or min(4, multiprocessing.cpu_count())
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.asset_workers,
+                                                              thread_name_prefix='asset')
+        self.futures = {}
+        self.lock = threading.Lock()
+
+        # Don't leave workers loading things after pygame has gone away.
+        pygame.register_quit(self.shutdown)
+
+        self.ready = True
+
+    @staticmethod
+    def key(path):
+        return os.path.abspath(path)
+
+    def load(self, kind, path):
+        # Returns a Future for the asset, starting to load it if need be.
+        key = AssetManager.key(path)
+
+        with self.lock:
+            future = self.futures.get(key)
+
+            if future is None:
+                log.debug(f'Loading {kind}: {path}')
+                future = self.executor.submit(AssetManager.LOADERS[kind], path)
+                future.add_done_callback(self.on_asset_loaded)
+                self.futures[key] = future
+
+        return future
+
+    def preload(self, manifest):
+        # Returns a list of Futures for everything in manifest.
+        return [self.load(kind=kind, path=path)
+                for (kind, paths) in manifest.items()
+                for path in paths]
+
+    def future(self, asset):
+        try:
+            return self.futures[AssetManager.key(asset)]
+        except KeyError as e:
+            raise KeyError(f'{asset} was never requested from the asset manager') from e
+
+    def wait_for(self, asset, timeout=None):
+        # Blocks until asset is loaded, and returns it, or raises whatever
+        # its loader raised.
+        return self.future(asset).result(timeout=timeout)
+
+    def progress(self, manifest=None):
+        # Returns the fraction of manifest (or of everything requested) that's loaded.
+        if manifest is None:
+            futures = list(self.futures.values())
+        else:
+            futures = [self.future(path) for paths in manifest.values() for path in paths]
+
+        if not futures:
+            return 1.0
+
+        return sum(future.done() for future in futures) / len(futures)
+
+    def is_loaded(self, manifest=None):
+        return self.progress(manifest=manifest) == 1.0
+
+    def forget(self, asset):
+        # Drops our reference to asset, so it can be garbage collected.
+        with self.lock:
+            self.futures.pop(AssetManager.key(asset), None)
+
+    def shutdown(self):
+        # Executor.shutdown() only learned to cancel_futures in Python 3.9.
+        with self.lock:
+            for future in self.futures.values():
+                future.cancel()
+
+        self.executor.shutdown(wait=False)
+
+    def on_asset_loaded(self, future):  # noqa: R0201
+        if future.cancelled():
+            return
+
+        e = future.exception()
+        if e:
+            log.error(f'Failed to load asset: {e}')
+
+    @classmethod
+    def args(cls, parser):
+        group = parser.add_argument_group('Asset Options')
+
+        group.add_argument('--asset-workers',
+                           type=int,
+                           default=None,
+                           help='threads to load assets with (default: up to 4)')
+
+        return parser
+
+
 class KeyboardManager(ResourceManager):
     class KeyboardProxy(ResourceManager):
+        # Which keys are down is a bitset, with a bit for each key slot.  Keys below 512
+        # (ASCII and Latin-1) are their own slot, and keys named for their scancode
+        # (arrows, function keys, modifiers, etc.) get the 512 slots above them.
+        KEY_SLOTS = 1024
+        SCANCODE_MASK = 1 << 30
+
         def __init__(self, **kwargs):
             super().__init__(**kwargs)
-            self.keys = {}
+
+            # Bit n of pressed is set while the key in slot n is down, and
+            # key_events[n] is the KEYDOWN event for it.
+            self.pressed = 0
+            self.key_events = [None] * self.KEY_SLOTS
+
+            # Chord bitmask -> [(on_down, on_up)], and the last chord completed,
+            # until one of its keys is let go.
+            self.chords = {}
+            self.held_chord = 0
 
             self.game = kwargs.get('game', None)
             self.proxies = [self.game, pygame.key]
 
+        @classmethod
+        def key_slot(cls, key, scancode=None):
+            if 0 <= key < 512:
+                return key
+
+            if key & cls.SCANCODE_MASK:
+                return 512 + (key & 511)
+
+            # Other keys (from non Latin keyboard layouts) go by the physical key.
+            if scancode is not None:
+                return 512 + (scancode & 511)
+
+            return None
+
+        def chord_mask(self, keys):
+            chord = 0
+
+            for key in keys:
+                slot = self.key_slot(key)
+
+                if slot is None:
+                    raise ValueError(f"Can't chord {pygame.key.name(key)} ({key}); "
+                                     "use its scancode key (pygame.K_*) instead.")
+
+                chord |= 1 << slot
+
+            return chord
+
+        def key_events_for(self, chord):
+            # The KEYDOWN events for the keys in a bitmask, lowest slot first.
+            key_events = []
+
+            while chord:
+                key_bit = chord & -chord
+                key_events.append(self.key_events[key_bit.bit_length() - 1])
+                chord ^= key_bit
+
+            return key_events
+
+        @property
+        def keys_down(self):
+            return self.key_events_for(self.pressed)
+
+        def register_key_chord(self, keys, on_down=None, on_up=None):
+            # on_down(event, keys) is called when exactly keys are down, and
+            # on_up(event, keys) when one of them is let go afterwards.
+            chord = self.chord_mask(keys)
+
+            if not chord:
+                raise ValueError('A key chord needs at least one key.')
+
+            self.chords.setdefault(chord, []).append((on_down, on_up))
+
+            return chord
+
+        def unregister_key_chord(self, keys):
+            self.chords.pop(self.chord_mask(keys), None)
+
         def on_key_down_event(self, event):
-            # The KEYUP and KEYDOWN events are
-            # different.  KEYDOWN contains an extra
-            # key in its dictionary (unicode), which
-            # KEYUP does not contain, so we'll make
-            # a copy of the dictionary, and then
-            # delete the key "unicode" so we can track
-            # both sets of events.
-            keyboard_key = event.dict.copy()
-            del keyboard_key['unicode']
-
-            # This makes it possible to use
-            # a dictionary as a key, which is
-            # normally not possible.
-            self.keys[
-                tuple(
-                    sorted(
-                        frozenset(keyboard_key.items())
-                    )
-                )
-            ] = event
+            slot = self.key_slot(event.key, getattr(event, 'scancode', None))
+
+            if slot is not None:
+                self.pressed |= 1 << slot
+                self.key_events[slot] = event
 
             self.game.on_key_down_event(event)
-            self.on_key_chord_down_event(event)
+
+            if self.pressed in self.chords:
+                self.on_key_chord_down_event(event)
 
         def on_key_up_event(self, event):
-            # This makes it possible to use
-            # a dictionary as a key, which is
-            # normally not possible.
-            self.keys[
-                tuple(
-                    sorted(
-                        frozenset(event.dict.items())
-                    )
-                )
-            ] = event
+            slot = self.key_slot(event.key, getattr(event, 'scancode', None))
+
+            # The chord's keys are needed for its up event, so that goes first.
+            if slot is not None and self.held_chord >> slot & 1:
+                self.on_key_chord_up_event(event)
+
+            if slot is not None:
+                self.pressed &= ~(1 << slot)
+                self.key_events[slot] = None
 
             self.game.on_key_up_event(event)
-            self.on_key_chord_up_event(event)
 
         def on_key_chord_down_event(self, event):
-            keys_down = [self.keys[key]
-                         for key in self.keys
-                         if self.keys[key].type == pygame.KEYDOWN]
+            self.held_chord = self.pressed
+            keys_down = self.key_events_for(self.held_chord)
+
+            for (on_down, _) in self.chords[self.held_chord]:
+                if on_down:
+                    on_down(event, keys_down)
 
             self.game.on_key_chord_down_event(event, keys_down)
 
         def on_key_chord_up_event(self, event):
-            keys_down = [self.keys[key]
-                         for key in self.keys
-                         if self.keys[key].type == pygame.KEYDOWN]
+            (chord, self.held_chord) = (self.held_chord, 0)
+            keys_down = self.key_events_for(chord)
+
+            # The chord may have been unregistered while it was held.
+            for (_, on_up) in self.chords.get(chord, ()):
+                if on_up:
+                    on_up(event, keys_down)
 
             self.game.on_key_chord_up_event(event, keys_down)
 
@@ -489,9 +1115,7 @@ class MouseManager(ResourceManager):
             self.game.on_mouse_motion_event(event)
 
             # Figure out which item was clicked.
-            mouse = MouseSprite(x=event.pos[0], y=event.pos[1], width=1, height=1)
-
-            collided_sprites = pygame.sprite.spritecollide(mouse, self.game.all_sprites, False)
+            collided_sprites = self.game.sprites_at_position(event.pos)
             collided_sprite = None
 
             if collided_sprites:
@@ -605,9 +1229,7 @@ class MouseManager(ResourceManager):
 
         def on_mouse_drag_up_event(self, event):
             log.debug(f'{type(self)}: Mouse Drag Up: {event}')
-            mouse = MouseSprite(x=event.pos[0], y=event.pos[1], width=1, height=1)
-
-            collided_sprites = pygame.sprite.spritecollide(mouse, self.all_sprites, False)
+            collided_sprites = self.game.sprites_at_position(event.pos)
 
             for sprite in collided_sprites:
                 sprite.on_mouse_drag_up_event(event)
@@ -935,6 +1557,30 @@ class GameEngine(EventManager):
     GAME_EVENTS.append(GAMEEVENT)
     GAME_EVENTS.append(MENUEVENT)
 
+    # Event type -> (manager, handler).  These are compiled into a table of handlers
+    # when the engine starts, so dispatching an event is one dict lookup.
+    EVENT_ROUTES = {
+        pygame.MOUSEMOTION: ('mouse_manager', 'on_mouse_motion_event'),
+        pygame.MOUSEBUTTONUP: ('mouse_manager', 'on_mouse_button_up_event'),
+        pygame.MOUSEBUTTONDOWN: ('mouse_manager', 'on_mouse_button_down_event'),
+        pygame.KEYDOWN: ('keyboard_manager', 'on_key_down_event'),
+        pygame.KEYUP: ('keyboard_manager', 'on_key_up_event'),
+        pygame.JOYAXISMOTION: ('joystick_manager', 'on_axis_motion_event'),
+        pygame.JOYBALLMOTION: ('joystick_manager', 'on_ball_motion_event'),
+        pygame.JOYHATMOTION: ('joystick_manager', 'on_hat_motion_event'),
+        pygame.JOYBUTTONUP: ('joystick_manager', 'on_button_up_event'),
+        pygame.JOYBUTTONDOWN: ('joystick_manager', 'on_button_down_event'),
+        FPSEVENT: ('game_manager', 'on_fps_event'),
+        GAMEEVENT: ('game_manager', 'on_game_event'),
+        MENUEVENT: ('game_manager', 'on_menu_item_event'),
+        pygame.USEREVENT: ('game_manager', 'on_user_event'),
+        pygame.QUIT: ('game_manager', 'on_quit_event'),
+        pygame.ACTIVEEVENT: ('game_manager', 'on_active_event'),
+        pygame.VIDEORESIZE: ('game_manager', 'on_video_resize_event'),
+        pygame.VIDEOEXPOSE: ('game_manager', 'on_video_expose_event'),
+        pygame.SYSWMEVENT: ('game_manager', 'on_sys_wm_event'),
+    }
+
     def __init__(self, options=None):
         # Persist this game's options.
         GameEngine.OPTIONS = options or {}
@@ -974,6 +1620,9 @@ class GameEngine(EventManager):
         self.music_manager = MusicManager(**GameEngine.OPTIONS)
         self.font_manager = FontManager(**GameEngine.OPTIONS)
         self.joystick_manager = JoystickManager(**GameEngine.OPTIONS)
+        self.asset_manager = AssetManager(**GameEngine.OPTIONS)
+
+        self.event_handlers = self.compile_event_handlers()
 
         # Get count of joysticks
         self.joysticks = []
@@ -1146,7 +1795,7 @@ class GameEngine(EventManager):
         #
         # Always call this before you call set_mode()
         icon = pygame.Surface((32, 32))
-        icon.fill(PURPLE)
+        icon.fill(ghettogames.color.PURPLE)
         pygame.display.set_icon(icon)
 
         # Set the display caption.
@@ -1224,6 +1873,9 @@ class GameEngine(EventManager):
         # Init Music Options
         parser = MusicManager.args(parser=parser)
 
+        # Init Asset Options
+        parser = AssetManager.args(parser=parser)
+
         return parser
 
     def start(self):
@@ -1237,6 +1889,7 @@ class GameEngine(EventManager):
         )
 
         self._active_scene = None
+        ResourceManager.invalidate_proxy_caches()
 
     def quit(self):  # noqa: R0201
         # put a quit event in the event queue.
@@ -1255,24 +1908,87 @@ class GameEngine(EventManager):
             self._active_scene = new_scene
             self.proxies = [self, self._active_scene]
 
-    def load_resources(self):  # noqa: R0201
-        log.info('Implement load_resource() in your subclass.')
+    def load_resources(self, scene=None):
+        # Starts loading the assets in scene's manifest in the background, where
+        # scene is a RootScene subclass or instance, and defaults to the active scene.
+        #
+        # Call this for the next scene while the current one is still running,
+        # then switch once self.asset_manager.is_loaded(NextScene.ASSETS).
+        if scene is None:
+            scene = self.active_scene
+
+        return self.asset_manager.preload(getattr(scene, 'ASSETS', {}))
 
     def process_events(self):
         # To use events in a different thread, use the fastevent package from pygame.
         # You can create your own new events with the pygame.event.Event() function.
-        for event in pygame.fastevent.get():
-            if event.type in GameEngine.GAME_EVENTS:
-                self.process_game_event(event)
-            elif event.type in GameEngine.JOYSTICK_EVENTS:
-                self.process_joystick_event(event)
-            elif event.type in GameEngine.MOUSE_EVENTS:
-                self.process_mouse_event(event)
-            elif event.type in GameEngine.KEYBOARD_EVENTS:
-                self.process_keyboard_event(event)
-            else:
+        self.dispatch_events(pygame.fastevent.get())
+
+    def dispatch_events(self, events):
+        event_handlers = self.event_handlers
+
+        for event in events:
+            try:
+                event_handler = event_handlers[event.type]
+            except KeyError:
                 # This will catch any unimplemented event types that we see.
                 log.error(f'Unknown Event Type: {event.type}: {event} {GameEngine.ALL_EVENTS}')
+                continue
+
+            # Event types we know about, but don't handle, are None.
+            if event_handler is not None:
+                event_handler(event)
+
+    def compile_event_handlers(self):
+        # Returns the event type -> handler table that dispatch_events() uses.
+        event_handlers = {}
+
+        # Games that still override process_*_event() get every event of that kind.
+        for (event_types, method) in ((GameEngine.GAME_EVENTS, 'process_game_event'),
+                                      (GameEngine.JOYSTICK_EVENTS, 'process_joystick_event'),
+                                      (GameEngine.MOUSE_EVENTS, 'process_mouse_event'),
+                                      (GameEngine.KEYBOARD_EVENTS, 'process_keyboard_event')):
+            if getattr(type(self), method) is getattr(GameEngine, method):
+                event_handlers.update(
+                    (event_type, self.compile_event_handler(event_type))
+                    for event_type in event_types if event_type not in event_handlers
+                )
+            else:
+                event_handlers.update(
+                    (event_type, getattr(self, method))
+                    for event_type in event_types if event_type not in event_handlers
+                )
+
+        return event_handlers
+
+    def compile_event_handler(self, event_type):
+        if event_type not in GameEngine.EVENT_ROUTES:
+            return None
+
+        (manager_name, handler_name) = GameEngine.EVENT_ROUTES[event_type]
+        manager = getattr(self, manager_name)
+
+        # Handlers that the manager or its proxies implement can be bound now.
+        for target in (manager, *manager.proxies):
+            if hasattr(type(target), handler_name):
+                return getattr(target, handler_name)
+
+        # Anything else goes to the game, which may pass it on to whichever
+        # scene is active when the event arrives, so it's looked up then.
+        def forward_event(event):
+            return getattr(manager, handler_name)(event)
+
+        return forward_event
+
+    def register_event_handler(self, event_type, event_handler):
+        # Handle (or with None, ignore) an event type with any callable.
+        log.info(f'Registering event handler for {pygame.event.event_name(event_type)}: '
+                 f'{event_handler}')
+        self.event_handlers[event_type] = event_handler
+
+    def reset_event_handler(self, event_type):
+        # Go back to the engine's own handling of an event type.
+        self.event_handlers[event_type] = self.compile_event_handler(event_type)
 
     def process_mouse_event(self, event):
         if event.type == pygame.MOUSEMOTION:
@@ -1299,7 +2015,7 @@ class GameEngine(EventManager):
             self.joystick_manager.on_axis_motion_event(event)
         elif event.type == pygame.JOYBALLMOTION:
             # JOYBALLMOTION    joy, ball, rel
-            self.joystick_.on_ball_motion_event(event)
+            self.joystick_manager.on_ball_motion_event(event)
         elif event.type == pygame.JOYHATMOTION:
             # JOYHATMOTION     joy, hat, value
             self.joystick_manager.on_hat_motion_event(event)
@@ -1383,28 +2099,236 @@ class GameEngine(EventManager):
     # This allows maximum flexibility of event processing, with low overhead
     # at the expense of a slight layer violation.
     def __getattr__(self, attr):
+        # Changing scenes reassigns our proxies, which empties the cache.
+        if attr in self.proxy_cache():
+            self.proxy_hits += 1
+            return self._proxy_cache[attr]
+
         # Attempt to proxy the call to the active scene.
         try:
-            log.info(f'ACTIVE SCENE: {attr} for {type(self)}')
-            return getattr(self.active_scene, attr)
+            return self.cache_proxy_attribute(attr, getattr(self.active_scene, attr))
         except AttributeError:
-            log.info(f'{attr} is not implemented for {type(self)} or '
-                     'for the active scene {type(self.active_scene)}')
             return getattr(super(), attr)
 
 
+class SpriteRect(pygame.Rect):
+    # A RootSprite's rect, which tells the SpriteIndexes of the sprite's groups when it
+    # changes, so they don't have to check every sprite to find the ones that moved.
+    # (Without __slots__, pygame is noticeably slower at drawing and colliding them.)
+    #
+    # Rects that pygame derives from ours (copy(), move(), and so on) are SpriteRects too,
+    # but don't belong to a sprite.
+    __slots__ = ('sprite',)
+
+    def __init__(self, *args, sprite=None):
+        super().__init__(*args)
+        self.sprite = sprite
+
+    def moved(self):
+        sprite = getattr(self, 'sprite', None)
+
+        if sprite is not None and sprite.grouped:
+            SpriteIndex.sprite_moved(sprite)
+
+    def __setattr__(self, attr, value):
+        super().__setattr__(attr, value)
+        self.moved()
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.moved()
+
+    def move_ip(self, *args):
+        super().move_ip(*args)
+        self.moved()
+
+    def inflate_ip(self, *args):
+        super().inflate_ip(*args)
+        self.moved()
+
+    def scale_by_ip(self, *args, **kwargs):
+        super().scale_by_ip(*args, **kwargs)
+        self.moved()
+
+    def update(self, *args):
+        super().update(*args)
+        self.moved()
+
+    def clamp_ip(self, *args):
+        super().clamp_ip(*args)
+        self.moved()
+
+    def union_ip(self, *args):
+        super().union_ip(*args)
+        self.moved()
+
+    def unionall_ip(self, *args):
+        super().unionall_ip(*args)
+        self.moved()
+
+    def normalize(self):
+        super().normalize()
+        self.moved()
+
+
+class SpriteIndex:
+    # A uniform grid of the sprites in a group, for hit testing the mouse without
+    # checking every sprite, which matters for scenes with thousands of sprites.
+    #
+    # The grid is kept up to date incrementally.  RootSprites tell the indexes of their
+    # groups when they join or leave them, and when their rects change (see SpriteRect),
+    # and queries only re-bucket the sprites that moved.  Other sprites can't tell us
+    # anything, so they're checked by every query, and if they join or leave a group
+    # without changing its size, or anything changes layers, call invalidate().  Results
+    # are checked against the sprites' current rects, and come back in the group's layer
+    # order, like pygame.sprite.spritecollide().
+    CELL_SIZE = 64
+
+    # group -> the indexes synced to it, for RootSprites to notify.
+    INDEXES = weakref.WeakKeyDictionary()
+
+    def __init__(self, cell_size=None):
+        self.cell_size = cell_size or SpriteIndex.CELL_SIZE
+        self.group = None
+        self.valid = False
+
+        # The group's sprites in layer order, their positions in that order, and their
+        # rects as of the last time they were bucketed.
+        self.sprites = []
+        self.positions = {}
+        self.rects = []
+
+        # (column, row) -> the indexes (into self.sprites) of the sprites in that cell.
+        self.cells = collections.defaultdict(set)
+
+        # RootSprites that may have moved since the last sync(), and the indexes of the
+        # sprites that aren't RootSprites.
+        self.moved = set()
+        self.untracked = []
+
+    @staticmethod
+    def indexes_for(group):
+        return SpriteIndex.INDEXES.get(group, ())
+
+    @staticmethod
+    def sprite_moved(sprite):
+        for group in sprite.groups():
+            for index in SpriteIndex.indexes_for(group):
+                index.moved.add(sprite)
+
+    def invalidate(self):
+        self.valid = False
+
+    def cells_for(self, rect):
+        (left, top, width, height) = rect
+
+        # Empty rects don't collide with anything.
+        if width <= 0 or height <= 0:
+            return ()
+
+        return itertools.product(
+            range(left // self.cell_size, (left + width - 1) // self.cell_size + 1),
+            range(top // self.cell_size, (top + height - 1) // self.cell_size + 1)
+        )
+
+    def add(self, index, rect):
+        for cell in self.cells_for(rect):
+            self.cells[cell].add(index)
+
+    def discard(self, index, rect):
+        for cell in self.cells_for(rect):
+            self.cells[cell].discard(index)
+
+            if not self.cells[cell]:
+                del self.cells[cell]
+
+    def rebuild(self, group):
+        if group is not self.group:
+            if self.group is not None:
+                SpriteIndex.INDEXES[self.group].discard(self)
+
+            SpriteIndex.INDEXES.setdefault(group, weakref.WeakSet()).add(self)
+            self.group = group
+
+        self.sprites = group.sprites()
+        self.positions = {sprite: index for (index, sprite) in enumerate(self.sprites)}
+        self.rects = list(map(pygame.Rect, map(operator.attrgetter('rect'), self.sprites)))
+
+        self.cells.clear()
+
+        for (index, rect) in enumerate(self.rects):
+            self.add(index, rect)
+
+        self.moved = set()
+        self.untracked = [index for (index, sprite) in enumerate(self.sprites)
+                          if not isinstance(sprite, RootSprite)]
+        self.valid = True
+
+    def rebucket(self, index):
+        rect = self.sprites[index].rect
+
+        if rect != self.rects[index]:
+            self.discard(index, self.rects[index])
+            self.add(index, rect)
+            self.rects[index] = pygame.Rect(rect)
+
+    def sync(self, group):
+        # len(group) copies its sprite list, but its spritedict has the same length.
+        if not self.valid or group is not self.group or \
+                len(group.spritedict) != len(self.sprites):
+            self.rebuild(group)
+            return
+
+        for index in self.untracked:
+            self.rebucket(index)
+
+        for sprite in self.moved:
+            self.rebucket(self.positions[sprite])
+
+        self.moved.clear()
+
+    def sprites_at(self, pos, group=None):
+        # With a group, the index is synced to it first.
+        if group is not None:
+            self.sync(group)
+
+        (x, y) = pos
+        indexes = self.cells.get((x // self.cell_size, y // self.cell_size), ())
+
+        return [self.sprites[index]
+                for index in sorted(indexes)
+                if self.sprites[index].rect.collidepoint(pos)]
+
+    def sprites_in(self, rect, group=None):
+        if group is not None:
+            self.sync(group)
+
+        rect = pygame.Rect(rect)
+        indexes = set().union(*(self.cells.get(cell, ()) for cell in self.cells_for(rect)))
+
+        return [self.sprites[index]
+                for index in sorted(indexes)
+                if self.sprites[index].rect.colliderect(rect)]
+
+
 class RootScene(EventManager):
+    # The sprites, sounds and palettes this scene needs; see AssetManager.
+    ASSETS = {}
+
     def __init__(self):
         super().__init__()
         # This will resolve to the class name of any subclass.
         self.name = type(self)
-        self.background_color = BLACK
+        self.background_color = ghettogames.color.BLACK
         self.next = self
         self.rects = None
 
         # http://n0nick.github.io/blog/2012/06/03/quick-dirty-using-pygames-dirtysprite-layered/
         self.all_sprites = pygame.sprite.LayeredDirty()
 
+        # For finding all_sprites under the mouse; see sprites_at_position().
+        self.sprite_index = SpriteIndex()
+
         # Initial screen state.
 
         self.screen = pygame.display.get_surface()
@@ -1427,9 +2351,11 @@ class RootScene(EventManager):
         self.switch_to_scene(None)
 
     def sprites_at_position(self, pos):
-        mouse = MouseSprite(x=pos[0], y=pos[1], width=1, height=1)
+        # The sprites under pos, topmost last; see SpriteIndex.
+        return self.sprite_index.sprites_at(pos, group=self.all_sprites)
 
-        return pygame.sprite.spritecollide(mouse, self.all_sprites, False)
+    def sprites_in_rect(self, rect):
+        return self.sprite_index.sprites_in(rect, group=self.all_sprites)
 
     def on_mouse_drag_down_event(self, event, trigger):
         log.debug(f'{type(self)}: Mouse Drag Down: {event} {trigger}')
@@ -1564,6 +2490,12 @@ class RootSprite(pygame.sprite.DirtySprite):
 
     USE_GFXDRAW = False
 
+    # For sprites with an all_sprites group of their own, like menus; made on first use.
+    sprite_index = None
+
+    # Until we've joined a group, there are no SpriteIndexes to tell when we move.
+    grouped = False
+
     def __init__(self, *args, **kwargs):  # noqa: W0613
         super().__init__()
         self.name = type(self)
@@ -1594,9 +2526,44 @@ class RootSprite(pygame.sprite.DirtySprite):
         # Cause the sprite to update itself when it comes into existence.
         self.update()
 
+    def __setattr__(self, attr, value):
+        # Our rect tells our groups' SpriteIndexes when it changes, so plain rects are
+        # copied into a SpriteRect; ours are kept as they are, so aliases of them still work.
+        # (A rect property would cost every read of it, and pygame reads it a lot.)
+        if attr == 'rect':
+            if value is not None and getattr(value, 'sprite', None) is not self:
+                value = SpriteRect(value, sprite=self)
+
+            super().__setattr__(attr, value)
+
+            if self.grouped:
+                SpriteIndex.sprite_moved(self)
+        else:
+            super().__setattr__(attr, value)
+
+    def add_internal(self, group):
+        super().add_internal(group)
+        self.grouped = True
+
+        for index in SpriteIndex.indexes_for(group):
+            index.invalidate()
+
+    def remove_internal(self, group):
+        super().remove_internal(group)
+
+        for index in SpriteIndex.indexes_for(group):
+            index.invalidate()
+
     def update(self):
         pass
 
+    def sprites_at_position(self, pos):
+        # The sprites in our all_sprites group under pos, topmost last.
+        if self.sprite_index is None:
+            self.sprite_index = SpriteIndex()
+
+        return self.sprite_index.sprites_at(pos, group=self.all_sprites)
+
     def on_axis_motion_event(self, event):
         # JOYAXISMOTION    joy, axis, value
         log.debug(f'{type(self)}: {event}')
@@ -1777,10 +2744,223 @@ class RootSprite(pygame.sprite.DirtySprite):
         return f'{type(self)} "{self.name}" ({repr(self)})'
 
 
+class ImageCache:
+    # A process-wide flyweight cache of sprite images.
+    #
+    # Sprites loaded from the same file share one Surface.  Each entry counts the
+    # sprites using it, and once the cache grows past max_bytes, the least recently
+    # used entries that no sprite is using are evicted.
+    #
+    # Shared images aren't copied on write: pygame draws straight into a Surface, and
+    # there's no hook to catch it, so sprite.image.fill() or pygame.draw.*(sprite.image)
+    # changes every sprite using that image.  Call BitmappySprite.detach_image() before
+    # drawing on a sprite's image (or turn off BitmappySprite.SHARE_IMAGES).  Palette
+    # cycling relies on this, since cycling one sprite's palette cycles them all.
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        super().__init__()
+        self.max_bytes = max_bytes
+        self.entries = collections.OrderedDict()
+        self.references = collections.Counter()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Sprites may be loaded from asset loading threads.
+        self.lock = threading.RLock()
+
+    @staticmethod
+    def key(filename):
+        # Keying on the file's mtime and size means edited files get reloaded.
+        stat = os.stat(filename)
+
+        return (os.path.abspath(filename), stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def image_bytes(image):
+        return image.get_pitch() * image.get_height()
+
+    def acquire(self, key, loader):
+        # Returns the (image, name) entry for key, calling loader() to
+        # create it if need be, and counts a reference to it.
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry is not None:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                self.references[key] += 1
+
+                return entry
+
+        # Load without holding the lock so different files can load at once.
+        # If another thread beat us to this one, we use theirs.
+        loaded_entry = loader()
+
+        with self.lock:
+            self.misses += 1
+            entry = self.entries.setdefault(key, loaded_entry)
+
+            if entry is loaded_entry:
+                self.bytes += ImageCache.image_bytes(entry[0])
+
+            self.references[key] += 1
+            self.evict()
+
+        return entry
+
+    def release(self, key):
+        with self.lock:
+            self.references[key] -= 1
+
+            if self.references[key] <= 0:
+                del self.references[key]
+
+            self.evict()
+
+    def evict(self):
+        with self.lock:
+            for key in list(self.entries):
+                if self.bytes <= self.max_bytes:
+                    break
+
+                if key not in self.references:
+                    (image, _) = self.entries.pop(key)
+                    self.bytes -= ImageCache.image_bytes(image)
+                    self.evictions += 1
+
+                    log.debug(f'Evicted {key} from the image cache')
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.references.clear()
+            self.bytes = 0
+
+    @property
+    def stats(self):
+        lookups = self.hits + self.misses
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': len(self.entries),
+            'bytes': self.bytes,
+        }
+
+
+class VariantCache:
+    # A process-wide LRU cache of palette swapped sprite images.
+    #
+    # Variants are keyed by the image they were made from and the color mapping, so
+    # sprites sharing an image share its variants, too.  Like shared images, variants
+    # must be treated as read-only.  Once the cache grows past max_bytes, the least
+    # recently used variants are dropped, though sprites still using them keep them.
+
+    def __init__(self, max_bytes=16 * 1024 * 1024):
+        super().__init__()
+        self.max_bytes = max_bytes
+        self.entries = collections.OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Every variant still alive, cached or not, so sprites know not to draw on them.
+        self.variants = weakref.WeakSet()
+
+        self.lock = threading.RLock()
+
+    @staticmethod
+    def mapping_key(mapping):
+        # Colors can be anything pygame.Color() takes, but only red, green and blue count.
+        # Colors aren't hashable, so (source, target) pairs work as well as a dict.
+        if isinstance(mapping, collections.abc.Mapping):
+            mapping = mapping.items()
+
+        return tuple(sorted((tuple(pygame.Color(source))[:3], tuple(pygame.Color(target))[:3])
+                            for (source, target) in mapping))
+
+    def variant(self, image, mapping):
+        mapping_key = VariantCache.mapping_key(mapping)
+        key = (id(image), mapping_key)
+
+        with self.lock:
+            entry = self.entries.get(key)
+
+            # Ids get reused, so make sure it's still the same image.
+            if entry is not None and entry[0]() is image:
+                self.hits += 1
+                self.entries.move_to_end(key)
+
+                return entry[1]
+
+        variant = recolor_image(image, dict(mapping_key))
+
+        with self.lock:
+            self.misses += 1
+
+            if key in self.entries:
+                self.bytes -= ImageCache.image_bytes(self.entries.pop(key)[1])
+
+            self.entries[key] = (weakref.ref(image), variant)
+            self.bytes += ImageCache.image_bytes(variant)
+            self.variants.add(variant)
+            self.evict()
+
+        return variant
+
+    def evict(self):
+        with self.lock:
+            while self.bytes > self.max_bytes and len(self.entries) > 1:
+                (key, (_, variant)) = self.entries.popitem(last=False)
+                self.bytes -= ImageCache.image_bytes(variant)
+                self.evictions += 1
+
+                log.debug(f'Evicted {key} from the variant cache')
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    @property
+    def stats(self):
+        lookups = self.hits + self.misses
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': len(self.entries),
+            'bytes': self.bytes,
+        }
+
+
 class BitmappySprite(RootSprite):
     DEBUG = False
 
-    def __init__(self, *args, filename=None, **kwargs):
+    # Keep a compiled copy of each loaded sprite next to its source file.
+    USE_CACHE = True
+
+    # Sprites loaded from the same file share one image until they change it.
+    SHARE_IMAGES = True
+    IMAGE_CACHE = ImageCache()
+
+    # Palette swapped variants of sprite images.
+    VARIANT_CACHE = VariantCache()
+
+    _image = None
+    _image_reference = None
+
+    # (page, rect) when our image is a region of a texture atlas page.
+    atlas_region = None
+
+    def __init__(self, *args, filename=None, atlas=None, region=None, **kwargs):
         super().__init__(*args, **kwargs)
         self.image = None
         self.rect = None
@@ -1789,10 +2969,17 @@ class BitmappySprite(RootSprite):
         self.width = kwargs.get('width', 0)
         self.height = kwargs.get('height', 0)
 
-        # Try to load a file if one was specified, otherwise
-        # if a width and height is specified, make a surface.
-        if filename:
-            (self.image, self.rect, self.name) = self.load(filename=filename)
+        # Use a region of an atlas if one was specified, otherwise try to load
+        # a file if one was specified, otherwise if a width and height is
+        # specified, make a surface.
+        if atlas is not None:
+            self.image = self.load_region(atlas=atlas, region=region or filename)
+            self.name = region or filename
+            self.width = self.image.get_width()
+            self.height = self.image.get_height()
+
+        elif filename:
+            (self.image, self.rect, self.name) = self.load_shared(filename=filename)
             self.width = self.rect.width
             self.height = self.rect.height
 
@@ -1806,142 +2993,353 @@ class BitmappySprite(RootSprite):
         self.rect.x = kwargs.get('x', 0)
         self.rect.y = kwargs.get('y', 0)
 
-    def load(self, filename):  # noqa: R0914
-        config = configparser.ConfigParser(dict_type=collections.OrderedDict,
-                                           empty_lines_in_values=True,
-                                           strict=True)
+    @property
+    def image(self):
+        return self._image
+
+    @image.setter
+    def image(self, image):
+        # Replacing a shared image lets go of our reference to it.
+        if image is not self._image and self._image_reference:
+            self._image_reference()
+            self._image_reference = None
 
-        config.read(filename)
+        if image is not self._image:
+            self.atlas_region = None
 
-        # [sprite]
-        # name = <name>
-        name = config.get(section='sprite', option='name')
+        self._image = image
 
-        # pixels = <pixels>
-        pixels = config.get(section='sprite', option='pixels').split('\n')
+    @property
+    def image_is_shared(self):
+        return self._image_reference is not None or self.atlas_region is not None or \
+            self._image in BitmappySprite.VARIANT_CACHE.variants
 
-        # Set our sprite's length and width.
-        width = 0
-        height = 0
-        index = -1
+    def detach_image(self):
+        # Sprites must call this before drawing on an image loaded from a file,
+        # since the image may be shared with other sprites (see ImageCache).  Only
+        # the first call on a shared image makes a copy.
+        if self.image_is_shared:
+            self.image = self.image.copy()
 
-        # This is a bit of a cleanup in case the config contains something like:
-        #
-        # pixels = \n
-        #  .........
-        #
-        while not width:
-            index += 1
-            width = len(pixels[index])
-            height = len(pixels[index:])
-
-        # Trim any dead whitespace.
-        # We're off by one since we increment the
-        pixels = pixels[index:]
-
-        color_map = {}
-        for section in config.sections():
-            # This is checking the length of the section's name.
-            # Colors are length 1.  This works with unicode, too.
-            if len(section) == 1:
-                red = config.getint(section=section, option='red')
-                green = config.getint(section=section, option='green')
-                blue = config.getint(section=section, option='blue')
-
-                color_map[section] = (red, green, blue)
-
-        (image, rect) = self.inflate(width=width,
-                                     height=height,
-                                     pixels=pixels,
-                                     color_map=color_map)
+        return self.image
 
-        return (image, rect, name)
+    def load_region(self, atlas, region):
+        # Our image is a subsurface of the atlas page, so it shares the page's
+        # pixels, and renderers can blit atlas_region straight from the page.
+        (page, rect) = atlas.region(region)
+        self.image = page.subsurface(rect)
+        self.atlas_region = (page, rect)
+
+        return self.image
+
+    def palette_swap(self, mapping):
+        # Returns a variant of our image with each color in mapping replaced, like
+        # {(255, 0, 0): (0, 0, 255)} for the blue team, or [(RED, BLUE)].  Variants are
+        # cached and shared, so set one as a sprite's image, and detach_image() it before
+        # drawing on it.
+        return BitmappySprite.VARIANT_CACHE.variant(self.image, mapping)
+
+    def image_key(self, filename):  # noqa: R0201
+        # Subclasses that load the same file into a different kind of image need their own key.
+        return ImageCache.key(filename)
+
+    def load_shared(self, filename):
+        if not BitmappySprite.SHARE_IMAGES:
+            return self.load(filename=filename)
+
+        cache = BitmappySprite.IMAGE_CACHE
+        key = self.image_key(filename)
+
+        def loader():
+            (image, _, name) = self.load(filename=filename)
+            return (image, name)
+
+        (image, name) = cache.acquire(key, loader)
+
+        self.image = image
+
+        # Release our reference when the sprite goes away or changes images.
+        self._image_reference = weakref.finalize(self, cache.release, key)
+
+        return (image, image.get_rect(), name)
+
+    def load(self, filename):
+        # Compact sprites are already compiled.
+        if is_compact_sprite(filename):
+            return self.load_compiled(*load_compact_sprite(filename))
+
+        if BitmappySprite.USE_CACHE:
+            compiled_sprite = load_compiled_sprite(filename)
+
+            if compiled_sprite:
+                return self.load_compiled(*compiled_sprite)
+
+        parsed_sprite = parse_sprite_file(filename)
+
+        if BitmappySprite.USE_CACHE:
+            save_compiled_sprite(filename, *parsed_sprite)
+
+        return self.load_compiled(*parsed_sprite)
+
+    def load_compiled(self, name, width, height, palette, index_data):  # noqa: R0201
+        image = pygame.Surface((width, height))
+        image.convert()
+
+        image.blit(image_from_palette_indexes(index_data=index_data,
+                                              width=width,
+                                              height=height,
+                                              palette=palette), (0, 0))
+
+        return (image, image.get_rect(), name)
 
     def inflate(self, width, height, pixels, color_map):  # noqa: R0201
         image = pygame.Surface((width, height))
         image.convert()
 
-        raw_pixels = []
-        for y, row in enumerate(pixels):
-            for x, pixel in enumerate(row):
-                color = color_map[pixel]
-                raw_pixels.append(color)
-                pygame.draw.rect(image, color, (x, y, 1, 1))
+        unknown_pixels = set().union(*pixels) - color_map.keys()
+        if unknown_pixels:
+            raise KeyError(f'Pixels with no color: {sorted(unknown_pixels)}')
+
+        # Ragged or missing rows are clipped or left black, just like drawing them would.
+        pixel_data = ''.join(row[:width].ljust(width, '\0') for row in pixels[:height])
+        pixel_data = pixel_data.ljust(width * height, '\0')
+
+        # Pixels are usually ASCII, but they can be any character, so if need be we
+        # squash them down to byte sized indexes first.  Index 0 is left for padding.
+        if all(ord(pixel) < 256 for pixel in color_map):
+            indexes = {pixel: ord(pixel) for pixel in color_map}
+        elif len(color_map) < 256:
+            indexes = {pixel: index for (index, pixel) in enumerate(color_map, start=1)}
+            pixel_data = pixel_data.translate(
+                {ord(pixel): index for (pixel, index) in indexes.items()}
+            )
+        else:
+            indexes = None
+
+        if indexes is not None:
+            # Compile the color map into a translation table per channel, so each
+            # channel of the whole image comes out of one bytes.translate() call.
+            index_data = pixel_data.encode('latin-1')
+            rgb_data = bytearray(width * height * 3)
+
+            for channel in range(3):
+                channel_table = bytearray(256)
+
+                for (pixel, color) in color_map.items():
+                    channel_table[indexes[pixel]] = color[channel]
+
+                rgb_data[channel::3] = index_data.translate(channel_table)
+        else:
+            # Too many colors to index with a byte, so translate each
+            # pixel into its RGB bytes (as latin-1 characters) instead.
+            rgb_table = {ord(pixel): bytes(color).decode('latin-1')
+                         for (pixel, color) in color_map.items()}
+            rgb_table.setdefault(0, '\0\0\0')
+
+            rgb_data = pixel_data.translate(rgb_table).encode('latin-1')
+
+        image.blit(image_from_pixels(pixels=rgb_data,
+                                     width=width,
+                                     height=height,
+                                     pixel_format='RGB',
+                                     copy=False), (0, 0))
 
         return (image, image.get_rect())
 
     def save(self, filename):
+        # The file's extension picks the format.
+        if is_compact_sprite(filename):
+            save_compact_sprite(filename,
+                                self.name,
+                                self.image.get_width(),
+                                self.image.get_height(),
+                                *indexed_pixels_from_image(self.image))
+            return
+
         config = self.deflate()
 
-        with open(filename, 'w') as deflated_sprite:
+        with open(filename, 'w', encoding='utf-8') as deflated_sprite:
             config.write(deflated_sprite)
 
     def deflate(self):
-        config = configparser.ConfigParser(dict_type=collections.OrderedDict,
-                                           empty_lines_in_values=True,
-                                           strict=True)
+        # The palette comes out with the colors in the order they first appear,
+        # so the same image always gets the same color keys.
+        config = sprite_config(self.name,
+                               self.image.get_width(),
+                               self.image.get_height(),
+                               *indexed_pixels_from_image(self.image))
 
-        # Get the set of distinct pixels.
-        color_map = {}
-        pixels = []
+        log.debug(f'Deflated Sprite: {config}')
 
-        raw_pixels = rgb_triplet_generator(
-            pixel_data=pygame.image.tostring(self.image, 'RGB')
-        )
+        return config
+
+
+class AnimatedBitmappySprite(BitmappySprite):
+    # An animated sprite's frames are stacked top to bottom in one strip, and
+    # share one palette, so a .cfg file holds them all:
+    #
+    # [sprite]
+    # name = torch
+    # frames = 3
+    # durations = 100, 100, 200
+    # pixels = <frame 0's rows, then frame 1's rows, and so on>
+    #
+    # durations are in milliseconds, and can be a single value for every frame.
+    #
+    # The strip is decoded once, and drawn through source_rect, so changing
+    # frames never makes a new Surface.
+    DEFAULT_DURATION = 100
 
-        # We're utilizing the generator to give us RGB triplets.
-        # We need a list here becasue we'll use set() to pull out the
-        # unique values, but we also need to consume the list again
-        # down below, so we can't solely use a generator.
-        raw_pixels = [raw_pixel for raw_pixel in raw_pixels]
+    # Frame durations for each loaded strip, which live as long as the strip does.
+    DURATIONS = weakref.WeakKeyDictionary()
 
-        # This gives us the unique rgb triplets in the image.
-        colors = set(raw_pixels)
+    durations = ()
+    frame_ends = ()
+    frame_rects = ()
 
-        config.add_section('sprite')
-        config.set('sprite', 'name', self.name)
+    def image_key(self, filename):
+        # Only strips we've loaded have durations, so don't share a plain sprite's image.
+        return ImageCache.key(filename) + ('anim',)
 
-        # Generate the color key
-        color_key = chr(47)
-        for color in colors:
-            # Characters above doublequote.
-            color_key = chr(ord(color_key) + 1)
-            config.add_section(color_key)
+    def __init__(self, *args, filename=None, durations=None, **kwargs):
+        # With a filename, durations (if given) override the file's, and can split
+        # the strip into a different number of frames.
+        if filename:
+            super().__init__(*args, filename=filename, **kwargs)
+            durations = tuple(durations or AnimatedBitmappySprite.DURATIONS[self.image])
+        else:
+            # width and height are a frame's size.
+            durations = tuple(durations or (AnimatedBitmappySprite.DEFAULT_DURATION,))
+            kwargs['height'] = kwargs.get('height', 0) * len(durations)
+            super().__init__(*args, **kwargs)
 
-            color_map[color] = color_key
+        self.frame = 0
+        self.playing = True
+        self.started = pygame.time.get_ticks()
 
-            log.debug(f'Key: {color} -> {color_key}')
+        # show_frame() draws through source_rect.
+        self.source_rect = None
+        self.dirty = 1
 
-            red = color[0]
-            config.set(color_key, 'red', str(red))
+        self.set_durations(durations)
 
-            green = color[1]
-            config.set(color_key, 'green', str(green))
+    def load(self, filename):
+        # Compiled sprites don't keep the frame timings, so we always parse.
+        options = {}
+        (name, width, height, palette, index_data) = parse_sprite_file(filename, options=options)
 
-            blue = color[2]
-            config.set(color_key, 'blue', str(blue))
+        try:
+            frames = int(options.get('frames', 1))
+            durations = [int(duration) for duration in
+                         options.get('durations', str(AnimatedBitmappySprite.DEFAULT_DURATION))
+                         .split(',')]
+        except ValueError as e:
+            raise SpriteParseError(f'{filename}: Bad frames or durations: {e}') from e
 
-        x = 0
-        row = []
-        while raw_pixels:
-            row.append(color_map[raw_pixels.pop(0)])
-            x += 1
+        if len(durations) == 1:
+            durations *= frames
 
-            if x % self.rect.width == 0:
-                log.debug(f'Row: {row}')
-                pixels.append(''.join(row))
-                row = []
-                x = 0
+        if len(durations) != frames:
+            raise SpriteParseError(f'{filename}: {frames} frames, but {len(durations)} durations')
 
-        log.debug(pixels)
+        (image, rect, name) = self.load_compiled(name, width, height, palette, index_data)
+        AnimatedBitmappySprite.DURATIONS[image] = tuple(durations)
 
-        config.set('sprite', 'pixels', '\n'.join(pixels))
+        return (image, rect, name)
 
-        log.debug(f'Deflated Sprite: {config}')
+    def set_durations(self, durations):
+        frames = len(durations)
+        (width, strip_height) = self.image.get_size()
+        height = strip_height // frames
+
+        if not frames or height * frames != strip_height:
+            raise ValueError(f"Can't split a {width}x{strip_height} strip into {frames} frames.")
+
+        if min(durations) <= 0:
+            raise ValueError(f'Frame durations must be positive: {durations}')
+
+        self.durations = tuple(durations)
+
+        # The timing table holds when each frame ends, from the start of the loop.
+        self.frame_ends = tuple(itertools.accumulate(self.durations))
+        self.frame_rects = tuple(pygame.Rect(0, frame * height, width, height)
+                                 for frame in range(frames))
+
+        self.width = width
+        self.height = height
+        self.rect.size = (width, height)
+        self.show_frame(min(self.frame, frames - 1))
+
+    @property
+    def frame_count(self):
+        return len(self.frame_rects)
+
+    def show_frame(self, frame):
+        self.frame = frame
+        self.source_rect = self.frame_rects[frame]
+        self.dirty = self.dirty or 1
+
+    def frame_image(self, frame):
+        # For drawing somewhere other than a LayeredDirty; this shares the strip's pixels.
+        return self.image.subsurface(self.frame_rects[frame])
+
+    def play(self):
+        # Pick up from the start of the current frame.
+        if not self.playing:
+            self.playing = True
+            self.started = pygame.time.get_ticks() - (self.frame_ends[self.frame] -
+                                                      self.durations[self.frame])
+
+    def pause(self):
+        self.playing = False
+
+    def update(self):
+        # RootSprite calls this before we've loaded our frames.
+        if not self.frame_ends or not self.playing:
+            return
+
+        elapsed = (pygame.time.get_ticks() - self.started) % self.frame_ends[-1]
+        frame = bisect.bisect_right(self.frame_ends, elapsed)
+
+        if frame != self.frame:
+            self.show_frame(frame)
+
+    def save(self, filename):
+        if is_compact_sprite(filename):
+            raise ValueError(f"Animated sprites can't be saved as compact sprites: {filename}")
+
+        super().save(filename)
+
+    def deflate(self):
+        config = super().deflate()
+        config.set('sprite', 'frames', str(self.frame_count))
+        config.set('sprite', 'durations', ', '.join(str(duration) for duration in self.durations))
 
         return config
 
 
+class IndexedBitmappySprite(BitmappySprite):
+    # Keeps the sprite as an 8-bit palettized image, with its colors in the order
+    # of the file's color sections, so its palette can be changed (or cycled with
+    # a PaletteCycler) without touching a pixel.  Sprites from the same file share
+    # one image, and so one palette, until they detach_image() (which registering
+    # with a PaletteCycler does).
+    def image_key(self, filename):
+        return ImageCache.key(filename) + ('P',)
+
+    def load_compiled(self, name, width, height, palette, index_data):  # noqa: R0201
+        if index_data.itemsize != 1:
+            raise ValueError(f'{name} has {len(palette) // 3} colors, '
+                             'which is too many for an 8-bit image.')
+
+        image = image_from_palette_indexes(index_data=index_data,
+                                           width=width,
+                                           height=height,
+                                           palette=palette)
+
+        return (image, image.get_rect(), name)
+
+
 # This is a root class for sprites that should be singletons, like
 # the MenuBar class, and the MouseSprite class.
 class SingletonBitmappySprite(BitmappySprite):
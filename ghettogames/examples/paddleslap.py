@@ -20,6 +20,9 @@ ch = logging.StreamHandler()
 ch.setLevel(logging.INFO)
 log.addHandler(ch)
 
+SLAP_SOUND = os.path.join(os.path.dirname(__file__), 'resources/snd/slap8.wav')
+COLLISION_SOUND = os.path.join(os.path.dirname(__file__), 'resources/snd/sfx_menu_move1.wav')
+
 # Interiting from object is default in Python 3.
 # Linters complain if you do it.
 class Speed:
@@ -52,17 +55,18 @@ class Rally:
         return False
 
 
+def play(sound):
+    # Sounds are Futures from the asset manager, which started loading them before the
+    # scene did, so by the time one is played, it's almost always ready.
+    sound.result().play()
+
+
 class PaddleSprite(pygame.sprite.DirtySprite):
-    def __init__(self, name):
+    def __init__(self, name, slap_snd):
         super().__init__()
         self.use_gfxdraw = True
         # Adding some slap to the paddle
-        self.slap_snd = pygame.mixer.Sound(
-            os.path.join(
-                os.path.dirname(__file__),
-                'resources/snd/slap8.wav'
-            )
-        )
+        self.slap_snd = slap_snd
 
         self.name = name
         self.screen = pygame.display.get_surface()
@@ -109,7 +113,7 @@ class PaddleSprite(pygame.sprite.DirtySprite):
 
 
 class BallSprite(pygame.sprite.DirtySprite):
-    def __init__(self):
+    def __init__(self, collision_snd):
         super().__init__()
         self.use_gfxdraw = True
         self.screen = pygame.display.get_surface()
@@ -124,7 +128,7 @@ class BallSprite(pygame.sprite.DirtySprite):
         self.direction = 0
         self.speed = Speed(4, 2)
         self.rally = Rally(5, self.speed.speed_up)
-        self.collision_snd = pygame.mixer.Sound('resources/snd/sfx_menu_move1.wav')
+        self.collision_snd = collision_snd
 
         # The ball always needs refreshing.
         # This saves us a set on dirty every update.
@@ -141,11 +145,11 @@ class BallSprite(pygame.sprite.DirtySprite):
 
     def _do_bounce(self):
         if self.rect.y <= 0:
-            self.collision_snd.play()
+            play(self.collision_snd)
             self.rect.y = 0
             self.speed.y *= -1
         if self.rect.y + self.height >= self.screen_height:
-            self.collision_snd.play()
+            play(self.collision_snd)
             self.rect.y = self.screen_height - self.height
             self.speed.y *= -1
 
@@ -286,12 +290,20 @@ class TextSprite(pygame.sprite.DirtySprite):
 
 
 class TableScene(RootScene):
-    def __init__(self):
+    ASSETS = {
+        'sounds': [SLAP_SOUND, COLLISION_SOUND],
+    }
+
+    def __init__(self, asset_manager):
         super().__init__()
         self.screen = pygame.display.get_surface()
-        self.player1 = PaddleSprite(name="Player 1")
-        self.player2 = PaddleSprite(name="Player 2")
-        self.ball = BallSprite()
+
+        # Start loading anything that isn't already, but don't wait for it.
+        asset_manager.preload(TableScene.ASSETS)
+
+        self.player1 = PaddleSprite(name="Player 1", slap_snd=asset_manager.future(SLAP_SOUND))
+        self.player2 = PaddleSprite(name="Player 2", slap_snd=asset_manager.future(SLAP_SOUND))
+        self.ball = BallSprite(collision_snd=asset_manager.future(COLLISION_SOUND))
 
         # Set player 2's position on the right side of the screen.
         self.player2.rect.x = self.player2.screen.get_width() - self.player2.width
@@ -314,7 +326,7 @@ class TableScene(RootScene):
             if self.ball.rally.do_rally():
                 self.ball.rally.reset()
 
-            self.player1.slap_snd.play()
+            play(self.player1.slap_snd)
             self.ball.speed.x *= -1
 
         if pygame.sprite.collide_rect(self.player2, self.ball) and self.ball.speed.x > 0:
@@ -322,7 +334,7 @@ class TableScene(RootScene):
             if self.ball.rally.do_rally():
                 self.ball.rally.reset()
 
-            self.player2.slap_snd.play()
+            play(self.player2.slap_snd)
             self.ball.speed.x *= -1
 
     def on_key_up_event(self, event):
@@ -355,7 +367,7 @@ class Game(GameEngine):
 
     def __init__(self, options):
         super().__init__(options=options)
-        self.load_resources()
+        self.load_resources(TableScene)
 
         # pygame.event.set_blocked(self.mouse_events)
         # pygame.event.set_blocked(self.joystick_events)
@@ -393,7 +405,7 @@ class Game(GameEngine):
         # Note: Due to the way things are wired, you must set self.active_scene after
         # calling super().start() in this method.
         self.clock = pygame.time.Clock()
-        self.active_scene = TableScene()
+        self.active_scene = TableScene(asset_manager=self.asset_manager)
 
         while self.active_scene is not None:
             self.process_events()
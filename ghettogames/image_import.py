@@ -0,0 +1,313 @@
+# GhettoGames
+# image_import: Turns PNG, BMP (or anything pygame loads) images into Bitmappy sprites
+#
+# Images are quantized to a palette, either one you pick (like VGA), or one made for the
+# image by median cut or k-means, and can be dithered on the way.  Everything works on
+# packed RGB rows and palette index arrays, and hands back the same (name, width, height,
+# palette, index_data) that parse_sprite_file() does, so the results can be saved as
+# .cfg or .bmpy sprites, or turned into a BitmappySprite.
+#
+#   sprite = sprite_from_image('title.png', palette=VGA, dither='floyd-steinberg')
+#
+#   # Or for a whole directory of art, a process per CPU:
+#   compiled_sprites = import_images(glob.glob('art/*.png'), colors=16)
+import array
+import bisect
+import collections
+import concurrent.futures
+import functools
+import heapq
+import itertools
+import logging
+import os
+
+import pygame
+
+from ghettogames.color.quantize import BITS, SHIFT, QuantizationIndex
+from ghettogames.engine import BitmappySprite
+
+log = logging.getLogger('game.image_import')
+log.addHandler(logging.NullHandler())
+
+METHODS = ('median-cut', 'k-means')
+DITHERS = ('none', 'bayer', 'floyd-steinberg')
+
+
+def load_rgb(path):
+    # Returns (width, height, rgb_data) for an image file.
+    image = pygame.image.load(path)
+
+    return (image.get_width(), image.get_height(), pygame.image.tostring(image, 'RGB'))
+
+
+def color_histogram(rgb_data):
+    # (r, g, b) -> how many pixels are that color.
+    return collections.Counter(zip(rgb_data[0::3], rgb_data[1::3], rgb_data[2::3]))
+
+
+def color_box(colors):
+    # Returns a heap entry for a box of (color, count) pairs: the box with the most
+    # pixels spread over the widest channel gets split first.
+    channels = list(zip(*(color for (color, _) in colors)))
+    ranges = [max(channel) - min(channel) for channel in channels]
+    widest = ranges.index(max(ranges))
+    population = sum(count for (_, count) in colors)
+
+    return (-ranges[widest] * population, id(colors), widest, colors)
+
+
+def box_color(colors):
+    # The average color of a box, weighted by how many pixels use each color.
+    population = sum(count for (_, count) in colors)
+
+    return bytes(round(sum(color[channel] * count for (color, count) in colors) / population)
+                 for channel in range(3))
+
+
+def median_cut(histogram, colors=256):
+    # Returns a packed RGB palette of at most colors colors for a color histogram.
+    if not histogram:
+        raise ValueError("Can't make a palette for an image with no pixels.")
+
+    boxes = [color_box(list(histogram.items()))]
+
+    while len(boxes) < colors and boxes[0][0] < 0:
+        (_, _, channel, box) = heapq.heappop(boxes)
+
+        # Split at the pixel, not color, median, so busy colors get more palette entries.
+        box.sort(key=lambda entry: entry[0][channel])
+        counts = list(itertools.accumulate(count for (_, count) in box))
+        split = min(bisect.bisect_left(counts, counts[-1] / 2) + 1, len(box) - 1)
+
+        heapq.heappush(boxes, color_box(box[:split]))
+        heapq.heappush(boxes, color_box(box[split:]))
+
+    return b''.join(box_color(box) for (_, _, _, box) in boxes)
+
+
+def median_cut_palette(rgb_data, colors=256):
+    return median_cut(color_histogram(rgb_data), colors=colors)
+
+
+def kmeans_palette(rgb_data, colors=256, iterations=8):
+    # Starts from the median cut palette and moves each color to the middle of the
+    # pixels nearest to it, until nothing moves.  Nearest is by the palette's
+    # QuantizationIndex, which is much quicker than exact, and close enough here.
+    histogram = color_histogram(rgb_data)
+    palette = median_cut(histogram, colors=colors)
+
+    unique_colors = list(histogram)
+    counts = list(histogram.values())
+    unique_rgb_data = bytes(itertools.chain.from_iterable(unique_colors))
+
+    for _ in range(iterations):
+        nearest = QuantizationIndex(palette).quantize(unique_rgb_data)
+        totals = [[0, 0, 0, 0] for _ in range(len(palette) // 3)]
+
+        for (color, count, cluster) in zip(unique_colors, counts, nearest):
+            total = totals[cluster]
+            total[0] += color[0] * count
+            total[1] += color[1] * count
+            total[2] += color[2] * count
+            total[3] += count
+
+        # Colors nobody is nearest to stay put.
+        next_palette = b''.join(
+            bytes(round(channel / total[3]) for channel in total[:3]) if total[3]
+            else palette[cluster * 3:cluster * 3 + 3]
+            for (cluster, total) in enumerate(totals)
+        )
+
+        if next_palette == palette:
+            break
+
+        palette = next_palette
+
+    return palette
+
+
+def bayer_matrix(size):
+    # Returns the size x size ordered dither thresholds (0 to size * size - 1).
+    if size == 1:
+        return [[0]]
+
+    if size & (size - 1):
+        raise ValueError(f'Bayer matrices are sized in powers of 2, not {size}.')
+
+    smaller = bayer_matrix(size // 2)
+
+    return ([[threshold * 4 for threshold in row] + [threshold * 4 + 2 for threshold in row]
+             for row in smaller] +
+            [[threshold * 4 + 3 for threshold in row] + [threshold * 4 + 1 for threshold in row]
+             for row in smaller])
+
+
+def ordered_dither(rgb_data, width, height, size=4, spread=32):  # noqa: R0914
+    # Nudges each pixel up or down by up to spread / 2, by its place in a Bayer matrix.
+    # Every row is a handful of bytes.translate() calls per channel.
+    matrix = bayer_matrix(size)
+    thresholds = size * size
+
+    tables = []
+    for threshold in range(thresholds):
+        offset = round(((threshold + 0.5) / thresholds - 0.5) * spread)
+        tables.append(bytes(min(max(value + offset, 0), 255) for value in range(256)))
+
+    planes = [bytearray(rgb_data[channel::3]) for channel in range(3)]
+
+    for y in range(height):
+        row = matrix[y % size]
+        start = y * width
+
+        for (x, threshold) in enumerate(row[:width]):
+            columns = slice(start + x, start + width, size)
+
+            for plane in planes:
+                plane[columns] = plane[columns].translate(tables[threshold])
+
+    dithered_data = bytearray(len(rgb_data))
+
+    for (channel, plane) in enumerate(planes):
+        dithered_data[channel::3] = plane
+
+    return bytes(dithered_data)
+
+
+def floyd_steinberg(rgb_data, width, height, index):  # noqa: R0914
+    # Returns palette indexes, passing each pixel's error on to its neighbors.
+    #
+    # Error diffusion depends on the pixel before, so this is a pixel at a time, but it
+    # works on plain int row buffers, and looks colors up in the index's table.
+    table = index.table
+    palette = index.palette
+    (reds, greens, blues) = (list(palette[channel::3]) for channel in range(3))
+
+    index_data = array.array(table.typecode)
+
+    # Errors are kept in 16ths, with a pixel of padding at either end of the row.
+    next_errors = [0] * ((width + 2) * 3)
+
+    for y in range(height):
+        row = rgb_data[y * width * 3:(y + 1) * width * 3]
+        (errors, next_errors) = (next_errors, [0] * ((width + 2) * 3))
+
+        for x in range(width):
+            offset = x * 3
+            error = offset + 3
+
+            red = min(max(row[offset] + errors[error] // 16, 0), 255)
+            green = min(max(row[offset + 1] + errors[error + 1] // 16, 0), 255)
+            blue = min(max(row[offset + 2] + errors[error + 2] // 16, 0), 255)
+
+            color = table[((red >> SHIFT) << (BITS * 2)) |
+                          ((green >> SHIFT) << BITS) |
+                          (blue >> SHIFT)]
+            index_data.append(color)
+
+            for (channel, value) in ((0, red - reds[color]),
+                                     (1, green - greens[color]),
+                                     (2, blue - blues[color])):
+                if value:
+                    errors[error + channel + 3] += value * 7
+                    next_errors[error + channel - 3] += value * 3
+                    next_errors[error + channel] += value * 5
+                    next_errors[error + channel + 3] += value
+
+    return index_data
+
+
+def used_colors(palette, index_data):
+    # Returns (palette, index_data) with only the colors index_data uses, in palette order.
+    used = sorted(set(index_data))
+    compact_palette = b''.join(palette[color * 3:color * 3 + 3] for color in used)
+
+    if len(used) * 3 == len(palette):
+        return (bytes(palette), index_data)
+
+    if index_data.itemsize == 1:
+        index_table = bytearray(256)
+
+        for (new_color, color) in enumerate(used):
+            index_table[color] = new_color
+
+        compact_data = array.array('B')
+        compact_data.frombytes(index_data.tobytes().translate(index_table))
+    else:
+        new_colors = {color: new_color for (new_color, color) in enumerate(used)}
+        compact_data = array.array('B' if len(used) <= 256 else 'H',
+                                   map(new_colors.__getitem__, index_data))
+
+    return (compact_palette, compact_data)
+
+
+def quantize_image(rgb_data, width, height, palette=None, colors=256, method='median-cut',
+                   dither='none', spread=32):
+    # Returns (palette, index_data) for packed RGB pixels.  palette is a ColorPalette or
+    # packed RGB bytes; without one, we make one of at most colors colors by method.
+    if palette is None:
+        if method == 'median-cut':
+            palette = median_cut_palette(rgb_data, colors=colors)
+        elif method == 'k-means':
+            palette = kmeans_palette(rgb_data, colors=colors)
+        else:
+            raise ValueError(f'Unknown palette method {method}, not one of {METHODS}.')
+
+    index = getattr(palette, 'quantization_index', None) or QuantizationIndex(palette)
+
+    if dither in (None, 'none'):
+        index_data = index.quantize(rgb_data)
+    elif dither == 'bayer':
+        index_data = index.quantize(ordered_dither(rgb_data, width, height, spread=spread))
+    elif dither == 'floyd-steinberg':
+        index_data = floyd_steinberg(rgb_data, width, height, index)
+    else:
+        raise ValueError(f'Unknown dither {dither}, not one of {DITHERS}.')
+
+    return used_colors(index.palette, index_data)
+
+
+def import_image(path, name=None, **options):
+    # Returns (name, width, height, palette, index_data), like parse_sprite_file().
+    (width, height, rgb_data) = load_rgb(path)
+
+    if name is None:
+        name = os.path.splitext(os.path.basename(path))[0]
+
+    (palette, index_data) = quantize_image(rgb_data, width, height, **options)
+
+    log.debug(f'Imported {width}x{height} image with {len(palette) // 3} colors: {path}')
+
+    return (name, width, height, palette, index_data)
+
+
+def import_images(paths, workers=None, **options):
+    # Imports a batch of images in a process pool, returning their compiled sprites in
+    # the same order.  Surfaces can't cross processes, so the workers hand back palettes
+    # and indexes, and sprite_from_compiled() makes sprites of them.
+    paths = list(paths)
+
+    # ColorPalettes carry their index around, so send just the colors.
+    if options.get('palette') is not None:
+        options['palette'] = getattr(options['palette'], 'rgb', options['palette'])
+
+    if len(paths) < 2 or workers == 1:
+        return [import_image(path, **options) for path in paths]
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(functools.partial(import_image, **options), paths))
+
+
+def sprite_from_compiled(name, width, height, palette, index_data, sprite_type=None):
+    # Makes a BitmappySprite (or a subclass) of a compiled sprite.
+    sprite = (sprite_type or BitmappySprite)(width=width, height=height, name=name)
+    (sprite.image, sprite.rect, sprite.name) = sprite.load_compiled(name,
+                                                                    width,
+                                                                    height,
+                                                                    palette,
+                                                                    index_data)
+
+    return sprite
+
+
+def sprite_from_image(path, sprite_type=None, **options):
+    return sprite_from_compiled(*import_image(path, **options), sprite_type=sprite_type)
@@ -0,0 +1,130 @@
+# GhettoGames
+# sprite_cache: Compiled binary sidecars for Bitmappy sprite files
+#
+# Parsing and inflating a .cfg sprite is slow compared to copying bytes around, so the first
+# time a sprite is loaded, a compiled copy holding its size, name, palette and packed palette
+# indexes is written next to it.  The compiled copy records the source file's mtime and size,
+# and is ignored (and rebuilt by the loader) whenever the source changes.
+import array
+import contextlib
+import logging
+import os
+import struct
+import sys
+import tempfile
+
+log = logging.getLogger('game.sprite_cache')
+log.addHandler(logging.NullHandler())
+
+CACHE_SUFFIX = '.cache'
+MAGIC = b'GGSC'
+VERSION = 2
+
+# magic, version, source mtime (ns), source size, width, height, name length, color count
+HEADER = struct.Struct('<4sHqqHHHI')
+
+
+def cache_path(path):
+    return f'{path}{CACHE_SUFFIX}'
+
+
+def index_type(color_count):
+    # Palette indexes are 1 byte each unless there are too many colors.
+    return 'B' if color_count <= 256 else 'H'
+
+
+def load_compiled_sprite(path):
+    # Returns (name, width, height, palette, index_data) where palette is packed RGB bytes
+    # and index_data is an array of palette indexes, or None if there's no compiled copy
+    # of path or it's out of date.
+    try:
+        source = os.stat(path)
+
+        with open(cache_path(path), 'rb') as fh:
+            compiled_data = fh.read()
+    except OSError:
+        return None
+
+    try:
+        (magic, version, mtime, size, width, height, name_length, color_count) = \
+            HEADER.unpack_from(compiled_data)
+    except struct.error:
+        log.debug(f'Truncated sprite cache: {cache_path(path)}')
+        return None
+
+    if (magic, version) != (MAGIC, VERSION):
+        log.debug(f'Unrecognized sprite cache: {cache_path(path)}')
+        return None
+
+    if (mtime, size) != (source.st_mtime_ns, source.st_size):
+        log.debug(f'Stale sprite cache: {cache_path(path)}')
+        return None
+
+    offset = HEADER.size
+    name = compiled_data[offset:offset + name_length].decode('utf-8')
+
+    offset += name_length
+    palette = compiled_data[offset:offset + color_count * 3]
+
+    offset += color_count * 3
+    index_data = array.array(index_type(color_count))
+    index_data.frombytes(compiled_data[offset:offset + width * height * index_data.itemsize])
+
+    if len(index_data) != width * height:
+        log.debug(f'Truncated sprite cache: {cache_path(path)}')
+        return None
+
+    if sys.byteorder != 'little':
+        index_data.byteswap()
+
+    return (name, width, height, palette, index_data)
+
+
+def save_compiled_sprite(path, name, width, height, palette, index_data):
+    # The cache is an optimization, so failing to write it (say, because the
+    # sprite lives somewhere read-only) isn't an error.
+    color_count = len(palette) // 3
+    index_data = array.array(index_type(color_count), index_data)
+
+    if sys.byteorder != 'little':
+        index_data.byteswap()
+
+    encoded_name = name.encode('utf-8')
+
+    try:
+        source = os.stat(path)
+
+        header = HEADER.pack(MAGIC,
+                             VERSION,
+                             source.st_mtime_ns,
+                             source.st_size,
+                             width,
+                             height,
+                             len(encoded_name),
+                             color_count)
+
+        # Write to a temporary file first so a reader never sees half a cache.  Sprites
+        # can load on several threads at once (see AssetManager), so each write gets a
+        # file of its own.
+        (fd, temporary_path) = tempfile.mkstemp(dir=os.path.dirname(path) or os.curdir,
+                                                prefix=f'{os.path.basename(cache_path(path))}.',
+                                                suffix='.tmp')
+
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                fh.write(header)
+                fh.write(encoded_name)
+                fh.write(palette)
+                fh.write(index_data.tobytes())
+
+            os.replace(temporary_path, cache_path(path))
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(temporary_path)
+
+            raise
+    except (OSError, struct.error) as e:
+        log.debug(f'Not caching {path}: {e}')
+        return False
+
+    return True
@@ -0,0 +1,202 @@
+# GhettoGames
+# sprite_parser: A single pass parser for the Bitmappy sprite file format
+#
+# Bitmappy sprites are CFG files with a [sprite] section holding the sprite's name and
+# its rows of pixels, and a section per color, named after the character used for it:
+#
+# [sprite]
+# name = JEWEL.GET
+# pixels =
+#     4430
+#     4300
+#
+# [0]
+# red = 85
+# green = 0
+# blue = 113
+#
+# ConfigParser can read these, but it builds a dict for every section, and we'd then
+# look every color up again.  This reads the lines once, keeps only what a sprite needs,
+# and hands back the same (name, width, height, palette, index_data) that compiled
+# sprites are stored as, so both load the same way.
+import array
+import logging
+import re
+
+log = logging.getLogger('game.sprite_parser')
+log.addHandler(logging.NullHandler())
+
+# key = value, or key: value, like ConfigParser.
+OPTION = re.compile(r'(?P<key>[^=:]+?)\s*[=:]\s*(?P<value>.*)$')
+
+CHANNELS = ('red', 'green', 'blue')
+
+
+class SpriteParseError(ValueError):
+    pass
+
+
+def parse_sprite_file(path, options=None):
+    with open(path, encoding='utf-8') as fh:
+        return parse_sprite(fh.read(), source=path, options=options)
+
+
+def parse_sprite(text, source='<sprite>', options=None):  # noqa: R0912
+    # Returns (name, width, height, palette, index_data) where palette is packed RGB bytes
+    # and index_data is an array of palette indexes, one per pixel.
+    #
+    # If options is a dict, any other options in the [sprite] section are added to it.
+    name = None
+    rows = None
+
+    # pixel -> [red, green, blue], in the order the colors appear.
+    colors = {}
+    color = None
+
+    # Every (section, option) we've seen, to catch duplicates like ConfigParser(strict=True).
+    seen = set()
+    section = None
+    option = None
+
+    def error(message):
+        return SpriteParseError(f'{source}, line {number}: {message}')
+
+    for (number, line) in enumerate(text.splitlines(), start=1):
+        stripped = line.strip()
+
+        if not stripped:
+            # Blank lines are part of the pixels, but trailing ones get trimmed below.
+            if option == 'pixels':
+                rows.append('')
+            continue
+
+        if stripped[0] in '#;':
+            continue
+
+        # An indented line continues the value above it.
+        if line[0].isspace() and option is not None:
+            if option == 'pixels':
+                rows.append(stripped)
+            elif option == 'name':
+                name = f'{name}\n{stripped}'
+            else:
+                raise error(f'[{section}] {option} has more than one line')
+            continue
+
+        if stripped[0] == '[':
+            if stripped[-1] != ']':
+                raise error(f'Bad section header: {stripped}')
+
+            section = stripped[1:-1]
+            option = None
+
+            if section in seen:
+                raise error(f'Duplicate section [{section}]')
+            seen.add(section)
+
+            # Colors are named by a single character.  This works with unicode, too.
+            if len(section) == 1:
+                color = colors[section] = [None, None, None]
+            else:
+                color = None
+            continue
+
+        match = OPTION.match(stripped)
+        if match is None or section is None:
+            raise error(f'Expected an option or a section: {stripped}')
+
+        (key, value) = (match['key'].lower(), match['value'])
+
+        if (section, key) in seen:
+            raise error(f'Duplicate option {key} in [{section}]')
+        seen.add((section, key))
+
+        if section == 'sprite' and key == 'name':
+            name = value
+            option = key
+        elif section == 'sprite' and key == 'pixels':
+            rows = [value] if value else []
+            option = key
+        elif color is not None and key in CHANNELS:
+            try:
+                channel = int(value)
+            except ValueError as e:
+                raise error(f'[{section}] {key} is not a number: {value}') from e
+
+            if not 0 <= channel <= 255:
+                raise error(f'[{section}] {key} is out of range: {channel}')
+
+            color[CHANNELS.index(key)] = channel
+            option = key
+        else:
+            # Anything else (like alpha) is allowed, but isn't part of a sprite.
+            if section == 'sprite' and options is not None:
+                options[key] = value
+
+            option = key
+
+    if 'sprite' not in seen:
+        raise SpriteParseError(f'{source}: No [sprite] section')
+
+    if name is None:
+        raise SpriteParseError(f'{source}: [sprite] has no name')
+
+    # Trim blank rows from either end; the width comes from the first row.
+    while rows and not rows[-1]:
+        rows.pop()
+
+    while rows and not rows[0]:
+        rows.pop(0)
+
+    if not rows:
+        raise SpriteParseError(f'{source}: [sprite] has no pixels')
+
+    for (pixel, color) in colors.items():
+        if None in color:
+            raise SpriteParseError(f'{source}: [{pixel}] needs red, green and blue')
+
+    width = len(rows[0])
+    height = len(rows)
+
+    (palette, index_data) = index_pixels(rows=rows, width=width, colors=colors, source=source)
+
+    return (name, width, height, palette, index_data)
+
+
+def index_pixels(rows, width, colors, source='<sprite>'):
+    # Returns (palette, index_data) for rows of pixels drawn with colors.
+    #
+    # Ragged rows are clipped or left black, just like drawing them would.
+    pixel_data = ''.join(row[:width].ljust(width, '\0') for row in rows)
+
+    unknown_pixels = set(pixel_data) - colors.keys() - {'\0'}
+    if unknown_pixels:
+        raise SpriteParseError(f'{source}: Pixels with no color: {sorted(unknown_pixels)}')
+
+    pixels = list(colors)
+    palette = bytearray(color_channel for color in colors.values() for color_channel in color)
+
+    if '\0' in pixel_data:
+        pixels.append('\0')
+        palette += b'\0\0\0'
+
+    if len(pixels) <= 256:
+        index_data = array.array('B')
+
+        if all(ord(pixel) < 256 for pixel in pixels):
+            # The usual case, so one bytes.translate() call does every pixel.
+            index_table = bytearray(256)
+
+            for (index, pixel) in enumerate(pixels):
+                index_table[ord(pixel)] = index
+
+            index_data.frombytes(pixel_data.encode('latin-1').translate(index_table))
+        else:
+            index_data.frombytes(pixel_data.translate(
+                {ord(pixel): index for (index, pixel) in enumerate(pixels)}
+            ).encode('latin-1'))
+    else:
+        indexes = {pixel: index for (index, pixel) in enumerate(pixels)}
+        index_data = array.array('H', map(indexes.__getitem__, pixel_data))
+
+    return (bytes(palette), index_data)
@@ -0,0 +1,912 @@
+#!/usr/bin/env python
+
+import argparse
+import collections
+import configparser
+import glob
+import inspect
+import logging
+import os
+import random
+import shutil
+import struct
+import tempfile
+import timeit
+import tracemalloc
+
+# We don't need a window for any of this.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame  # noqa: E402
+
+from ghettogames.color import VGA  # noqa: E402
+from ghettogames.color.palette import PaletteUtility  # noqa: E402
+from ghettogames.color.quantize import QuantizationIndex  # noqa: E402
+from ghettogames.engine import rgb_555_triplet_generator, rgb_565_triplet_generator  # noqa: E402
+from ghettogames.engine import rgb_from_packed_data, packed_rgb_tables  # noqa: E402
+from ghettogames.engine import image_from_pixels, rgb_triplet_generator  # noqa: E402
+from ghettogames.engine import image_from_path, pixels_from_path  # noqa: E402
+from ghettogames.engine import BitmappySprite, recolor_image  # noqa: E402
+from ghettogames.engine import EventManager, GameEngine, ResourceManager  # noqa: E402
+from ghettogames.engine import KeyboardManager, RootSprite, SpriteIndex  # noqa: E402
+from ghettogames.sprite_parser import index_pixels, parse_sprite  # noqa: E402
+
+log = logging.getLogger('game')
+log.setLevel(logging.INFO)
+
+ch = logging.StreamHandler()
+ch.setLevel(logging.INFO)
+
+log.addHandler(ch)
+
+# The engine is chatty about things like sprites being created without a size,
+# which we don't care about here.
+logging.getLogger('game.engine').setLevel(logging.CRITICAL)
+
+SPRITE_PATH = os.path.join(os.path.dirname(__file__),
+                           '..', 'ghettogames', 'examples', 'resources', 'sprites')
+
+
+def report(name, baseline, candidate):
+    (baseline_name, baseline_time) = baseline
+    (candidate_name, candidate_time) = candidate
+
+    log.info(f'{name}:')
+    log.info(f'\t{baseline_name}: {baseline_time * 1000:.3f} ms')
+    log.info(f'\t{candidate_name}: {candidate_time * 1000:.3f} ms')
+
+    if candidate_time:
+        log.info(f'\tSpeedup: {baseline_time / candidate_time:.1f}x')
+
+
+def best_of(statement, repeat, number=1):
+    return min(timeit.repeat(statement, repeat=repeat, number=number)) / number
+
+
+def peak_memory(statement):
+    tracemalloc.start()
+    statement()
+    (_, peak) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return peak
+
+
+def benchmark_packed_rgb(options):
+    width = options.width
+    height = options.height
+
+    random.seed(0)
+    pixel_data = bytes(random.getrandbits(8) for i in range(width * height * 2))
+
+    for pixel_format, generator in (('555', rgb_555_triplet_generator),
+                                    ('565', rgb_565_triplet_generator)):
+        # Build the lookup tables up front so we're only timing the decode.
+        packed_rgb_tables(pixel_format)
+
+        # This is what the generators did before the bulk decoder existed,
+        # so it's our baseline.
+        baseline = best_of(
+            lambda pixel_format=pixel_format: b''.join(
+                bytes(rgb)
+                for rgb in legacy_packed_rgb_triplet_generator(
+                    pixel_data=struct.iter_unpack('<H', pixel_data),
+                    pixel_format=pixel_format
+                )
+            ),
+            repeat=options.repeat
+        )
+
+        wrapped = best_of(
+            lambda generator=generator: list(
+                generator(pixel_data=struct.iter_unpack('<H', pixel_data))
+            ),
+            repeat=options.repeat
+        )
+
+        bulk = best_of(
+            lambda pixel_format=pixel_format: rgb_from_packed_data(pixel_data=pixel_data,
+                                                                   pixel_format=pixel_format),
+            repeat=options.repeat
+        )
+
+        report(f'RGB{pixel_format} {width}x{height}',
+               ('per-pixel', baseline),
+               ('bulk', bulk))
+        log.info(f'\tgenerator wrapper: {wrapped * 1000:.3f} ms')
+
+
+def legacy_packed_rgb_triplet_generator(pixel_data, pixel_format):
+    # The original per-pixel decoder, minus the per-pixel logging
+    # (which only made it slower).
+    green_bits = 5 if pixel_format == '555' else 6
+    blue_start = 10 if pixel_format == '555' else 11
+    blue_end = 15 if pixel_format == '555' else 16
+
+    for packed_rgb_triplet in pixel_data:
+        rgb_data = bin(packed_rgb_triplet[0])[2:]
+        rgb_data = '0' * (16 - len(rgb_data)) + rgb_data
+
+        red = int(rgb_data[0:5] + '000', 2)
+        if red:
+            red += 7
+
+        green = int(rgb_data[5:5 + green_bits] + '0' * (8 - green_bits), 2)
+        if green:
+            green += (1 << (8 - green_bits)) - 1
+
+        blue = int(rgb_data[blue_start:blue_end] + '000', 2)
+        if blue:
+            blue += 7
+
+        yield tuple([red, green, blue])
+
+
+def benchmark_image_from_pixels(options):
+    width = options.width
+    height = options.height
+
+    random.seed(0)
+    pixel_data = bytes(random.getrandbits(8) for i in range(width * height * 3))
+    pixels = list(rgb_triplet_generator(pixel_data=pixel_data))
+
+    baseline = best_of(
+        lambda: legacy_image_from_pixels(pixels=pixels, width=width, height=height),
+        repeat=options.repeat
+    )
+
+    triplets = best_of(
+        lambda: image_from_pixels(pixels=pixels, width=width, height=height),
+        repeat=options.repeat
+    )
+
+    buffer = best_of(
+        lambda: image_from_pixels(pixels=pixel_data, width=width, height=height),
+        repeat=options.repeat
+    )
+
+    shared = best_of(
+        lambda: image_from_pixels(pixels=pixel_data, width=width, height=height, copy=False),
+        repeat=options.repeat
+    )
+
+    report(f'Image From Pixels {width}x{height}',
+           ('fill() per pixel', baseline),
+           ('triplets', triplets))
+    log.info(f'\tbuffer: {buffer * 1000:.3f} ms')
+    log.info(f'\tbuffer (no copy): {shared * 1000:.3f} ms')
+
+
+def legacy_image_from_pixels(pixels, width, height):
+    image = pygame.Surface((width, height))
+    y = 0
+    x = 0
+    for pixel in pixels:
+        image.fill(pixel, ((x, y), (1, 1)))
+
+        if (x + 1) % width == 0:
+            x = 0
+            y += 1
+        else:
+            x += 1
+
+    return image
+
+
+def benchmark_pixels_from_path(options):
+    width = options.width
+    height = options.height
+
+    random.seed(0)
+
+    with tempfile.NamedTemporaryFile(suffix='.raw') as fh:
+        fh.write(bytes(random.getrandbits(8) for i in range(width * height * 3)))
+        fh.flush()
+
+        def load():
+            return image_from_pixels(pixels=pixels_from_path(path=fh.name),
+                                     width=width,
+                                     height=height)
+
+        image = pygame.Surface((width, height))
+
+        def stream():
+            return image_from_path(path=fh.name, width=width, height=height, image=image)
+
+        report(f'Pixels From Path {width}x{height}',
+               ('pixels_from_path', best_of(load, repeat=options.repeat)),
+               ('image_from_path', best_of(stream, repeat=options.repeat)))
+        log.info(f'\tpixels_from_path peak memory: {peak_memory(load) // 1024} KiB')
+        log.info(f'\timage_from_path peak memory: {peak_memory(stream) // 1024} KiB')
+
+
+def benchmark_inflate(options):
+    # BitmappySprite needs a display surface to exist.
+    pygame.display.set_mode((1, 1))
+
+    # We want to time parsing the .cfg files, and not litter the source tree.
+    BitmappySprite.USE_CACHE = False
+
+    sprites = [BitmappySprite(filename=filename)
+               for filename in sorted(glob.glob(os.path.join(SPRITE_PATH, '*.cfg')))]
+
+    # Pull the parsed sprite data back out so that we're only timing inflate().
+    inflate_args = []
+    for sprite in sprites:
+        pixel_data = pygame.image.tostring(sprite.image, 'RGB')
+        color_map = {}
+        rows = []
+
+        for y in range(sprite.height):
+            row = []
+            for x in range(sprite.width):
+                color = tuple(pixel_data[(y * sprite.width + x) * 3:][:3])
+                row.append(color_map.setdefault(color, chr(48 + len(color_map))))
+            rows.append(''.join(row))
+
+        inflate_args.append({
+            'width': sprite.width,
+            'height': sprite.height,
+            'pixels': rows,
+            'color_map': {key: color for (color, key) in color_map.items()}
+        })
+
+    for (sprite, kwargs) in zip(sprites, inflate_args):
+        (legacy_image, _) = legacy_inflate(**kwargs)
+        (image, _) = sprite.inflate(**kwargs)
+
+        if pygame.image.tostring(legacy_image, 'RGBA') != pygame.image.tostring(image, 'RGBA'):
+            raise RuntimeError(f'inflate() output differs for {sprite.filename}')
+
+    baseline = best_of(
+        lambda: [legacy_inflate(**kwargs) for kwargs in inflate_args],
+        repeat=options.repeat
+    )
+
+    translated = best_of(
+        lambda: [sprite.inflate(**kwargs) for (sprite, kwargs) in zip(sprites, inflate_args)],
+        repeat=options.repeat
+    )
+
+    report(f'Inflate {len(sprites)} Sprites',
+           ('draw.rect() per pixel', baseline),
+           ('translate', translated))
+
+
+def legacy_inflate(width, height, pixels, color_map):
+    image = pygame.Surface((width, height))
+    image.convert()
+
+    for y, row in enumerate(pixels):
+        for x, pixel in enumerate(row):
+            pygame.draw.rect(image, color_map[pixel], (x, y, 1, 1))
+
+    return (image, image.get_rect())
+
+
+def benchmark_deflate(options):
+    width = options.width
+    height = options.height
+
+    pygame.display.set_mode((1, 1))
+
+    # Something sprite-like: a few hundred colors, in runs.
+    random.seed(0)
+    colors = [bytes(random.getrandbits(8) for i in range(3)) for i in range(200)]
+    pixel_data = b''.join(random.choice(colors) * random.randint(1, 16)
+                          for i in range(width * height // 4))[:width * height * 3]
+
+    sprite = BitmappySprite(width=width, height=height)
+    sprite.image = image_from_pixels(pixels=pixel_data, width=width, height=height)
+
+    config = sprite.deflate()
+    if config.get('sprite', 'pixels') != sprite.deflate().get('sprite', 'pixels'):
+        raise RuntimeError('deflate() is not deterministic')
+
+    # The legacy path is quadratic, so only run it once.
+    baseline = best_of(lambda: legacy_deflate(sprite), repeat=1)
+    linear = best_of(sprite.deflate, repeat=options.repeat)
+
+    report(f'Deflate {width}x{height}',
+           ('list.pop(0)', baseline),
+           ('linear', linear))
+
+
+def legacy_deflate(sprite):
+    raw_pixels = list(rgb_triplet_generator(
+        pixel_data=pygame.image.tostring(sprite.image, 'RGB')
+    ))
+
+    color_map = {}
+    color_key = chr(47)
+    for color in set(raw_pixels):
+        color_key = chr(ord(color_key) + 1)
+        color_map[color] = color_key
+
+    pixels = []
+    row = []
+    while raw_pixels:
+        row.append(color_map[raw_pixels.pop(0)])
+
+        if len(row) == sprite.rect.width:
+            pixels.append(''.join(row))
+            row = []
+
+    return pixels
+
+
+def benchmark_sprite_cache(options):
+    pygame.display.set_mode((1, 1))
+
+    # Sharing images would turn every load after the first into a lookup.
+    BitmappySprite.SHARE_IMAGES = False
+
+    # Work on a copy so we don't litter the source tree with compiled sprites.
+    with tempfile.TemporaryDirectory() as sprite_path:
+        filenames = [shutil.copy(filename, sprite_path)
+                     for filename in sorted(glob.glob(os.path.join(SPRITE_PATH, '*.cfg')))]
+
+        def load():
+            return [BitmappySprite(filename=filename) for filename in filenames]
+
+        BitmappySprite.USE_CACHE = False
+        uncached = best_of(load, repeat=options.repeat)
+
+        BitmappySprite.USE_CACHE = True
+        compiled = best_of(load, repeat=1)
+        cached = best_of(load, repeat=options.repeat)
+
+        BitmappySprite.USE_CACHE = False
+
+        report(f'Load {len(filenames)} Sprites',
+               ('.cfg', uncached),
+               ('compiled', cached))
+        log.info(f'\tfirst load (compiling): {compiled * 1000:.3f} ms')
+
+
+def benchmark_parse(options):
+    # Read the files up front, so we're only timing parsing.
+    texts = []
+    for filename in sorted(glob.glob(os.path.join(SPRITE_PATH, '*.cfg'))):
+        with open(filename, encoding='utf-8') as fh:
+            texts.append(fh.read())
+
+    for text in texts:
+        (name, width, height, color_map, rows) = legacy_parse(text)
+
+        if (name, width, height, *index_pixels(rows=rows, width=width, colors=color_map)) != \
+                parse_sprite(text):
+            raise RuntimeError(f'parse_sprite() output differs for {name}')
+
+    baseline = best_of(lambda: [legacy_parse(text) for text in texts], repeat=options.repeat)
+    single_pass = best_of(lambda: [parse_sprite(text) for text in texts], repeat=options.repeat)
+
+    report(f'Parse {len(texts)} Sprites',
+           ('ConfigParser', baseline),
+           ('parse_sprite', single_pass))
+
+
+def legacy_parse(text):
+    config = configparser.ConfigParser(dict_type=collections.OrderedDict,
+                                       empty_lines_in_values=True,
+                                       strict=True)
+    config.read_string(text)
+
+    name = config.get(section='sprite', option='name')
+    pixels = config.get(section='sprite', option='pixels').split('\n')
+
+    width = 0
+    height = 0
+    index = -1
+    while not width:
+        index += 1
+        width = len(pixels[index])
+        height = len(pixels[index:])
+
+    color_map = {}
+    for section in config.sections():
+        if len(section) == 1:
+            color_map[section] = (config.getint(section=section, option='red'),
+                                  config.getint(section=section, option='green'),
+                                  config.getint(section=section, option='blue'))
+
+    return (name, width, height, color_map, pixels[index:])
+
+
+def benchmark_compact_sprite(options):
+    width = options.width
+    height = options.height
+
+    pygame.display.set_mode((1, 1))
+    BitmappySprite.USE_CACHE = False
+    BitmappySprite.SHARE_IMAGES = False
+
+    # Something tile sheet-like: a few hundred colors, in runs.
+    random.seed(0)
+    colors = [bytes(random.getrandbits(8) for i in range(3)) for i in range(200)]
+    pixel_data = b''.join(random.choice(colors) * random.randint(1, 16)
+                          for i in range(width * height // 4))[:width * height * 3]
+
+    sprite = BitmappySprite(width=width, height=height)
+    sprite.image = image_from_pixels(pixels=pixel_data, width=width, height=height)
+
+    with tempfile.TemporaryDirectory() as sprite_path:
+        filenames = [os.path.join(sprite_path, f'sheet{suffix}') for suffix in ('.cfg', '.bmpy')]
+
+        for filename in filenames:
+            sprite.save(filename)
+
+            if pygame.image.tostring(BitmappySprite(filename=filename).image, 'RGB') != \
+                    pixel_data:
+                raise RuntimeError(f'{filename} did not round trip')
+
+        (config_time, compact_time) = [
+            best_of(lambda filename=filename: BitmappySprite(filename=filename),
+                    repeat=options.repeat)
+            for filename in filenames
+        ]
+
+        report(f'Load {width}x{height}',
+               ('.cfg', config_time),
+               ('.bmpy', compact_time))
+
+        for filename in filenames:
+            log.info(f'\t{os.path.basename(filename)}: {os.path.getsize(filename) // 1024} KiB')
+
+
+def benchmark_palette(options):
+    pixel_count = options.width * options.height
+
+    random.seed(0)
+    index_data = bytes(random.getrandbits(8) for i in range(pixel_count))
+
+    legacy_palette = collections.deque(VGA)
+
+    def legacy_map_indices():
+        return b''.join(bytes(tuple(legacy_palette[index])[:3]) for index in index_data)
+
+    if legacy_map_indices() != VGA.map_indices(index_data):
+        raise RuntimeError('map_indices() output differs')
+
+    report(f'Map {options.width}x{options.height} VGA Indexes to RGB',
+           ('deque lookup per pixel', best_of(legacy_map_indices, repeat=options.repeat)),
+           ('map_indices', best_of(lambda: VGA.map_indices(index_data), repeat=options.repeat)))
+
+
+def benchmark_quantize(options):
+    # Searching the palette for every pixel is slow enough that we only time a 64x64 image.
+    pixel_count = 64 * 64
+
+    random.seed(0)
+    pixel_data = bytes(random.getrandbits(8) for i in range(pixel_count * 3))
+
+    palette = VGA.rgb
+    colors = [tuple(palette[offset:offset + 3]) for offset in range(0, len(palette), 3)]
+    index = QuantizationIndex(palette)
+
+    def distance(offset, color):
+        return sum((channel - color_channel) ** 2
+                   for (channel, color_channel)
+                   in zip(pixel_data[offset:offset + 3], colors[color]))
+
+    def legacy_quantize():
+        return [min(range(len(colors)), key=lambda color, offset=offset: distance(offset, color))
+                for offset in range(0, len(pixel_data), 3)]
+
+    report('Quantize 64x64 RGB Pixels to VGA',
+           ('palette search per pixel', best_of(legacy_quantize, repeat=options.repeat)),
+           ('QuantizationIndex.quantize', best_of(lambda: index.quantize(pixel_data),
+                                                  repeat=options.repeat)))
+
+    pixel_count = options.width * options.height
+    pixel_data = os.urandom(pixel_count * 3)
+    build_time = best_of(lambda: QuantizationIndex(palette), repeat=options.repeat)
+    quantize_time = best_of(lambda: index.quantize(pixel_data), repeat=options.repeat)
+
+    log.info(f'\tBuilding the VGA index: {build_time * 1000:.3f} ms')
+    log.info(f'\tQuantizing {options.width}x{options.height}: {quantize_time * 1000:.3f} ms '
+             f'({pixel_count / quantize_time / 1000000:.1f} million pixels/s)')
+
+
+def benchmark_palette_swap(options):
+    pygame.display.set_mode((1, 1))
+
+    # A 4 color image, with one of them swapped out, like a team color.
+    random.seed(0)
+    colors = [(255, 0, 0), (0, 0, 0), (255, 255, 255), (128, 128, 128)]
+    image = pygame.Surface((options.width, options.height))
+
+    for y in range(0, options.height, 4):
+        for x in range(0, options.width, 4):
+            image.fill(random.choice(colors), (x, y, 4, 4))
+
+    mapping = {(255, 0, 0): (0, 0, 255)}
+
+    def legacy_recolor():
+        variant = image.copy()
+
+        for y in range(options.height):
+            for x in range(options.width):
+                color = tuple(variant.get_at((x, y)))[:3]
+
+                if color in mapping:
+                    variant.set_at((x, y), mapping[color])
+
+        return variant
+
+    if pygame.image.tostring(legacy_recolor(), 'RGB') != \
+            pygame.image.tostring(recolor_image(image, mapping), 'RGB'):
+        raise RuntimeError('recolor_image() output differs')
+
+    sprite = BitmappySprite(width=options.width, height=options.height)
+    sprite.image = image
+    sprite.palette_swap(mapping)
+
+    report(f'Palette Swap {options.width}x{options.height}',
+           ('get_at/set_at per pixel', best_of(legacy_recolor, repeat=options.repeat)),
+           ('recolor_image', best_of(lambda: recolor_image(image, mapping),
+                                     repeat=options.repeat)))
+    cached = best_of(lambda: sprite.palette_swap(mapping), repeat=options.repeat)
+    log.info(f'\tcached palette_swap: {cached * 1000:.3f} ms')
+
+
+def benchmark_palette_extract(options):
+    # An RGB data file with a line per pixel, and a lot of repeats.
+    random.seed(0)
+    pixel_count = options.width * options.height
+
+    with tempfile.TemporaryDirectory() as palette_path:
+        rgb_data_file = os.path.join(palette_path, 'colors.txt')
+
+        with open(rgb_data_file, 'w') as fh:
+            for _ in range(pixel_count):
+                fh.write(f'{random.randrange(0, 256, 16)}, {random.randrange(0, 256, 16)}, '
+                         f'{random.randrange(0, 256, 64)}\n')
+
+        def legacy_parse_rgb_data_in_file():
+            colors = []
+            with open(rgb_data_file) as file_obj:
+                for line in file_obj.readlines():
+                    color = pygame.Color(*[int(x) for x in line.strip().split(',')])
+                    if color not in colors:
+                        colors.append(color)
+            return colors
+
+        if legacy_parse_rgb_data_in_file() != \
+                PaletteUtility.parse_rgb_data_in_file(rgb_data_file):
+            raise RuntimeError('parse_rgb_data_in_file() output differs')
+
+        report(f'Extract a Palette From {pixel_count} Lines of RGB Data',
+               ('list dedup', best_of(legacy_parse_rgb_data_in_file, repeat=options.repeat)),
+               ('dict dedup', best_of(lambda: PaletteUtility.parse_rgb_data_in_file(rgb_data_file),
+                                      repeat=options.repeat)))
+
+    images = [pygame.Surface((options.width, options.height)) for _ in range(8)]
+    for image in images:
+        for y in range(0, options.height, 8):
+            image.fill((random.randrange(256), 0, random.randrange(256)),
+                       (0, y, options.width, 8))
+
+    extract_time = best_of(lambda: PaletteUtility.extract_rgba(images), repeat=options.repeat)
+    log.info(f'\textract_rgba from 8 {options.width}x{options.height} images: '
+             f'{extract_time * 1000:.3f} ms')
+
+
+class NullManager:
+    # Stands in for the engine's managers, so that only dispatching gets timed.
+    proxies = ()
+
+    def __init__(self):
+        super().__init__()
+        self.events = 0
+
+    def on_event(self, event):  # noqa: W0613
+        self.events += 1
+
+
+for (_, handler_name) in GameEngine.EVENT_ROUTES.values():
+    setattr(NullManager, handler_name, NullManager.on_event)
+
+
+def legacy_process_events(engine, events):
+    for event in events:
+        if event.type in GameEngine.GAME_EVENTS:
+            engine.process_game_event(event)
+        elif event.type in GameEngine.JOYSTICK_EVENTS:
+            engine.process_joystick_event(event)
+        elif event.type in GameEngine.MOUSE_EVENTS:
+            engine.process_mouse_event(event)
+        elif event.type in GameEngine.KEYBOARD_EVENTS:
+            engine.process_keyboard_event(event)
+
+
+def benchmark_event_dispatch(options):
+    # An engine without a window, wired to managers that just count events.
+    engine = object.__new__(GameEngine)
+
+    for manager in ('game_manager', 'mouse_manager', 'keyboard_manager', 'joystick_manager'):
+        setattr(engine, manager, NullManager())
+
+    engine.event_handlers = engine.compile_event_handlers()
+
+    # Mostly mouse motion, like a real frame's worth of events.
+    random.seed(0)
+    event_types = [pygame.MOUSEMOTION] * 6 + [pygame.KEYDOWN, pygame.KEYUP,
+                                              pygame.JOYAXISMOTION, GameEngine.FPSEVENT]
+    events = [pygame.event.Event(random.choice(event_types)) for _ in range(100000)]
+
+    def event_count():
+        return sum(getattr(engine, manager).events
+                   for manager in ('game_manager', 'mouse_manager',
+                                   'keyboard_manager', 'joystick_manager'))
+
+    legacy_process_events(engine, events)
+    legacy_count = event_count()
+    engine.dispatch_events(events)
+
+    if event_count() - legacy_count != legacy_count:
+        raise RuntimeError('dispatch_events() handled different events')
+
+    legacy_time = best_of(lambda: legacy_process_events(engine, events), repeat=options.repeat)
+    dispatch_time = best_of(lambda: engine.dispatch_events(events), repeat=options.repeat)
+
+    report(f'Dispatch {len(events)} Events',
+           ('if/elif chains', legacy_time),
+           ('dispatch table', dispatch_time))
+    log.info(f'\tif/elif chains: {len(events) / legacy_time / 1000000:.2f} million events/s')
+    log.info(f'\tdispatch table: {len(events) / dispatch_time / 1000000:.2f} million events/s')
+
+
+def benchmark_unhandled_event(options):
+    # inspect.stack() is slow enough that a thousand events is plenty.
+    events = [pygame.event.Event(pygame.MOUSEMOTION, pos=(0, 0), rel=(1, 0), buttons=(0, 0, 0))
+              for _ in range(1000)]
+
+    proxy = EventManager.EventProxy(event_source='benchmark')
+
+    def legacy_unhandled_event(**kwargs):
+        event_handler = inspect.stack()[1].function
+        event = kwargs.get('event')
+        event_trigger = kwargs.get('trigger', None)
+
+        log.debug(f'Unhandled Event {event_handler}: '
+                  f'{proxy.event_source}->{event} Event Trigger: {event_trigger}')
+
+    def legacy_on_mouse_motion_event(event):
+        legacy_unhandled_event(event=event)
+
+    def legacy():
+        for event in events:
+            legacy_on_mouse_motion_event(event)
+
+    def unhandled():
+        for event in events:
+            proxy.on_mouse_motion_event(event)
+
+    report(f'{len(events)} Unhandled Mouse Motion Events',
+           ('inspect.stack()', best_of(legacy, repeat=options.repeat)),
+           ('counted', best_of(unhandled, repeat=options.repeat)))
+
+
+def benchmark_proxy_lookup(options):
+    # A manager forwarding to the second of its proxies, like the keyboard and mouse
+    # managers do for anything their proxy objects don't handle.
+    class Proxy:
+        def on_key_down_event(self, event):
+            return event
+
+    class ProxyManager(ResourceManager):
+        pass
+
+    class LegacyProxyManager:
+        def __init__(self):
+            self.proxies = [object(), Proxy()]
+
+        def __getattr__(self, attr):  # noqa: R1710
+            for proxy in self.proxies:
+                try:
+                    return getattr(proxy, attr)
+                except AttributeError:
+                    log.error(f'No proxies for {type(self)}.{attr}')
+
+    manager = ProxyManager()
+    manager.proxies = [object(), Proxy()]
+    legacy_manager = LegacyProxyManager()
+    lookups = 100000
+
+    def legacy():
+        for _ in range(lookups):
+            legacy_manager.on_key_down_event  # noqa: W0104
+
+    def cached():
+        for _ in range(lookups):
+            manager.on_key_down_event  # noqa: W0104
+
+    # Each miss on the first proxy logs an error; leave that out, it's just noise here.
+    logging.disable(logging.ERROR)
+
+    try:
+        timings = (('proxy walk', best_of(legacy, repeat=options.repeat)),
+                   ('cached', best_of(cached, repeat=options.repeat)))
+    finally:
+        logging.disable(logging.NOTSET)
+
+    report(f'{lookups} Proxied Attribute Lookups', *timings)
+
+    log.info(f'Proxy cache: {manager.proxy_stats}')
+
+
+class NullKeyboardGame:
+    def __init__(self):
+        self.chords = 0
+
+    def on_key_down_event(self, event):
+        pass
+
+    def on_key_up_event(self, event):
+        pass
+
+    def on_key_chord_down_event(self, event, keys):  # noqa: W0613
+        self.chords += 1
+
+    def on_key_chord_up_event(self, event, keys):
+        pass
+
+
+class LegacyKeyboardProxy:
+    def __init__(self, game):
+        self.keys = {}
+        self.game = game
+
+    def on_key_down_event(self, event):
+        keyboard_key = event.dict.copy()
+        del keyboard_key['unicode']
+
+        self.keys[tuple(sorted(frozenset(keyboard_key.items())))] = event
+
+        self.game.on_key_down_event(event)
+        self.game.on_key_chord_down_event(event, [self.keys[key]
+                                                  for key in self.keys
+                                                  if self.keys[key].type == pygame.KEYDOWN])
+
+    def on_key_up_event(self, event):
+        self.keys[tuple(sorted(frozenset(event.dict.items())))] = event
+
+        self.game.on_key_up_event(event)
+        self.game.on_key_chord_up_event(event, [self.keys[key]
+                                                for key in self.keys
+                                                if self.keys[key].type == pygame.KEYDOWN])
+
+
+def benchmark_key_chord(options):
+    # A long session's typing: every key, under every combination of modifiers,
+    # which is what grows the legacy state, with Ctrl+S registered as a chord.
+    random.seed(0)
+    keys = [(key, key - pygame.K_a + 4) for key in range(pygame.K_a, pygame.K_z + 1)]
+    mods = [pygame.KMOD_NONE, pygame.KMOD_LSHIFT, pygame.KMOD_CAPS, pygame.KMOD_NUM,
+            pygame.KMOD_LSHIFT | pygame.KMOD_NUM, pygame.KMOD_CAPS | pygame.KMOD_NUM]
+
+    events = []
+    for _ in range(10000):
+        ((key, scancode), mod) = (random.choice(keys), random.choice(mods))
+        events.append(pygame.event.Event(pygame.KEYDOWN, key=key, mod=mod, scancode=scancode,
+                                         unicode=''))
+        events.append(pygame.event.Event(pygame.KEYUP, key=key, mod=mod, scancode=scancode))
+
+    legacy_proxy = LegacyKeyboardProxy(NullKeyboardGame())
+    proxy = KeyboardManager.KeyboardProxy(game=NullKeyboardGame())
+    proxy.register_key_chord((pygame.K_LCTRL, pygame.K_s))
+
+    def run(keyboard_proxy):
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                keyboard_proxy.on_key_down_event(event)
+            else:
+                keyboard_proxy.on_key_up_event(event)
+
+    report(f'{len(events)} Key Events',
+           ('state dict', best_of(lambda: run(legacy_proxy), repeat=options.repeat)),
+           ('bitset', best_of(lambda: run(proxy), repeat=options.repeat)))
+    log.info(f'\tstate dict: {len(legacy_proxy.keys)} keys tracked')
+    log.info(f'\tbitset: {proxy.KEY_SLOTS} key slots')
+
+
+def benchmark_hit_test(options):
+    # A 64x64 canvas of 8x8 pixel sprites, like Bitmappy's, under a wandering mouse,
+    # with a hit test every frame while a sprite gets dragged around.
+    pygame.display.set_mode((1, 1))
+
+    class PixelSprite(RootSprite):
+        def __init__(self, x, y):
+            super().__init__(width=8, height=8)
+            self.rect.topleft = (x * 8, y * 8)
+
+    canvas = pygame.sprite.LayeredDirty(PixelSprite(x, y) for y in range(64) for x in range(64))
+    index = SpriteIndex()
+    index.sync(canvas)
+
+    random.seed(0)
+    positions = [(random.randrange(512), random.randrange(512)) for _ in range(1000)]
+    dragged = canvas.sprites()[0]
+
+    def legacy():
+        mouse = pygame.sprite.Sprite()
+
+        for pos in positions:
+            dragged.rect.center = pos
+            mouse.rect = pygame.Rect(pos, (1, 1))
+            pygame.sprite.spritecollide(mouse, canvas, False)
+
+    def indexed():
+        for pos in positions:
+            dragged.rect.center = pos
+            index.sprites_at(pos, group=canvas)
+
+    def rebuild():
+        index.invalidate()
+        index.sync(canvas)
+
+    report(f'{len(positions)} Frames of Hit Tests on {len(canvas)} Sprites',
+           ('spritecollide()', best_of(legacy, repeat=options.repeat)),
+           ('sprite index', best_of(indexed, repeat=options.repeat)))
+    log.info(f'\trebuild, when sprites come or go: '
+             f'{best_of(rebuild, repeat=options.repeat) * 1000:.3f} ms')
+
+
+BENCHMARKS = {
+    'packed-rgb': benchmark_packed_rgb,
+    'image-from-pixels': benchmark_image_from_pixels,
+    'pixels-from-path': benchmark_pixels_from_path,
+    'inflate': benchmark_inflate,
+    'deflate': benchmark_deflate,
+    'sprite-cache': benchmark_sprite_cache,
+    'parse': benchmark_parse,
+    'compact-sprite': benchmark_compact_sprite,
+    'palette': benchmark_palette,
+    'quantize': benchmark_quantize,
+    'palette-swap': benchmark_palette_swap,
+    'palette-extract': benchmark_palette_extract,
+    'event-dispatch': benchmark_event_dispatch,
+    'unhandled-event': benchmark_unhandled_event,
+    'proxy-lookup': benchmark_proxy_lookup,
+    'key-chord': benchmark_key_chord,
+    'hit-test': benchmark_hit_test,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser('Ghetto Games Benchmarks')
+
+    parser.add_argument('benchmarks',
+                        nargs='*',
+                        metavar='benchmark',
+                        help=f'the benchmarks to run: {", ".join(BENCHMARKS)} (default: all)')
+    parser.add_argument('--width',
+                        type=int,
+                        default=320)
+    parser.add_argument('--height',
+                        type=int,
+                        default=240)
+    parser.add_argument('--repeat',
+                        type=int,
+                        default=5)
+
+    options = parser.parse_args()
+
+    for benchmark in options.benchmarks:
+        if benchmark not in BENCHMARKS:
+            parser.error(f'Unknown benchmark: {benchmark}')
+
+    pygame.init()
+
+    for benchmark in options.benchmarks or BENCHMARKS:
+        BENCHMARKS[benchmark](options)
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    except Exception as e:
+        raise e
+    finally:
+        pygame.quit()
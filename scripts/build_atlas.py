@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+
+import argparse
+import logging
+import os
+
+import pygame
+
+from ghettogames.atlas import TextureAtlas
+
+log = logging.getLogger('game')
+log.setLevel(logging.INFO)
+
+ch = logging.StreamHandler()
+ch.setLevel(logging.INFO)
+
+log.addHandler(ch)
+
+
+def main():
+    parser = argparse.ArgumentParser('Pack a directory of Bitmappy sprites into a texture atlas')
+
+    parser.add_argument('path',
+                        help='the directory of sprites to pack')
+
+    parser.add_argument('output',
+                        help='the atlas index to write, like sprites.atlas.cfg; '
+                             'pages are written next to it')
+
+    parser.add_argument('--pattern',
+                        default='*.cfg',
+                        help='the sprite files to pack (default: *.cfg)')
+
+    parser.add_argument('--page-size',
+                        type=int,
+                        nargs=2,
+                        default=(1024, 1024),
+                        metavar=('WIDTH', 'HEIGHT'),
+                        help='the largest atlas page to make (default: 1024 1024)')
+
+    parser.add_argument('--padding',
+                        type=int,
+                        default=1,
+                        help='pixels between packed sprites (default: 1)')
+
+    args = parser.parse_args()
+
+    # Sprites need a display to load into.
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+
+    atlas = TextureAtlas.from_directory(path=args.path,
+                                        pattern=args.pattern,
+                                        max_size=tuple(args.page_size),
+                                        padding=args.padding)
+    atlas.save(args.output)
+
+    log.info(f'Wrote {len(atlas)} sprites on {len(atlas.pages)} pages to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+
+import argparse
+import logging
+import os
+
+from ghettogames.compact_sprite import is_compact_sprite
+from ghettogames.compact_sprite import load_compact_sprite, save_compact_sprite
+from ghettogames.engine import sprite_config
+from ghettogames.sprite_parser import parse_sprite_file
+
+log = logging.getLogger('game')
+log.setLevel(logging.INFO)
+
+ch = logging.StreamHandler()
+ch.setLevel(logging.INFO)
+
+log.addHandler(ch)
+
+
+def load_sprite(path):
+    if is_compact_sprite(path):
+        return load_compact_sprite(path)
+
+    return parse_sprite_file(path)
+
+
+def save_sprite(path, name, width, height, palette, index_data):
+    if is_compact_sprite(path):
+        save_compact_sprite(path, name, width, height, palette, index_data)
+    else:
+        config = sprite_config(name, width, height, palette, index_data)
+
+        with open(path, 'w', encoding='utf-8') as fh:
+            config.write(fh)
+
+
+def main():
+    parser = argparse.ArgumentParser('Convert Bitmappy sprites between .cfg and .bmpy')
+
+    parser.add_argument('source',
+                        help='the sprite to convert')
+
+    parser.add_argument('destination',
+                        help='the sprite to write; its extension picks the format')
+
+    args = parser.parse_args()
+
+    save_sprite(args.destination, *load_sprite(args.source))
+
+    log.info(f'{args.source} ({os.path.getsize(args.source)} bytes) -> '
+             f'{args.destination} ({os.path.getsize(args.destination)} bytes)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+
+import argparse
+import logging
+
+from ghettogames.color.palette import PaletteUtility
+
+log = logging.getLogger('game')
+log.setLevel(logging.INFO)
+
+ch = logging.StreamHandler()
+ch.setLevel(logging.INFO)
+
+log.addHandler(ch)
+
+
+def main():
+    parser = argparse.ArgumentParser('Extract a palette from RGB data files and images')
+
+    parser.add_argument('sources',
+                        nargs='+',
+                        help='RGB data files (.txt) and images to take colors from')
+
+    parser.add_argument('output',
+                        help='the palette .cfg file to write')
+
+    args = parser.parse_args()
+
+    rgba_data = PaletteUtility.extract_rgba(args.sources)
+    PaletteUtility.save_rgba_to_file(rgba_data, args.output)
+
+    log.info(f'{len(rgba_data) // 4} colors from {len(args.sources)} files -> {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+
+import argparse
+import logging
+import os
+
+from ghettogames.color import SYSTEM, VGA
+from ghettogames.color.palette import ColorPalette, PaletteUtility
+from ghettogames.compact_sprite import is_compact_sprite, save_compact_sprite
+from ghettogames.engine import sprite_config
+from ghettogames.image_import import DITHERS, METHODS, import_images
+
+log = logging.getLogger('game')
+log.setLevel(logging.INFO)
+
+ch = logging.StreamHandler()
+ch.setLevel(logging.INFO)
+
+log.addHandler(ch)
+
+PALETTES = {
+    'vga': VGA,
+    'system': SYSTEM,
+}
+
+
+def load_palette(palette):
+    # A built in palette's name, or a palette .cfg file.
+    if palette is None:
+        return None
+
+    if palette.lower() in PALETTES:
+        return PALETTES[palette.lower()]
+
+    return ColorPalette(PaletteUtility.load_palette_from_file(palette))
+
+
+def save_sprite(path, name, width, height, palette, index_data):
+    if is_compact_sprite(path):
+        save_compact_sprite(path, name, width, height, palette, index_data)
+    else:
+        config = sprite_config(name, width, height, palette, index_data)
+
+        with open(path, 'w', encoding='utf-8') as fh:
+            config.write(fh)
+
+
+def main():
+    parser = argparse.ArgumentParser('Import images as Bitmappy sprites')
+
+    parser.add_argument('images',
+                        nargs='+',
+                        help='the images to import')
+
+    parser.add_argument('--output',
+                        default='.',
+                        help='the directory to write sprites to (default: %(default)s)')
+
+    parser.add_argument('--format',
+                        choices=('.cfg', '.bmpy'),
+                        default='.cfg',
+                        help='the sprite format to write (default: %(default)s)')
+
+    parser.add_argument('--palette',
+                        help=f'quantize to a palette: {", ".join(PALETTES)}, or a palette file '
+                             '(default: make one for each image)')
+
+    parser.add_argument('--colors',
+                        type=int,
+                        default=256,
+                        help='the most colors a made palette can have (default: %(default)s)')
+
+    parser.add_argument('--method',
+                        choices=METHODS,
+                        default='median-cut',
+                        help='how to make palettes (default: %(default)s)')
+
+    parser.add_argument('--dither',
+                        choices=DITHERS,
+                        default='none',
+                        help='how to dither (default: %(default)s)')
+
+    parser.add_argument('--spread',
+                        type=int,
+                        default=32,
+                        help='how far bayer dithering nudges colors (default: %(default)s)')
+
+    parser.add_argument('--workers',
+                        type=int,
+                        help='processes to import with (default: one per CPU)')
+
+    args = parser.parse_args()
+
+    os.makedirs(args.output, exist_ok=True)
+
+    compiled_sprites = import_images(args.images,
+                                     workers=args.workers,
+                                     palette=load_palette(args.palette),
+                                     colors=args.colors,
+                                     method=args.method,
+                                     dither=args.dither,
+                                     spread=args.spread)
+
+    for (image, compiled_sprite) in zip(args.images, compiled_sprites):
+        (name, width, height, palette, _) = compiled_sprite
+        path = os.path.join(args.output, f'{name}{args.format}')
+
+        save_sprite(path, *compiled_sprite)
+
+        log.info(f'{image} -> {path} ({width}x{height}, {len(palette) // 3} colors)')
+
+
+if __name__ == '__main__':
+    main()
@@ -4,13 +4,12 @@ import argparse
 from collections import OrderedDict
 import configparser
 import logging
-import struct
 
 import pygame
 
 from ghettogames.engine import GameEngine, RootSprite, RootScene
 from ghettogames.engine import vga_palette
-from ghettogames.engine import indexed_rgb_triplet_generator
+from ghettogames.engine import image_from_indexed_path
 
 log = logging.getLogger('game')
 log.setLevel(logging.INFO)
@@ -39,54 +38,15 @@ class BitmappyLegacySprite(RootSprite):
     def load(self, filename, palette, width, height):
         """
         """
-        # We need to load an 8-bit palette for color conversion.
-        palette = palette
-        image = None
-        rect = None
-        data = []
-        rgb_pixels = []
-
-        # Load the raw bits in.
-        with open(filename, 'rb') as fh:
-            data = fh.read()
-
-        # Unpack the bytes.
-        # Read 1 byte, unsigned.
-        indexed_rgb_data = struct.iter_unpack('<B', data)
-
-        pixels = indexed_rgb_triplet_generator(data=indexed_rgb_data)
-
-        pixels = [pixel for pixel in pixels]
-
-        for pixel in pixels[0:width*height]:
-            rgb_pixels.append(palette[pixel])
-
-        (image, rect) = self.inflate(width=width,
-                                     height=height,
-                                     pixels=rgb_pixels)
-
-        return (image, rect, filename)
-
-    def inflate(self, width, height, pixels):
-        """
-        """
-        image = pygame.Surface((width, height))
-        image.fill((0, 255, 0))
-        image.convert()
+        # The file is 1 byte palette indexes, so we attach the 8-bit
+        # palette to the image instead of converting every pixel.
+        image = image_from_indexed_path(path=filename,
+                                        width=width,
+                                        height=height,
+                                        palette=palette)
         image.set_colorkey((255, 0, 255))
 
-        x = 0
-        y = 0
-        for i, color in enumerate(pixels):
-            pygame.draw.rect(image, color, (y, x, 0, 0))
-
-            if x and x % width == 0:
-                y += 1
-                x = 1
-            else:
-                x += 1
-
-        return (image, image.get_rect())
+        return (image, image.get_rect(), filename)
 
     def save(self, filename):
         """
@@ -4,12 +4,11 @@ import argparse
 from collections import OrderedDict
 import configparser
 import logging
-import struct
 
 import pygame
 
-from engine import GameEngine, RootSprite, RootScene
-from engine import rgb_triplet_generator, rgb_565_triplet_generator
+from ghettogames.engine import GameEngine, RootSprite, RootScene
+from ghettogames.engine import image_from_path, rgb_triplet_generator
 
 log = logging.getLogger('game')
 log.setLevel(logging.INFO)
@@ -34,51 +33,14 @@ class BitmappyLegacySprite(RootSprite):
     def load(self, filename, width, height):
         """
         """
-        image = None
-        rect = None
-        data = []
-
-        # Load the raw bits in.
-        with open(filename, 'rb') as fh:
-            data = fh.read()
-
-        # Unpack the bytes into 565 triplets.
-        # Read 2 bytes, unsigned.
-        packed_rgb_data = struct.iter_unpack('<H', data)
-
-        pixels = rgb_565_triplet_generator(data=packed_rgb_data)
-
-        pixels = [pixel for pixel in pixels]
-
-        for pixel in pixels:
-            print(pixel)
-
-        (image, rect) = self.inflate(width=width,
-                                     height=height,
-                                     pixels=pixels)
-
-        return (image, rect, filename)
-
-    def inflate(self, width, height, pixels):
-        """
-        """
-        image = pygame.Surface((width, height))
-        image.fill((0, 255, 0))
-        image.convert()
+        # Decode the packed 565 pixels straight from the file into our image.
+        image = image_from_path(path=filename,
+                                width=width,
+                                height=height,
+                                pixel_format='565')
         image.set_colorkey((255, 0, 255))
 
-        x = 0
-        y = 0
-        for i, color in enumerate(pixels):
-            pygame.draw.rect(image, color, (y, x, 0, 0))
-
-            if x and x % width == 0:
-                y += 1
-                x = 1
-            else:
-                x += 1
-
-        return (image, image.get_rect())
+        return (image, image.get_rect(), filename)
 
     def save(self, filename):
         """
@@ -10,6 +10,8 @@ import pygame
 from ghettogames.engine import GameEngine
 from ghettogames.engine import RootScene
 from ghettogames.engine import RootSprite
+from ghettogames.engine import image_from_palette_indexes
+from ghettogames.sprite_parser import parse_sprite_file
 
 log = logging.getLogger('game')
 log.setLevel(logging.INFO)
@@ -32,53 +34,17 @@ class BitmappySprite(RootSprite):
     def load(self, filename):
         """
         """
-        config = configparser.ConfigParser(dict_type=OrderedDict)
-
-        config.read(filename, encoding='utf-8')
-
-        # [sprite]
-        # name = <name>
-        name = config.get(section='sprite', option='name')
-
-        # pixels = <pixels>
-        pixels = config.get(section='sprite', option='pixels').split('\n')
-
-        # Set our sprite's length and width.
-        width = 0
-        height = 0
-        index = -1
-
-        # This is a bit of a cleanup in case the config contains something like:
-        #
-        # pixels = \n
-        #  .........
-        #
-        while not width:
-            index += 1
-            width = len(pixels[index])
-            height = len(pixels[index:])
+        (name, width, height, palette, index_data) = parse_sprite_file(filename)
 
-        # Trim any dead whitespace.
-        # We're off by one since we increment the
-        pixels = pixels[index:]
-
-        color_map = {}
-        for section in config.sections():
-            # This is checking the length of the section's name.
-            # Colors are length 1.  This works with unicode, too.
-            if len(section) == 1:
-                red = config.getint(section=section, option='red')
-                green = config.getint(section=section, option='green')
-                blue = config.getint(section=section, option='blue')
-
-                color_map[section] = (red, green, blue)
+        image = pygame.Surface((width, height))
+        image.convert()
 
-        (image, rect) = self.inflate(width=width,
-                                     height=height,
-                                     pixels=pixels,
-                                     color_map=color_map)
+        image.blit(image_from_palette_indexes(index_data=index_data,
+                                              width=width,
+                                              height=height,
+                                              palette=palette), (0, 0))
 
-        return (image, rect, name)
+        return (image, image.get_rect(), name)
 
     def rgb_triplet_generator(self, buffer):
         iterator = iter(buffer)
@@ -272,7 +238,7 @@ class Game(GameEngine):
             self.clock.tick(self.fps)
 
             self.active_scene = self.active_scene.next
-e
+
 
 def main():
     parser = argparse.ArgumentParser(f'{Game.NAME} version {Game.VERSION}')
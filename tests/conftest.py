@@ -0,0 +1,83 @@
+import os
+
+# Tests run without a window or a sound card.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame  # noqa: E402
+import pytest  # noqa: E402
+
+from ghettogames.engine import GameEngine  # noqa: E402
+
+SPRITE = '''[sprite]
+name = {name}
+pixels = {pixels}
+
+[r]
+red = 255
+green = 0
+blue = 0
+
+[g]
+red = 0
+green = 255
+blue = 0
+'''
+
+GAME_OPTIONS = {'windowed': True, 'fps': 0, 'resolution': '64x64', 'log_level': 'error'}
+
+
+class RecordingScene:
+    # Records every on_*_event() that reaches the active scene.
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, attr):
+        if not attr.startswith('on_'):
+            raise AttributeError(attr)
+
+        return lambda *args: self.calls.append(attr)
+
+
+@pytest.fixture(scope='session', autouse=True)
+def display():
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+
+    yield
+
+    pygame.display.quit()
+
+
+@pytest.fixture
+def write_sprite(tmp_path):
+    # Writes a two color (r and g) sprite file, with extra [sprite] options if given.
+    def write(name, rows, **options):
+        sprite = SPRITE.format(name=name, pixels='\n\t'.join(rows))
+
+        if options:
+            extra_options = ''.join(f'{option} = {value}\n' for (option, value) in options.items())
+            sprite = sprite.replace('\n\n', f'\n{extra_options}\n', 1)
+
+        path = tmp_path / f'{name}.cfg'
+        path.write_text(sprite, encoding='utf-8')
+
+        return str(path)
+
+    return write
+
+
+@pytest.fixture
+def make_game(monkeypatch):
+    # Starts a headless game of the given GameEngine class, with a scene that
+    # records the events it gets.
+    # There's no cursor to set without a real display.
+    monkeypatch.setattr(pygame.mouse, 'set_cursor', lambda *args, **kwargs: None)
+
+    def make(cls=GameEngine):
+        game = cls(options=dict(GAME_OPTIONS))
+        game.active_scene = RecordingScene()
+
+        return game
+
+    return make
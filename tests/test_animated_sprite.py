@@ -0,0 +1,36 @@
+from ghettogames.engine import AnimatedBitmappySprite, BitmappySprite
+
+TORCH = ['rg', 'gr', 'gg', 'rr', 'rg', 'rg']
+
+
+def test_animated_sprite_after_plain_sprite_of_the_same_file(write_sprite):
+    path = write_sprite('torch', TORCH, frames=3, durations='100, 100, 200')
+
+    plain = BitmappySprite(filename=path)
+    torch = AnimatedBitmappySprite(filename=path)
+
+    assert plain.image is not torch.image
+    assert torch.durations == (100, 100, 200)
+    assert torch.frame_count == 3
+    assert torch.rect.size == (2, 2)
+
+
+def test_animated_sprites_share_a_strip(write_sprite):
+    path = write_sprite('torch', TORCH, frames=3, durations=150)
+
+    (first, second) = (AnimatedBitmappySprite(filename=path),
+                       AnimatedBitmappySprite(filename=path))
+
+    assert first.image is second.image
+    assert second.durations == (150, 150, 150)
+
+
+def test_durations_override_the_file(write_sprite):
+    path = write_sprite('torch', TORCH, frames=3, durations=150)
+
+    torch = AnimatedBitmappySprite(filename=path, durations=(50, 60))
+
+    assert torch.durations == (50, 60)
+    assert torch.frame_count == 2
+    assert torch.rect.size == (2, 3)
+    assert AnimatedBitmappySprite(filename=path).durations == (150, 150, 150)
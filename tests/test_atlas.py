@@ -0,0 +1,27 @@
+import pygame
+
+from ghettogames.atlas import TextureAtlas
+
+
+def test_a_sprite_named_atlas_keeps_the_index(tmp_path):
+    images = {'atlas': pygame.Surface((4, 4)), 'sword': pygame.Surface((2, 8))}
+    images['atlas'].fill((255, 0, 0))
+
+    path = str(tmp_path / 'sprites.atlas.cfg')
+    TextureAtlas.from_images(images).save(path)
+    atlas = TextureAtlas.load(path)
+
+    assert sorted(atlas) == ['atlas', 'sword']
+    assert len(atlas.pages) == 1
+    assert atlas.region('atlas')[1].size == (4, 4)
+    assert tuple(atlas.image('atlas').get_at((0, 0)))[:3] == (255, 0, 0)
+
+
+def test_rebuilding_into_the_sprite_directory_skips_the_index(write_sprite, tmp_path):
+    write_sprite('tile', ['rg', 'gr'])
+    path = str(tmp_path / 'sprites.atlas.cfg')
+
+    TextureAtlas.from_directory(str(tmp_path)).save(path)
+    atlas = TextureAtlas.from_directory(str(tmp_path))
+
+    assert sorted(atlas) == ['tile']
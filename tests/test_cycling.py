@@ -0,0 +1,42 @@
+import pygame
+
+from ghettogames.color.cycling import PaletteCycler
+from ghettogames.engine import IndexedBitmappySprite
+
+RED = (255, 0, 0)
+GREEN = (0, 255, 0)
+
+
+def test_cycles_rotate_a_surface_palette():
+    surface = pygame.Surface((2, 1), depth=8)
+    surface.set_palette([RED, GREEN])
+    cycler = PaletteCycler()
+    cycler.add_cycle(start=0, stop=2, interval=100)
+    cycler.register(surface)
+
+    assert not cycler.update(ticks=0)
+    assert not cycler.update(ticks=50)
+    assert cycler.update(ticks=100)
+
+    assert tuple(surface.get_palette_at(0))[:3] == GREEN
+    assert tuple(surface.get_palette_at(1))[:3] == RED
+
+
+def test_registering_a_sprite_leaves_its_twins_alone(write_sprite):
+    path = write_sprite('water', ['rg'])
+    (cycled, twin) = (IndexedBitmappySprite(filename=path), IndexedBitmappySprite(filename=path))
+    twin.dirty = 0
+
+    assert cycled.image is twin.image
+
+    cycler = PaletteCycler()
+    cycler.add_cycle(start=0, stop=2, interval=100)
+    cycler.register(cycled)
+    cycler.update(ticks=0)
+    cycler.update(ticks=100)
+
+    assert cycled.image is not twin.image
+    assert tuple(cycled.image.get_palette_at(0))[:3] == GREEN
+    assert tuple(twin.image.get_palette_at(0))[:3] == RED
+    assert cycled.dirty
+    assert not twin.dirty
@@ -0,0 +1,104 @@
+import pygame
+import pytest
+
+from ghettogames.engine import GameEngine
+
+
+class LegacyGame(GameEngine):
+    # Games from before the handler table overrode these.
+    def __init__(self, options):
+        self.keyboard_events = []
+        super().__init__(options=options)
+
+    def process_keyboard_event(self, event):
+        self.keyboard_events.append(event.type)
+
+
+def make_event(event_type, **attributes):
+    return pygame.event.Event(event_type, attributes)
+
+
+KEY_A_DOWN = make_event(pygame.KEYDOWN, key=pygame.K_a, mod=0, unicode='a', scancode=4)
+KEY_A_UP = make_event(pygame.KEYUP, key=pygame.K_a, mod=0, scancode=4)
+
+
+@pytest.mark.parametrize('event_type', [GameEngine.FPSEVENT,
+                                        GameEngine.MENUEVENT,
+                                        pygame.USEREVENT,
+                                        pygame.QUIT,
+                                        pygame.ACTIVEEVENT,
+                                        pygame.VIDEORESIZE,
+                                        pygame.VIDEOEXPOSE,
+                                        pygame.SYSWMEVENT])
+def test_game_events_reach_the_scene(make_game, event_type):
+    game = make_game()
+    (_, handler_name) = GameEngine.EVENT_ROUTES[event_type]
+
+    game.dispatch_events([make_event(event_type)])
+
+    assert game.active_scene.calls == [handler_name]
+
+
+def test_input_events_go_through_their_managers(make_game):
+    game = make_game()
+
+    assert game.event_handlers[pygame.KEYDOWN] == \
+        game.keyboard_manager.proxies[0].on_key_down_event
+    assert game.event_handlers[pygame.MOUSEBUTTONDOWN] == \
+        game.mouse_manager.proxies[0].on_mouse_button_down_event
+
+    game.dispatch_events([KEY_A_DOWN,
+                          make_event(pygame.MOUSEBUTTONDOWN, pos=(1, 1), button=1)])
+
+    assert game.active_scene.calls == ['on_key_down_event',
+                                       'on_left_mouse_button_down_event',
+                                       'on_mouse_button_down_event']
+
+
+def test_unknown_events_are_skipped(make_game):
+    game = make_game()
+    unknown_type = GameEngine.MENUEVENT + 1
+
+    game.dispatch_events([make_event(unknown_type), make_event(pygame.QUIT)])
+
+    assert game.active_scene.calls == ['on_quit_event']
+
+
+def test_overridden_process_methods_still_get_their_events(make_game):
+    game = make_game(LegacyGame)
+
+    game.dispatch_events([KEY_A_DOWN, KEY_A_UP, make_event(pygame.QUIT)])
+
+    assert game.keyboard_events == [pygame.KEYDOWN, pygame.KEYUP]
+    assert game.active_scene.calls == ['on_quit_event']
+
+
+def test_registered_handlers_until_reset(make_game):
+    game = make_game()
+    handled = []
+
+    game.register_event_handler(pygame.QUIT, handled.append)
+    game.dispatch_events([make_event(pygame.QUIT)])
+
+    assert len(handled) == 1
+    assert not game.active_scene.calls
+
+    game.reset_event_handler(pygame.QUIT)
+    game.dispatch_events([make_event(pygame.QUIT)])
+
+    assert len(handled) == 1
+    assert game.active_scene.calls == ['on_quit_event']
+
+
+def test_reset_recompiles_the_handler(make_game, monkeypatch):
+    game = make_game()
+    keyboard_proxy = game.keyboard_manager.proxies[0]
+    pressed = []
+
+    # Bound methods are looked up when the table is compiled, so a new one is
+    # only picked up by resetting.
+    monkeypatch.setattr(keyboard_proxy, 'on_key_down_event', pressed.append)
+    game.reset_event_handler(pygame.KEYDOWN)
+    game.dispatch_events([KEY_A_DOWN])
+
+    assert len(pressed) == 1
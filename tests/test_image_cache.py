@@ -0,0 +1,34 @@
+from ghettogames.engine import BitmappySprite
+
+RED = (255, 0, 0, 255)
+GREEN = (0, 255, 0, 255)
+
+
+def test_sprites_from_one_file_share_an_image(write_sprite):
+    path = write_sprite('tile', ['rg', 'gr'])
+
+    (first, second) = (BitmappySprite(filename=path), BitmappySprite(filename=path))
+
+    assert first.image is second.image
+    assert first.image_is_shared
+
+
+def test_drawing_on_a_shared_image_changes_every_sprite(write_sprite):
+    # Known limitation: shared images aren't copied on write.
+    path = write_sprite('tile', ['rg', 'gr'])
+    (first, second) = (BitmappySprite(filename=path), BitmappySprite(filename=path))
+
+    first.image.fill(GREEN)
+
+    assert tuple(second.image.get_at((0, 0))) == GREEN
+
+
+def test_detach_image_copies_before_drawing(write_sprite):
+    path = write_sprite('tile', ['rg', 'gr'])
+    (first, second) = (BitmappySprite(filename=path), BitmappySprite(filename=path))
+
+    first.detach_image().fill(GREEN)
+
+    assert not first.image_is_shared
+    assert first.image is not second.image
+    assert tuple(second.image.get_at((0, 0))) == RED
@@ -0,0 +1,106 @@
+import pygame
+import pytest
+
+from ghettogames.engine import KeyboardManager
+
+KeyboardProxy = KeyboardManager.KeyboardProxy
+
+
+class RecordingGame:
+    # Records the keyboard events the proxy passes on to the game.
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, attr):
+        if not attr.startswith('on_'):
+            raise AttributeError(attr)
+
+        return lambda *args: self.calls.append((attr, args))
+
+
+def key_event(event_type, key, scancode=0):
+    return pygame.event.Event(event_type, key=key, mod=0, scancode=scancode)
+
+
+def test_key_slots():
+    assert KeyboardProxy.key_slot(pygame.K_a) == pygame.K_a
+    assert KeyboardProxy.key_slot(pygame.K_UP) == 512 + (pygame.K_UP & 511)
+    assert KeyboardProxy.key_slot(pygame.K_F12) == 512 + (pygame.K_F12 & 511)
+
+    # Keys above 1024 that aren't named for their scancode go by the physical key.
+    assert KeyboardProxy.key_slot(0x430) is None
+    assert KeyboardProxy.key_slot(0x430, scancode=4) == 512 + 4
+
+
+def test_keys_above_1024_are_tracked():
+    keyboard = KeyboardProxy(game=RecordingGame())
+    up = key_event(pygame.KEYDOWN, pygame.K_UP, scancode=82)
+    cyrillic_a = key_event(pygame.KEYDOWN, 0x430, scancode=4)
+
+    keyboard.on_key_down_event(up)
+    keyboard.on_key_down_event(cyrillic_a)
+
+    assert pygame.K_UP > 1024
+    assert keyboard.pressed == 1 << KeyboardProxy.key_slot(pygame.K_UP) | 1 << 516
+    assert keyboard.keys_down == [cyrillic_a, up]
+
+    keyboard.on_key_up_event(key_event(pygame.KEYUP, pygame.K_UP, scancode=82))
+    keyboard.on_key_up_event(key_event(pygame.KEYUP, 0x430, scancode=4))
+
+    assert not keyboard.pressed
+    assert not keyboard.keys_down
+
+
+def test_registered_chords_fire_once():
+    game = RecordingGame()
+    keyboard = KeyboardProxy(game=game)
+    (downs, ups) = ([], [])
+    keyboard.register_key_chord((pygame.K_LCTRL, pygame.K_s),
+                                on_down=lambda event, keys: downs.append(keys),
+                                on_up=lambda event, keys: ups.append(keys))
+
+    ctrl = key_event(pygame.KEYDOWN, pygame.K_LCTRL, scancode=224)
+    s_key = key_event(pygame.KEYDOWN, pygame.K_s, scancode=22)
+
+    keyboard.on_key_down_event(ctrl)
+
+    assert not downs
+
+    keyboard.on_key_down_event(s_key)
+
+    assert downs == [[s_key, ctrl]]
+    assert keyboard.held_chord
+
+    keyboard.on_key_up_event(key_event(pygame.KEYUP, pygame.K_s, scancode=22))
+    keyboard.on_key_up_event(key_event(pygame.KEYUP, pygame.K_LCTRL, scancode=224))
+
+    assert ups == [[s_key, ctrl]]
+    assert not keyboard.held_chord
+    assert [name for (name, _) in game.calls] == ['on_key_down_event',
+                                                  'on_key_down_event',
+                                                  'on_key_chord_down_event',
+                                                  'on_key_chord_up_event',
+                                                  'on_key_up_event',
+                                                  'on_key_up_event']
+
+
+def test_unregistered_chords_are_ignored():
+    game = RecordingGame()
+    keyboard = KeyboardProxy(game=game)
+    keyboard.register_key_chord((pygame.K_LCTRL, pygame.K_s), on_down=pytest.fail)
+
+    for (key, scancode) in ((pygame.K_LCTRL, 224), (pygame.K_LSHIFT, 225), (pygame.K_s, 22)):
+        keyboard.on_key_down_event(key_event(pygame.KEYDOWN, key, scancode=scancode))
+
+    assert not keyboard.held_chord
+    assert [name for (name, _) in game.calls] == ['on_key_down_event'] * 3
+
+
+def test_unslottable_keys_cannot_be_chorded():
+    keyboard = KeyboardProxy(game=RecordingGame())
+
+    with pytest.raises(ValueError):
+        keyboard.register_key_chord((pygame.K_LCTRL, 0x430))
+
+    with pytest.raises(ValueError):
+        keyboard.register_key_chord(())
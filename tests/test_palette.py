@@ -0,0 +1,38 @@
+import pytest
+from pygame import Color
+
+from ghettogames.color.palette import ColorPalette
+
+RED = (255, 0, 0, 255)
+GREEN = (0, 255, 0, 255)
+BLUE = (0, 0, 255, 255)
+
+
+def test_set_color_replaces_or_appends():
+    palette = ColorPalette([RED, GREEN])
+
+    palette.set_color(0, BLUE)
+    palette.set_color(-1, RED)
+    palette.set_color(2, GREEN)
+
+    assert list(palette) == [Color(BLUE), Color(RED), Color(GREEN)]
+
+
+def test_set_color_past_the_end():
+    palette = ColorPalette([RED, GREEN])
+
+    with pytest.raises(IndexError):
+        palette.set_color(5, BLUE)
+
+    with pytest.raises(IndexError):
+        palette.set_color(-3, BLUE)
+
+    assert len(palette) == 2
+
+
+def test_map_byte_indices_on_a_big_palette():
+    palette = ColorPalette((index % 256, index // 256, 0) for index in range(300))
+
+    rgb_data = palette.map_indices(bytes([0, 1, 255]))
+
+    assert rgb_data == bytes([0, 0, 0, 1, 0, 0, 255, 0, 0])
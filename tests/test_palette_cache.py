@@ -0,0 +1,36 @@
+import os
+import threading
+
+from ghettogames.color.palette_cache import load_compiled_palette, save_compiled_palette
+
+RGBA_DATA = bytes([255, 0, 0, 255, 0, 255, 0, 255]) * 128
+
+
+def test_concurrent_saves_each_publish_a_whole_cache(tmp_path):
+    path = tmp_path / 'colors.cfg'
+    path.write_text('[0]\n', encoding='utf-8')
+
+    threads = [threading.Thread(target=save_compiled_palette, args=(str(path), RGBA_DATA))
+               for _ in range(8)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert load_compiled_palette(str(path)) == RGBA_DATA
+    assert sorted(os.listdir(tmp_path)) == ['colors.cfg', 'colors.cfg.cache']
+
+
+def test_failed_saves_clean_up(tmp_path, monkeypatch):
+    path = tmp_path / 'colors.cfg'
+    path.write_text('[0]\n', encoding='utf-8')
+
+    def replace(source, destination):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(os, 'replace', replace)
+
+    assert not save_compiled_palette(str(path), RGBA_DATA)
+    assert os.listdir(tmp_path) == ['colors.cfg']
@@ -0,0 +1,32 @@
+import pygame
+
+from ghettogames.engine import recolor_image
+
+RED = (255, 0, 0)
+GREEN = (0, 255, 0)
+BLUE = (0, 0, 255)
+
+
+def test_recolor_keeps_per_pixel_alpha():
+    image = pygame.Surface((2, 1), pygame.SRCALPHA)
+    image.set_at((0, 0), (*RED, 0))
+    image.set_at((1, 0), (*GREEN, 128))
+
+    variant = recolor_image(image, {GREEN: BLUE})
+
+    assert variant.get_flags() & pygame.SRCALPHA
+    assert tuple(variant.get_at((0, 0))) == (*RED, 0)
+    assert tuple(variant.get_at((1, 0))) == (*BLUE, 128)
+
+
+def test_recolor_opaque_image():
+    image = pygame.Surface((2, 1))
+    image.set_at((0, 0), RED)
+    image.set_at((1, 0), GREEN)
+    image.set_colorkey(GREEN)
+
+    variant = recolor_image(image, {GREEN: BLUE, RED: GREEN})
+
+    assert tuple(variant.get_at((0, 0)))[:3] == GREEN
+    assert tuple(variant.get_at((1, 0)))[:3] == BLUE
+    assert tuple(variant.get_colorkey())[:3] == BLUE
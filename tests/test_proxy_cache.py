@@ -0,0 +1,41 @@
+import pytest
+
+from ghettogames.engine import ResourceManager
+
+
+class Proxy:
+    def __init__(self, name):
+        self.name = name
+
+    def whoami(self):
+        return self.name
+
+
+class ProxyManager(ResourceManager):
+    pass
+
+
+def test_cached_lookups_follow_reassigned_proxies():
+    manager = ProxyManager()
+    manager.proxies = [Proxy('first')]
+
+    assert manager.whoami() == 'first'
+    assert manager.whoami() == 'first'
+    assert manager.proxy_stats['hits'] >= 1
+
+    manager.proxies = [Proxy('second')]
+
+    assert manager.whoami() == 'second'
+
+
+def test_proxies_cannot_change_in_place():
+    manager = ProxyManager()
+    manager.proxies = [Proxy('first')]
+    manager.whoami()
+
+    with pytest.raises(AttributeError):
+        manager.proxies.append(Proxy('second'))
+
+    manager.proxies = (Proxy('second'), *manager.proxies)
+
+    assert manager.whoami() == 'second'
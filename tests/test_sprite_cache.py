@@ -0,0 +1,47 @@
+import array
+import os
+import threading
+
+from ghettogames.sprite_cache import cache_path, load_compiled_sprite, save_compiled_sprite
+
+PALETTE = bytes([255, 0, 0, 0, 255, 0])
+
+
+def save(path, name):
+    index_data = array.array('B', [0, 1, 1, 0] * 1024)
+
+    return save_compiled_sprite(path, name, 64, 64, PALETTE, index_data)
+
+
+def test_concurrent_saves_each_publish_a_whole_cache(tmp_path):
+    path = tmp_path / 'tile.cfg'
+    path.write_text('[sprite]\n', encoding='utf-8')
+
+    names = [f'tile{index}' for index in range(8)]
+    threads = [threading.Thread(target=save, args=(str(path), name)) for name in names]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    (name, width, height, palette, index_data) = load_compiled_sprite(str(path))
+
+    assert name in names
+    assert (width, height, palette) == (64, 64, PALETTE)
+    assert len(index_data) == 64 * 64
+    assert sorted(os.listdir(tmp_path)) == ['tile.cfg', os.path.basename(cache_path('tile.cfg'))]
+
+
+def test_failed_saves_clean_up(tmp_path, monkeypatch):
+    path = tmp_path / 'tile.cfg'
+    path.write_text('[sprite]\n', encoding='utf-8')
+
+    def replace(source, destination):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(os, 'replace', replace)
+
+    assert not save(str(path), 'tile')
+    assert os.listdir(tmp_path) == ['tile.cfg']
@@ -0,0 +1,104 @@
+import pygame
+
+from ghettogames.engine import RootSprite, SpriteIndex
+
+
+class BoxSprite(RootSprite):
+    def __init__(self, x, y, width=10, height=10):
+        super().__init__(width=width, height=height)
+        self.rect.topleft = (x, y)
+
+
+def make_sprite(x, y, width=10, height=10):
+    sprite = pygame.sprite.DirtySprite()
+    sprite.rect = pygame.Rect(x, y, width, height)
+
+    return sprite
+
+
+def spritecollide(pos, group):
+    mouse = make_sprite(*pos, width=1, height=1)
+
+    return pygame.sprite.spritecollide(mouse, group, False)
+
+
+def test_sprites_at_matches_spritecollide():
+    group = pygame.sprite.LayeredDirty()
+    group.add(*(make_sprite(x, y, 40, 40) for x in range(0, 200, 30) for y in range(0, 200, 30)))
+    index = SpriteIndex(cell_size=16)
+
+    for pos in ((0, 0), (35, 35), (64, 64), (199, 5), (250, 250)):
+        assert index.sprites_at(pos, group=group) == spritecollide(pos, group)
+
+
+def test_moved_sprites_are_rebucketed():
+    (sprite, other) = (BoxSprite(0, 0), BoxSprite(200, 200))
+    group = pygame.sprite.LayeredDirty(sprite, other)
+    index = SpriteIndex()
+
+    assert index.sprites_at((5, 5), group=group) == [sprite]
+
+    sprite.rect.topleft = (100, 100)
+
+    assert index.moved == {sprite}
+    assert index.sprites_at((5, 5), group=group) == []
+    assert index.sprites_at((105, 105), group=group) == [sprite]
+
+    sprite.rect.move_ip(100, 0)
+
+    assert index.sprites_at((205, 105), group=group) == [sprite]
+
+    sprite.rect = pygame.Rect(300, 300, 10, 10)
+
+    assert index.sprites_at((305, 305), group=group) == [sprite]
+    assert not index.moved
+
+
+def test_sprites_keep_their_own_rects():
+    sprite = BoxSprite(0, 0)
+    rect = sprite.rect
+    sprite.rect = pygame.Rect(50, 50, 10, 10)
+    sprite.rect = rect
+    rect.x = 20
+
+    assert sprite.rect is rect
+    assert sprite.rect.x == 20
+
+
+def test_derived_rects_dont_move_the_sprite():
+    sprite = BoxSprite(0, 0)
+    group = pygame.sprite.LayeredDirty(sprite)
+    index = SpriteIndex()
+    index.sync(group)
+
+    sprite.rect.copy().x = 50
+    sprite.rect.move(50, 50).move_ip(1, 1)
+
+    assert not index.moved
+
+
+def test_untracked_sprites_are_checked_every_query():
+    sprite = make_sprite(0, 0)
+    group = pygame.sprite.LayeredDirty(sprite)
+    index = SpriteIndex()
+
+    assert index.sprites_at((5, 5), group=group) == [sprite]
+
+    sprite.rect.topleft = (100, 100)
+
+    assert index.sprites_at((105, 105), group=group) == [sprite]
+
+
+def test_joining_and_leaving_the_group():
+    sprite = BoxSprite(0, 0)
+    group = pygame.sprite.LayeredDirty(sprite)
+    index = SpriteIndex()
+
+    assert index.sprites_at((5, 5), group=group) == [sprite]
+
+    # The same size as before, so only the sprites can tell the index.
+    newcomer = BoxSprite(0, 0)
+    sprite.kill()
+    group.add(newcomer)
+
+    assert index.sprites_at((5, 5), group=group) == [newcomer]
@@ -0,0 +1,32 @@
+import builtins
+
+import ghettogames.engine
+from ghettogames.engine import BitmappySprite
+
+
+def test_saved_sprites_load_under_any_locale(tmp_path, monkeypatch):
+    # Enough colors for deflate() to run out of ASCII color keys.
+    sprite = BitmappySprite(name='colorful', width=20, height=10)
+    colors = [(red, green, 0) for red in range(0, 200, 10) for green in range(0, 100, 10)]
+
+    for (index, color) in enumerate(colors):
+        sprite.image.set_at((index % 20, index // 20), color)
+
+    # As if the locale's encoding weren't UTF-8.
+    def latin1_open(*args, **kwargs):
+        kwargs.setdefault('encoding', 'latin-1')
+        return builtins.open(*args, **kwargs)  # noqa: W1514
+
+    monkeypatch.setattr(ghettogames.engine, 'open', latin1_open, raising=False)
+
+    path = tmp_path / 'colorful.cfg'
+    sprite.save(str(path))
+
+    assert not path.read_bytes().isascii()
+
+    loaded = BitmappySprite(filename=str(path))
+
+    assert loaded.image.get_size() == (20, 10)
+
+    for (index, color) in enumerate(colors):
+        assert tuple(loaded.image.get_at((index % 20, index // 20)))[:3] == color